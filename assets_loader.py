@@ -101,13 +101,40 @@ def _make_tile_surface(size: tuple[int,int], bg, border, label: str):
         surf.blit(img, img.get_rect(center=rect.center))
     return surf
 
-def load_ui() -> dict[str, pg.Surface]:
-    ui = {}
+HUD_ICON_SIZES = (18, 20, 28)   # lados usados pelo topbar, menu de categorias e submenu
+
+class IconStore(dict):
+    """
+    Ícones originais por chave (continua um dict) + variantes escaladas em
+    cache por (key, w, h): smoothscale só roda na primeira vez de cada tamanho.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._scaled: dict[tuple[str,int,int], pg.Surface] = {}
+
+    def scaled(self, key: str, w: int, h: int):
+        icon = self.get(key)
+        if icon is None: return None
+        k = (key, w, h)
+        surf = self._scaled.get(k)
+        if surf is None:
+            surf = icon if icon.get_size() == (w, h) else pg.transform.smoothscale(icon, (w, h))
+            self._scaled[k] = surf
+        return surf
+
+    def warm(self, sizes=HUD_ICON_SIZES):
+        for key in self:
+            for side in sizes: self.scaled(key, side, side)
+
+def load_ui(prewarm=HUD_ICON_SIZES) -> IconStore:
+    """prewarm: lados (quadrados) já escalados na carga; None/() = sob demanda."""
+    ui = IconStore()
     for key, filename in ICON_FILES.items():
         path = os.path.join(UI_DIR, filename)
         if os.path.exists(path):
             surf = _safe_load(path)
             if surf: ui[key] = surf
+    if prewarm: ui.warm(prewarm)
     return ui
 
 def load_tiles(tile_size: tuple[int,int]=(48,48)) -> dict[str, pg.Surface]:
@@ -125,4 +152,4 @@ def load_tiles(tile_size: tuple[int,int]=(48,48)) -> dict[str, pg.Surface]:
         tiles[key] = surf
     return tiles
 
-__all__ = ["load_ui", "load_tiles"]
+__all__ = ["load_ui", "load_tiles", "IconStore"]
@@ -0,0 +1,289 @@
+# citizens.py — cidadãos como agentes em colunas NumPy (um índice por pessoa)
+from typing import Dict, Tuple
+import numpy as np
+
+from config_game import (
+    AGE_ADULT, AGE_ELDER, BIRTH_RATE, MORTALITY_BASE, MORTALITY_GROWTH,
+    PARTICIPATION_ADULT, PARTICIPATION_ELDER, LITERACY_PER_HOUR
+)
+
+COLUMNS = {
+    "age":       np.float32,   # anos
+    "home":      np.int32,     # gid da casa (0 = sem casa)
+    "employer":  np.int32,     # gid do emprego (0 = desempregado/fora da força de trabalho)
+    "education": np.float32,   # 0..100
+    "health":    np.float32,   # 0..100
+    "drive":     np.float32,   # sorteio fixo [0,1): participa da força de trabalho se < taxa da faixa
+}
+SECTORS = ("commercial", "industrial", "farm")
+
+def dense_index(keys: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Posição de cada valor em `keys` (gids inteiros ≥ 1), ou -1; tabela densa, sem ordenar."""
+    size = int(max(keys.max(initial=0), values.max(initial=0))) + 1
+    lut = np.full(size, -1, dtype=np.int64)
+    lut[keys] = np.arange(len(keys))
+    lut[0] = -1
+    return lut[values]
+
+def count_by_index(pos: np.ndarray, n: int) -> np.ndarray:
+    """Quantos valores de `pos` caem em cada índice 0..n-1 (-1 = nenhum); sem máscara."""
+    return np.bincount(pos + 1, minlength=n + 1)[1:]
+
+class Citizens:
+    """
+    Toda a população em colunas (age, home, employer, education, health,
+    drive); as regras são operações vetorizadas sobre a cidade inteira.
+    step_day envelhece, mata, faz nascer e educa; match_jobs preenche vagas.
+    Os agregados (faixas etárias, força de trabalho, empregados por setor)
+    ficam em cache até a próxima mudança. Cada coluna é uma vista do começo
+    de um buffer com folga: entradas e mortes do dia não realocam a cidade.
+    """
+    def __init__(self, rng: np.random.Generator):
+        self.rng = rng
+        self._buf = {name: np.zeros(0, dtype=dtype) for name, dtype in COLUMNS.items()}
+        self._resize(0)
+        self.employed_by_sector = np.zeros(len(SECTORS), dtype=np.int64)
+        self.version = 0
+        self._workers_cache: Dict[str, tuple] = {}
+        self._labor_cache = (None, 0)
+        self._match_version = None
+
+    def __len__(self): return len(self.age)
+
+    def _resize(self, n: int):
+        # colunas = primeiras n linhas dos buffers
+        for name, buf in self._buf.items(): setattr(self, name, buf[:n])
+
+    # ---- entrada/saída de moradores
+    def add(self, home, ages: np.ndarray, education: float, health: float):
+        # home: um gid para todos ou um gid por pessoa
+        k = len(ages)
+        if k == 0: return
+        n = len(self)
+        if n + k > len(self._buf["age"]):
+            size = max(2*(n + k), 1024)
+            for name, buf in self._buf.items():
+                grown = np.zeros(size, dtype=buf.dtype); grown[:n] = buf[:n]
+                self._buf[name] = grown
+        new = {
+            "age": ages, "home": home, "employer": 0,
+            "education": np.clip(self.rng.normal(education, 5.0, k), 0.0, 100.0),
+            "health": health, "drive": self.rng.random(k),
+        }
+        for name, buf in self._buf.items(): buf[n:n+k] = new[name]
+        self._resize(n + k)
+        self.version += 1
+
+    def add_household(self, home: int, young: int, adult: int, elder: int,
+                      education: float = 10.0, health: float = 80.0):
+        rng = self.rng
+        ages = np.concatenate([rng.uniform(0, AGE_ADULT, young),
+                               rng.uniform(AGE_ADULT, AGE_ELDER, adult),
+                               rng.uniform(AGE_ELDER, 90, elder)])
+        self.add(home, ages, education, health)
+
+    def _keep(self, mask: np.ndarray):
+        n = int(mask.sum())
+        for name, buf in self._buf.items(): buf[:n] = getattr(self, name)[mask]
+        self._resize(n)
+        self.version += 1
+
+    def _drop(self, idx: np.ndarray):
+        # remove poucas linhas trazendo o fim da tabela p/ os buracos (ordem não importa)
+        n, k = len(self), len(idx)
+        holes = idx[idx < n - k]
+        tail = np.setdiff1d(np.arange(n - k, n), idx, assume_unique=True)
+        for buf in self._buf.values(): buf[holes] = buf[tail]
+        self._resize(n - k)
+        self.version += 1
+
+    def move_in(self, home: int, room: int) -> int:
+        # sem-teto (home=0) ocupam até `room` vagas da casa nova; devolve quantos entraram
+        idx = np.flatnonzero(self.home == 0)[:max(0, room)]
+        if len(idx):
+            self.home[idx] = home
+            self.version += 1
+        return len(idx)
+
+    def remove_home(self, home: int) -> int:
+        # prédio demolido: os moradores deixam a cidade
+        gone = self.home == home
+        k = int(gone.sum())
+        if k: self._keep(~gone)
+        return k
+
+    # ---- agregados
+    def age_groups(self) -> Tuple[int, int, int]:
+        young = int(np.count_nonzero(self.age < AGE_ADULT))
+        elder = int(np.count_nonzero(self.age >= AGE_ELDER))
+        return young, len(self) - young - elder, elder
+
+    def labor_mask(self) -> np.ndarray:
+        adult = (self.age >= AGE_ADULT) & (self.age < AGE_ELDER)
+        return (adult & (self.drive < PARTICIPATION_ADULT)) | ((self.age >= AGE_ELDER) & (self.drive < PARTICIPATION_ELDER))
+
+    def labor_force(self) -> int:
+        ver, n = self._labor_cache
+        if ver != self.version:
+            n = int(np.count_nonzero(self.labor_mask()))
+            self._labor_cache = (self.version, n)
+        return n
+
+    def literacy(self) -> float:
+        return float(self.education.mean()) if len(self) else 0.0
+
+    def _count_employed(self, column: str) -> Dict[str, int]:
+        # empregados agrupados por casa ou por emprego, em cache por versão
+        ver, cached = self._workers_cache.get(column, (None, None))
+        if ver == self.version: return cached
+        keys = getattr(self, column)[(self.employer != 0) & (self.home != 0)]
+        ids, cnt = np.unique(keys, return_counts=True)
+        cached = {str(k): int(c) for k, c in zip(ids.tolist(), cnt.tolist())}
+        self._workers_cache[column] = (self.version, cached)
+        return cached
+
+    def workers_by_home(self) -> Dict[str, int]:
+        # quem faz o trajeto casa → trabalho, por casa
+        return self._count_employed("home")
+
+    def workers_by_employer(self) -> Dict[str, int]:
+        # empregados (com casa) por prédio de emprego
+        return self._count_employed("employer")
+
+    def commutes(self) -> Dict[Tuple[int, int], int]:
+        # empregados com casa por par (casa, emprego): os trajetos do trânsito
+        ver, cached = self._workers_cache.get("commutes", (None, None))
+        if ver == self.version: return cached
+        m = (self.employer != 0) & (self.home != 0)
+        keys, cnt = np.unique(self.home[m].astype(np.int64) << 32 | self.employer[m], return_counts=True)
+        cached = {(k >> 32, k & 0xFFFFFFFF): c for k, c in zip(keys.tolist(), cnt.tolist())}
+        self._workers_cache["commutes"] = (self.version, cached)
+        return cached
+
+    def people_by_building(self) -> Dict[str, int]:
+        # moradores por casa + empregados por prédio de emprego, em cache por versão
+        ver, cached = self._workers_cache.get("people", (None, None))
+        if ver == self.version: return cached
+        keys = np.concatenate([self.home[self.home != 0], self.employer[(self.employer != 0) & (self.home != 0)]])
+        ids, cnt = np.unique(keys, return_counts=True)
+        cached = {str(k): int(c) for k, c in zip(ids.tolist(), cnt.tolist())}
+        self._workers_cache["people"] = (self.version, cached)
+        return cached
+
+    # ---- emprego
+    def match_jobs(self, employers: np.ndarray, capacity: np.ndarray, sectors: np.ndarray, matcher=None):
+        """
+        employers: gids (int) dos prédios com vagas; capacity: vagas de cada um;
+        sectors: índice em SECTORS. Quem já tem emprego fica nele; só entra na
+        fila quem não tem ou perdeu o seu (prédio demolido ou desconectado, casa
+        fora do alcance pela rua, saiu da força de trabalho). Com `matcher`
+        (JobMatcher), quem tem casa vai para a vaga livre mais perto pela rua; as
+        vagas que sobram (e todas, sem matcher) vão ao acaso para quem não tem casa.
+        """
+        labor = self.labor_mask()
+        pos = dense_index(employers, self.employer)
+        keep = labor & (pos >= 0)
+        if matcher is not None:
+            matcher.sync()
+            if matcher.version != self._match_version:
+                # distâncias mudaram: confere se cada trajeto casa → emprego ainda existe
+                w = np.flatnonzero(keep & (self.home != 0))
+                if len(w): keep[w] = self._reachable(self.home[w], self.employer[w], matcher)
+            self._match_version = matcher.version
+        pos = np.where(keep, pos, -1)
+        filled = count_by_index(pos, len(employers))
+        if (filled > capacity).any():
+            # vagas a menos: saem os últimos de cada prédio
+            w = np.flatnonzero(keep)
+            w = w[np.argsort(pos[w], kind="stable")]
+            _, start, count = np.unique(pos[w], return_index=True, return_counts=True)
+            rank = np.arange(len(w)) - np.repeat(start, count)
+            keep[w[rank >= capacity[pos[w]]]] = False
+            pos[~keep] = -1
+            filled = np.minimum(filled, capacity)
+        self.employer *= keep
+
+        room = np.maximum(0, capacity - filled)
+        seekers = labor & ~keep
+        if matcher is not None:
+            housed = seekers & (self.home != 0)
+            seekers = seekers & (self.home == 0)
+            if housed.any() and room.any():
+                who = self._assign_flows(np.flatnonzero(housed), employers, room, matcher)
+                pos[who] = dense_index(employers, self.employer[who])
+                room = np.maximum(0, capacity - count_by_index(pos, len(employers)))
+
+        slots = np.repeat(employers, room)
+        seekers = np.flatnonzero(seekers) if len(slots) else slots
+        k = min(len(slots), len(seekers))
+        if k:
+            who = self.rng.permutation(seekers)[:k]
+            self.employer[who] = self.rng.permutation(slots)[:k]
+            pos[who] = dense_index(employers, self.employer[who])
+        filled = count_by_index(pos, len(employers))
+        self.employed_by_sector = np.bincount(sectors, weights=filled, minlength=len(SECTORS)).astype(np.int64)
+        self.version += 1
+
+    @staticmethod
+    def _reachable(homes: np.ndarray, jobs: np.ndarray, matcher) -> np.ndarray:
+        # um teste por par (casa, emprego) distinto, não por pessoa
+        pairs, inv = np.unique(np.stack([homes, jobs]), axis=1, return_inverse=True)
+        ok = np.array([int(j) in matcher.dist.get(int(h), ()) for h, j in pairs.T.tolist()], dtype=bool)
+        return ok[inv.ravel()]
+
+    def _assign_flows(self, idx: np.ndarray, employers: np.ndarray, capacity: np.ndarray, matcher):
+        # fluxos casa → emprego viram empregos individuais (ordem estável dentro da casa);
+        # devolve quem foi empregado
+        idx = idx[np.argsort(self.home[idx], kind="stable")]
+        homes, starts, counts = np.unique(self.home[idx], return_index=True, return_counts=True)
+        flows = matcher.assign(dict(zip(homes.tolist(), counts.tolist())),
+                               dict(zip(employers.tolist(), capacity.tolist())))
+        if not flows: return idx[:0]
+        fh, fj, fk = (np.array(col, dtype=np.int64) for col in zip(*flows))
+        order = np.argsort(fh, kind="stable")
+        slot_home, slot_job = np.repeat(fh[order], fk[order]), np.repeat(fj[order], fk[order])
+        _, s_start, s_count = np.unique(slot_home, return_index=True, return_counts=True)
+        rank = np.arange(len(slot_home)) - np.repeat(s_start, s_count)
+        who = idx[starts[dense_index(homes, slot_home)] + rank]
+        self.employer[who] = slot_job
+        return who
+
+    # ---- dia
+    def step_day(self, school: bool, city_health: float, homes: np.ndarray, home_capacity: np.ndarray):
+        """
+        Um dia para todos: envelhece, sorteia mortes (Gompertz × saúde) e
+        nascimentos (adultos de 18 a 45 em casas com vaga), aproxima a saúde
+        individual da saúde da cidade e, com universidade, avança a educação.
+        """
+        rng = self.rng
+        if len(self):
+            self.age += np.float32(1.0/360.0)
+            # sorteio p/ todos; o risco (exp) só p/ quem ficou abaixo do teto do dia
+            # (idade máxima, pior saúde): mesmas mortes, sem a conta na cidade inteira
+            r = rng.random(len(self), dtype=np.float32)
+            top = MORTALITY_BASE * np.exp(MORTALITY_GROWTH * (float(self.age.max()) - 30.0)) \
+                * (1.5 - float(self.health.min())/100.0) / 360.0
+            idx = np.flatnonzero(r < np.float32(top * 1.001))
+            if len(idx):
+                annual = MORTALITY_BASE * np.exp(np.float32(MORTALITY_GROWTH) * (self.age[idx] - np.float32(30.0))) \
+                       * (np.float32(1.5) - self.health[idx]/np.float32(100.0))
+                dead = idx[r[idx] < annual / np.float32(360.0)]
+                if len(dead): self._drop(dead)
+
+        # nascimentos: no máximo um por casa e por dia, se a casa tem vaga
+        if len(self) and len(homes):
+            idx = np.flatnonzero(rng.random(len(self), dtype=np.float32) < np.float32(BIRTH_RATE/360.0))
+            age = self.age[idx]
+            idx = idx[(age >= AGE_ADULT) & (age < 45)]
+            pos = dense_index(homes, self.home[idx])
+            cand = np.unique(pos[pos >= 0])
+            occ = np.bincount(self.home, minlength=int(homes.max()) + 1)[homes[cand]]
+            cand = cand[occ < home_capacity[cand]]
+            self.add(homes[cand], np.zeros(len(cand), dtype=np.float32), 0.0, city_health)
+
+        if len(self):
+            self.health += np.float32(0.1) * (np.float32(city_health) - self.health)
+            if school:
+                np.add(self.education, np.float32(LITERACY_PER_HOUR*24), out=self.education, where=self.age >= 6)
+                np.minimum(self.education, np.float32(100.0), out=self.education)
+        self.version += 1
@@ -0,0 +1,155 @@
+# city_batch.py — N cidades lado a lado: CityState em colunas NumPy (struct-of-arrays)
+from dataclasses import fields
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+
+from models import CityState
+from grid_system import grid_size, count_all, count_buildings_by_tile_connected
+from config_game import BASE_UNIT_VALUE, ONEOFF_DECAY_PER_HOUR, COVERAGE_EFFECT
+
+# campos numéricos do CityState (rng fica de fora: cada lote tem um Generator)
+STATE_FIELDS = [f.name for f in fields(CityState) if f.name != "rng"]
+INT_FIELDS = {f.name for f in fields(CityState) if f.type is int}
+
+CONNECTED_TILES = ("commercial", "industrial", "farm", "central_bank", "police", "hospital", "park")
+ALL_TILES = ("road", "industrial", "blight", "park")
+
+class BatchCityState:
+    """
+    Uma coluna NumPy por campo do CityState, N cidades de largura: bs.money[i]
+    é o dinheiro da cidade i. Os passos *_batch abaixo avançam todas de uma vez.
+    """
+    def __init__(self, n: int, seed: Optional[int] = None):
+        self.n = n
+        for f in fields(CityState):
+            if f.name == "rng": continue
+            dtype = np.int64 if f.name in INT_FIELDS else np.float64
+            setattr(self, f.name, np.full(n, f.default, dtype=dtype))
+        self.rng = np.random.default_rng(seed)
+
+    def __len__(self): return self.n
+
+    @classmethod
+    def from_states(cls, states: Sequence[CityState], seed: Optional[int] = None) -> "BatchCityState":
+        bs = cls(len(states), seed)
+        for name in STATE_FIELDS:
+            getattr(bs, name)[:] = [getattr(s, name) for s in states]
+        return bs
+
+    def state(self, i: int) -> CityState:
+        vals = {name: getattr(self, name)[i].item() for name in STATE_FIELDS}
+        return CityState(**vals)
+
+    def to_states(self) -> List[CityState]:
+        return [self.state(i) for i in range(self.n)]
+
+class BatchCounts:
+    """
+    Entradas por cidade que vêm do grid: contagens de prédios conectados
+    (`connected[tile]`), de células/prédios no mapa todo (`all[tile]`),
+    tamanho do mapa e, opcionalmente, cobertura residencial (`coverage[kind]`)
+    e exposição à poluição nas casas (`exposure`, PollutionField.exposure()).
+    """
+    def __init__(self, connected: Dict[str, np.ndarray], all: Dict[str, np.ndarray],
+                 size: np.ndarray, coverage: Optional[Dict[str, np.ndarray]] = None,
+                 exposure: Optional[np.ndarray] = None):
+        self.connected = connected
+        self.all = all
+        self.size = size
+        self.coverage = coverage
+        self.exposure = exposure
+
+    @classmethod
+    def from_grids(cls, grids, connected_gids, coverages=None, pollutions=None) -> "BatchCounts":
+        """pollutions: PollutionField de cada cidade, já avançados nesta hora (step())."""
+        conn = {t: np.array([count_buildings_by_tile_connected(g, c, t) for g, c in zip(grids, connected_gids)],
+                            dtype=np.int64) for t in CONNECTED_TILES}
+        tot = {t: np.array([count_all(g, t) for g in grids], dtype=np.int64) for t in ALL_TILES}
+        size = np.array([grid_size(g) for g in grids], dtype=np.int64)
+        cov = None
+        if coverages is not None:
+            cov = {k: np.array([c.residential(k) for c in coverages]) for k in ("police", "hospital", "park")}
+        exp = None
+        if pollutions is not None:
+            exp = np.array([p.exposure() for p in pollutions], dtype=np.float64)
+        return cls(conn, tot, size, cov, exp)
+
+# ---- passos vetorizados (mesmas fórmulas de economy.py)
+
+def income_tick_per_second_batch(bs: BatchCityState, counts: BatchCounts):
+    com, ind, farm = (counts.connected[t] for t in ("commercial", "industrial", "farm"))
+    supply = com + 2*ind + farm
+    served = np.minimum(bs.population // 5, supply)
+    active = (supply > 0) & (served > 0)
+
+    traffic_penalty = np.maximum(0.7, 1 - bs.traffic/200.0)
+    crime_penalty   = np.maximum(0.7, 1 - bs.crime/150.0)
+    health_bonus    = 0.9 + 0.1*(bs.health/100.0)
+    eff_base = (0.6 + 0.4 * bs.happiness/100.0) \
+             * (0.5 + 0.5 * bs.power_served/100.0) \
+             * (0.5 + 0.5 * bs.water_served/100.0) \
+             * traffic_penalty * crime_penalty * health_bonus
+    k = served * BASE_UNIT_VALUE * eff_base
+
+    denom = np.maximum(0.0003, supply + 0.0003)
+    share_com  = (com    + 0.0001) / denom
+    share_ind  = (2*ind  + 0.0001) / denom
+    share_farm = (1*farm + 0.0001) / denom
+    f_lit = 0.6 + 0.4*(bs.literacy/100.0)
+    f_ind = 0.85 + 0.15*(bs.literacy/100.0)
+    rate_per_min = k * (share_com*f_lit + share_ind*f_ind + share_farm*0.7)
+    new = np.minimum(bs.treasury_cap, bs.treasury_pending + rate_per_min/60.0)
+    bs.treasury_pending = np.where(active, new, bs.treasury_pending)
+
+def inflation_hourly_batch(bs: BatchCityState, counts: BatchCounts, noise: Optional[np.ndarray] = None):
+    """noise: ruído já sorteado por cidade (p/ casar com o caminho escalar); padrão: bs.rng."""
+    com, ind, farm = (counts.connected[t] for t in ("commercial", "industrial", "farm"))
+    gap = bs.population // 5 - (com + 2*ind + farm)
+    b = np.where(counts.connected["central_bank"] > 0, 0.8, 0.0)
+    g = 0.2 * (farm/6.0)
+    if noise is None:
+        r = bs.rng.random((2, bs.n))
+        noise = (0.1 - 0.2*r[0]) + np.where(farm > 0, 0.1 - 0.2*r[1], 0.0)
+    delta = 1.2*np.tanh(gap/10.0) - b - g + noise
+    bs.inflation = np.clip(bs.inflation + delta, 0.0, 40.0)
+
+def socio_env_hourly_batch(bs: BatchCityState, counts: BatchCounts, noise: Optional[np.ndarray] = None):
+    """noise: ruído do crime em [-1, 1] por cidade; padrão: bs.rng."""
+    roads, inds, blgts, parks = (counts.all[t] for t in ("road", "industrial", "blight", "park"))
+    if counts.exposure is not None:
+        bs.polution_penalty = counts.exposure.astype(np.float64)
+    else:
+        bs.polution_penalty = np.maximum(0.0, (inds*3 + blgts*2 + roads*0.05 - parks*0.5) / 20.0)
+
+    cov = counts.coverage
+    if cov is not None:
+        police_cut = COVERAGE_EFFECT["police"] * cov["police"]
+        hospital_bonus = COVERAGE_EFFECT["hospital"] * cov["hospital"]
+    else:
+        police_cut = counts.connected["police"] * 8.0
+        hospital_bonus = counts.connected["hospital"] * 4
+    if noise is None: noise = bs.rng.uniform(-1, 1, bs.n)
+    base_crime = 5.0 + 0.5*bs.unemployment + blgts*3.0 - police_cut
+    bs.crime = np.clip(0.7*bs.crime + 0.3*np.maximum(0.0, base_crime) + noise, 0.0, 100.0)
+
+    health_base = 70 + hospital_bonus - bs.polution_penalty*8 - (100-bs.power_served)/10 - (100-bs.water_served)/10
+    bs.health = np.clip(0.7*bs.health + 0.3*health_base, 0.0, 100.0)
+
+def update_happiness_daily_batch(bs: BatchCityState, counts: BatchCounts):
+    target = counts.size*counts.size*0.6
+    dens = bs.population / np.maximum(1.0, target)
+    superlot = np.maximum(0.0, dens - 1.0)
+    serv_pen = np.maximum(0, 60 - bs.power_served)/60.0 + np.maximum(0, 60 - bs.water_served)/60.0
+    pen_un = np.maximum(0.0, (bs.unemployment - 5)/5.0) * 1.5
+    pen_inf = np.maximum(0.0, (bs.inflation - 6)/4.0)
+    if counts.coverage is not None:
+        bonus_park = COVERAGE_EFFECT["park"] * counts.coverage["park"]
+    else:
+        bonus_park = np.minimum(2.0, 0.2 * counts.connected["park"])
+    delta = - (pen_un + pen_inf + serv_pen + superlot + bs.polution_penalty) + bonus_park
+    bs.happiness = np.clip(bs.happiness + delta, 0.0, 100.0)
+
+def decay_oneoff_resources_batch(bs: BatchCityState):
+    k = 1.0 - ONEOFF_DECAY_PER_HOUR/24.0
+    bs.power_use_once = bs.power_use_once * k
+    bs.water_use_once = bs.water_use_once * k
@@ -83,8 +83,10 @@ PARTICIPATION_ELDER = 0.10
 JOBS_PER = {"commercial": 4, "industrial": 8, "farm": 3}
 CAP_PER  = {"commercial": 200, "industrial": 300, "farm": 120}
 
+BASE_SUPPLY = 10.0   # gerador/poço da Prefeitura (energia e água)
 PROD_POWER_PER = {"utility": 40}
 PROD_WATER_PER = {"water_plant": 40}
+UTILITY_RADIUS = 60  # alcance da rede de energia/água a partir de cada fonte (passos de rua)
 
 CONS_POWER_PER_DAY = {
     "residential": 0.4, "commercial": 0.6, "industrial": 1.5, "farm": 0.4,
@@ -97,10 +99,57 @@ CONS_WATER_PER_DAY = {
     "police": 0.3, "hospital": 1.0,
 }
 
+LITERACY_PER_HOUR = 0.2   # com universidade conectada
+
 ROAD_ONEOFF_POWER = 0.05
 ROAD_ONEOFF_WATER = 0.05
 ONEOFF_DECAY_PER_HOUR = 0.5
 
+# cobertura de serviços: raio (em passos de rua) e efeito com cobertura total
+SERVICE_RADIUS = {"police": 12, "hospital": 15, "park": 6}
+COVERAGE_EFFECT = {"police": 16.0, "hospital": 12.0, "park": 2.0}
+
+# poluição: emissão por célula e por hora; parques absorvem parte do que chega
+POLLUTION_EMIT = {"industrial": 3.0, "blight": 2.0, "road": 0.05}
+POLLUTION_DIFFUSE = 0.2          # fração que vai p/ cada vizinho, por eixo, por hora
+POLLUTION_KEEP = 0.85            # fração que resta depois de uma hora (dissipação)
+POLLUTION_PARK_SINK = 0.5        # fração absorvida por hora numa célula de parque
+POLLUTION_PENALTY_PER_UNIT = 1.0 # penalidade (saúde/felicidade) por unidade na casa média
+
+# valor da terra (0..100): pesos de cada fator na desejabilidade da célula
+LAND_VALUE = {
+    "base": 40.0, "road": 20.0, "police": 10.0, "hospital": 10.0, "park": 15.0,
+    "pollution": 8.0,      # por unidade de poluição na célula
+    "unemployment": 0.5,   # por ponto percentual
+    "crime": 0.3,          # por ponto de crime
+    "blight": 5.0,         # por favela vizinha (8 vizinhas)
+}
+# favelas (autômato diário): surgem em terra barata na beira da rua e somem se ela valoriza
+BLIGHT_SPAWN_BELOW = 30.0
+BLIGHT_RECEDE_ABOVE = 45.0
+BLIGHT_SEED_PROB = 0.001   # por dia, célula elegível sem favela vizinha
+BLIGHT_GROW_PROB = 0.03    # por dia e por favela vizinha
+BLIGHT_RECEDE_PROB = 0.05  # por dia, favela em terra valorizada
+BLIGHT_MAX_PER_DAY = 8     # novas favelas por dia (no máximo)
+
+# trânsito: trabalhadores por trecho de rua antes de congestionar
+ROAD_CAPACITY = 12
+TRAFFIC_BASE = 5.0
+
+# emprego: distância máxima casa → trabalho (passos de rua)
+COMMUTE_MAX = 40
+
+# cidadãos (agentes): faixas etárias, natalidade/mortalidade anuais, moradia
+AGE_ADULT = 18
+AGE_ELDER = 65
+BIRTH_RATE = 0.06          # nascimentos/ano por adulto de 18 a 45 anos, se houver vaga na casa
+MORTALITY_BASE = 0.0008    # mortalidade anual aos 30 anos (Gompertz)
+MORTALITY_GROWTH = 0.085   # crescimento da mortalidade por ano de idade
+HOUSING_PER_CELL = 6       # moradores por célula residencial
+
+# autosave do log de comandos (segundos de jogo; 1440 = 1 dia)
+AUTOSAVE_EVERY_S = 1440
+
 UPKEEP_PER_MIN = {
     "road": lambda roads: (roads // 10) * 1,
     "central_bank": 2,
@@ -0,0 +1,94 @@
+# coverage.py — cobertura de serviços por campos de distância na malha viária
+from collections import deque
+from typing import Dict, Set, Tuple
+import numpy as np
+
+from config_game import SERVICE_RADIUS
+from grid_chunked import ChunkField, near_keys
+from grid_system import (
+    grid_size, neighbors4, recompute_connectivity, buildings_of, tiles_version
+)
+
+def road_distance(n: int, roads: Set[Tuple[int,int]], sources, limit: int) -> Dict[Tuple[int,int], int]:
+    """BFS multi-fonte nas ruas; distância em passos de rua (só até `limit`)."""
+    dist: Dict[Tuple[int,int], int] = {}
+    queue = deque()
+    for pos in sources:
+        if pos in roads and pos not in dist:
+            dist[pos] = 0
+            queue.append(pos)
+    while queue:
+        x, y = queue.popleft()
+        d = dist[(x, y)] + 1
+        if d > limit: continue
+        for nb in neighbors4(x, y, n):
+            if nb in roads and nb not in dist:
+                dist[nb] = d
+                queue.append(nb)
+    return dist
+
+def spread_to_neighbors(field: np.ndarray) -> np.ndarray:
+    # célula recebe o maior valor entre ela e as 4 vizinhas (prédio "usa" a rua ao lado);
+    # vale p/ um campo (n, n) ou uma pilha de chunks (k, h, w)
+    out = field.copy()
+    np.maximum(out[..., 1:, :], field[..., :-1, :], out=out[..., 1:, :])
+    np.maximum(out[..., :-1, :], field[..., 1:, :], out=out[..., :-1, :])
+    np.maximum(out[..., 1:], field[..., :-1], out=out[..., 1:])
+    np.maximum(out[..., :-1], field[..., 1:], out=out[..., :-1])
+    return out
+
+class ServiceCoverage:
+    """
+    Cobertura por célula (0..1) de Delegacia, Hospital e Parque: BFS a partir das
+    ruas conectadas vizinhas a cada serviço conectado, decaindo até SERVICE_RADIUS.
+    Cada campo só é recalculado quando ruas, prefeituras ou aquele serviço mudam,
+    e fica num ChunkField: só os chunks ao alcance de algum serviço têm bloco.
+    Raios lidos na construção (overrides do montecarlo valem).
+    """
+    def __init__(self, grid):
+        self.grid = grid
+        self.n = grid_size(grid)
+        self.radius: Dict[str, int] = dict(SERVICE_RADIUS)   # police, hospital, park
+        self.fields: Dict[str, ChunkField] = {}
+        self._keys: Dict[str, tuple] = {}
+        self._res_cache: Dict[str, Tuple[tuple, float]] = {}
+
+    def field(self, kind: str) -> ChunkField:
+        key = tiles_version(self.grid, ("road", "city_hall", kind))
+        if key is None or self._keys.get(kind) != key or kind not in self.fields:
+            self._keys[kind] = key
+            self.fields[kind] = self._compute(kind)
+        return self.fields[kind]
+
+    def _compute(self, kind: str) -> ChunkField:
+        n, radius = self.n, self.radius[kind]
+        roads, gids = recompute_connectivity(self.grid)
+        sources = [nb for gid, cells in buildings_of(self.grid, kind) if gid in gids
+                   for (x, y) in cells for nb in neighbors4(x, y, n)]
+        dist = road_distance(n, roads, sources, radius)
+        road_cov = ChunkField(n, np.float32)
+        if dist:
+            xs, ys = np.array(list(dist), dtype=np.int64).T
+            cov = np.clip(1.0 - np.array(list(dist.values()), dtype=np.float32) / float(radius), 0.0, 1.0)
+            hit = cov > 0
+            road_cov.put(xs[hit], ys[hit], cov[hit])
+        # espalha por chunk (com 1 célula das vizinhas em volta)
+        keys = near_keys(road_cov.blocks, n)
+        out = road_cov.clip(keys, spread_to_neighbors(road_cov.padded(keys, 1))[:, 1:-1, 1:-1])
+        field = ChunkField(n, np.float32)
+        for key, block in zip(keys, out): field.store(key, block.copy())
+        return field
+
+    def at(self, x: int, y: int, kind: str) -> float:
+        return float(self.field(kind)[y, x])
+
+    def residential(self, kind: str) -> float:
+        # cobertura média dos prédios residenciais (cada prédio vale o melhor de suas células)
+        key = tiles_version(self.grid, ("road", "city_hall", "residential", kind))
+        hit = self._res_cache.get(kind)
+        if hit and key is not None and hit[0] == key: return hit[1]
+        field = self.field(kind)
+        homes = buildings_of(self.grid, "residential")
+        value = float(np.mean([max(field[y, x] for (x, y) in cells) for _, cells in homes])) if homes else 0.0
+        self._res_cache[kind] = (key, value)
+        return value
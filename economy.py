@@ -1,12 +1,12 @@
 # economy.py
-import math, random
+import math
 from typing import Tuple, Set
 from models import CityState
 from grid_system import count_all, count_buildings_by_tile_connected
 from config_game import (
-    PROD_POWER_PER, PROD_WATER_PER, CONS_POWER_PER_DAY, CONS_WATER_PER_DAY,
+    BASE_SUPPLY, PROD_POWER_PER, PROD_WATER_PER, CONS_POWER_PER_DAY, CONS_WATER_PER_DAY,
     CAP_PER, JOBS_PER, BASE_UNIT_VALUE, PARTICIPATION_ADULT, PARTICIPATION_ELDER,
-    ONEOFF_DECAY_PER_HOUR, UPKEEP_PER_MIN
+    ONEOFF_DECAY_PER_HOUR, UPKEEP_PER_MIN, COVERAGE_EFFECT, LITERACY_PER_HOUR
 )
 
 def central_bank_connected(state: CityState, grid, connected_gids: Set[str]) -> bool:
@@ -20,7 +20,7 @@ def refresh_treasury_cap(state: CityState, grid, connected_gids: Set[str]):
     if central_bank_connected(state, grid, connected_gids): base_cap *= 1.5
     state.treasury_cap = float(base_cap)
 
-def update_labor_market(state: CityState, grid, connected_gids: Set[str]) -> Tuple[int,int,int,int,int,int,int]:
+def update_labor_market(state: CityState, grid, connected_gids: Set[str], citizens=None) -> Tuple[int,int,int,int,int,int,int]:
     com  = count_buildings_by_tile_connected(grid, connected_gids, "commercial")
     ind  = count_buildings_by_tile_connected(grid, connected_gids, "industrial")
     farm = count_buildings_by_tile_connected(grid, connected_gids, "farm")
@@ -29,6 +29,14 @@ def update_labor_market(state: CityState, grid, connected_gids: Set[str]) -> Tup
     jobs_ind  = JOBS_PER["industrial"] * ind
     jobs_farm = JOBS_PER["farm"] * farm
 
+    if citizens is not None:
+        # com agentes: força de trabalho e empregados por setor vêm do casamento de vagas
+        labor_total = citizens.labor_force()
+        labor_com, labor_ind, labor_farm = (int(v) for v in citizens.employed_by_sector)
+        emp = labor_com + labor_ind + labor_farm
+        state.unemployment = max(0.0, 1.0 - emp / labor_total) * 100.0 if labor_total > 0 else 0.0
+        return jobs_com, jobs_ind, jobs_farm, labor_total, labor_com, labor_ind, labor_farm
+
     labor_total = int(round(
         state.pop_adult * PARTICIPATION_ADULT + state.pop_elder * PARTICIPATION_ELDER
     ))
@@ -45,12 +53,25 @@ def update_labor_market(state: CityState, grid, connected_gids: Set[str]) -> Tup
     state.unemployment = max(0.0, 1.0 - (emp / max(1, labor_total))) * 100.0
     return jobs_com, jobs_ind, jobs_farm, labor_total, labor_com, labor_ind, labor_farm
 
-def recompute_resources(state: CityState, grid, connected_gids: Set[str]):
+def recompute_resources(state: CityState, grid, connected_gids: Set[str], utilities=None, people=None):
+    """people: {gid: moradores + empregados} p/ ponderar o atendimento da rede por prédio."""
+    if utilities is not None:
+        # rede: capacidade das fontes conectadas; atendido = fração de cada prédio
+        utilities.update()
+        state.power_cap, state.water_cap = utilities.cap["power"], utilities.cap["water"]
+        _resource_pct(state, utilities.use["power"], utilities.use["water"])
+        if people is not None:
+            state.power_served = 100.0 * utilities.served_share("power", people)
+            state.water_served = 100.0 * utilities.served_share("water", people)
+        else:
+            state.power_served, state.water_served = state.power_pct, state.water_pct
+        return
+
     # capacidade
     usinas = count_buildings_by_tile_connected(grid, connected_gids, "utility")
     etas   = count_buildings_by_tile_connected(grid, connected_gids, "water_plant")
-    state.power_cap = 10.0 + usinas * PROD_POWER_PER["utility"]
-    state.water_cap = 10.0 + etas   * PROD_WATER_PER["water_plant"]
+    state.power_cap = BASE_SUPPLY + usinas * PROD_POWER_PER["utility"]
+    state.water_cap = BASE_SUPPLY + etas   * PROD_WATER_PER["water_plant"]
 
     # consumo diário aprox
     def count_by_tile(tile):
@@ -71,73 +92,147 @@ def recompute_resources(state: CityState, grid, connected_gids: Set[str]):
 
     power_use_day = sum(CONS_POWER_PER_DAY.get(k,0)*v for k,v in counts.items())
     water_use_day = sum(CONS_WATER_PER_DAY.get(k,0)*v for k,v in counts.items())
+    _resource_pct(state, power_use_day, water_use_day)
+    # sem rede, todo prédio divide o mesmo estoque
+    state.power_served, state.water_served = state.power_pct, state.water_pct
 
+def _resource_pct(state: CityState, power_use_day: float, water_use_day: float):
     power_use_inst = power_use_day + state.power_use_once
     water_use_inst = water_use_day + state.water_use_once
 
     state.power_pct = max(0.0, min(100.0, (state.power_cap - power_use_inst) / max(1.0, state.power_cap) * 100.0))
     state.water_pct = max(0.0, min(100.0, (state.water_cap - water_use_inst) / max(1.0, state.water_cap) * 100.0))
 
-def update_happiness_daily(state: CityState, grid, connected_gids: Set[str], grid_size: int):
+def update_happiness_daily(state: CityState, grid, connected_gids: Set[str], grid_size: int, coverage=None):
     target = grid_size*grid_size*0.6
     dens = state.population / max(1.0, target)
     superlot = max(0.0, (dens - 1.0)) * 1.0
-    serv_pen = (max(0, 60 - state.power_pct)/60.0 + max(0, 60 - state.water_pct)/60.0) * 1.0
+    serv_pen = (max(0, 60 - state.power_served)/60.0 + max(0, 60 - state.water_served)/60.0) * 1.0
     pen_un = max(0.0, (state.unemployment - 5)/5.0) * 1.5
     pen_inf = max(0.0, (state.inflation - 6)/4.0) * 1.0
     pol_pen = state.polution_penalty
-    parks = count_buildings_by_tile_connected(grid, connected_gids, "park")
-    bonus_park = min(2.0, 0.2 * parks)
+    if coverage is not None:
+        # parques valem pelo alcance a partir das casas (ServiceCoverage)
+        bonus_park = COVERAGE_EFFECT["park"] * coverage.residential("park")
+    else:
+        parks = count_buildings_by_tile_connected(grid, connected_gids, "park")
+        bonus_park = min(2.0, 0.2 * parks)
     delta = - (pen_un + pen_inf + serv_pen + superlot + pol_pen) + bonus_park
     state.happiness = max(0.0, min(100.0, state.happiness + delta))
 
-def socio_env_hourly(state: CityState, grid, connected_gids: Set[str]):
-    roads = count_all(grid, "road")
-    inds  = count_all(grid, "industrial")
+def socio_env_hourly(state: CityState, grid, connected_gids: Set[str], coverage=None, pollution=None):
     blgts = count_all(grid, "blight")
-    parks = count_all(grid, "park")
-    state.polution_penalty = max(0.0, (inds*3 + blgts*2 + roads*0.05 - parks*0.5) / 20.0)
+    if pollution is not None:
+        # campo local: o que chega nas casas depois da difusão (PollutionField)
+        pollution.step()
+        state.polution_penalty = pollution.exposure()
+    else:
+        roads = count_all(grid, "road")
+        inds  = count_all(grid, "industrial")
+        parks = count_all(grid, "park")
+        state.polution_penalty = max(0.0, (inds*3 + blgts*2 + roads*0.05 - parks*0.5) / 20.0)
 
-    police = count_buildings_by_tile_connected(grid, connected_gids, "police")
-    base_crime = 5.0 + 0.5*state.unemployment + blgts*3.0 - police*8.0
-    state.crime = max(0.0, min(100.0, 0.7*state.crime + 0.3*max(0.0, base_crime) + random.uniform(-1,1)))
+    if coverage is not None:
+        police_cut = COVERAGE_EFFECT["police"] * coverage.residential("police")
+    else:
+        police_cut = count_buildings_by_tile_connected(grid, connected_gids, "police") * 8.0
+    base_crime = 5.0 + 0.5*state.unemployment + blgts*3.0 - police_cut
+    state.crime = max(0.0, min(100.0, 0.7*state.crime + 0.3*max(0.0, base_crime) + state.rng.crime.uniform(-1,1)))
 
-    hospitals = count_buildings_by_tile_connected(grid, connected_gids, "hospital")
-    health_base = 70 + hospitals*4 - state.polution_penalty*8 - (100-state.power_pct)/10 - (100-state.water_pct)/10
+    if coverage is not None:
+        hospital_bonus = COVERAGE_EFFECT["hospital"] * coverage.residential("hospital")
+    else:
+        hospital_bonus = count_buildings_by_tile_connected(grid, connected_gids, "hospital") * 4
+    health_base = 70 + hospital_bonus - state.polution_penalty*8 - (100-state.power_served)/10 - (100-state.water_served)/10
     state.health = max(0.0, min(100.0, 0.7*state.health + 0.3*health_base))
 
-def income_tick_per_second(state: CityState, grid, connected_gids: Set[str]):
+def _income_factors(state: CityState, grid, connected_gids: Set[str]):
+    # (served*BASE*eff, share_com, share_ind, share_farm) ou None se não há receita
     com  = count_buildings_by_tile_connected(grid, connected_gids, "commercial")
     ind  = count_buildings_by_tile_connected(grid, connected_gids, "industrial")
     farm = count_buildings_by_tile_connected(grid, connected_gids, "farm")
-    if (com + ind + farm) == 0: return
+    if (com + ind + farm) == 0: return None
 
     demand_units = state.population // 5
     supply_units = com + 2*ind + 1*farm
     served = min(demand_units, supply_units)
-    if served <= 0: return
+    if served <= 0: return None
 
     traffic_penalty = max(0.7, 1 - state.traffic/200.0)
     crime_penalty   = max(0.7, 1 - state.crime/150.0)
     health_bonus    = 0.9 + 0.1*(state.health/100.0)
 
     eff_base = (0.6 + 0.4 * state.happiness/100.0) \
-             * (0.5 + 0.5 * state.power_pct/100.0) \
-             * (0.5 + 0.5 * state.water_pct/100.0) \
+             * (0.5 + 0.5 * state.power_served/100.0) \
+             * (0.5 + 0.5 * state.water_served/100.0) \
              * traffic_penalty * crime_penalty * health_bonus
 
     denom = max(0.0003, (com + 2*ind + 1*farm) + 0.0003)
     share_com  = (com   + 0.0001) / denom
     share_ind  = (2*ind + 0.0001) / denom
     share_farm = (1*farm+ 0.0001) / denom
+    return served * BASE_UNIT_VALUE * eff_base, share_com, share_ind, share_farm
+
+def income_tick_per_second(state: CityState, grid, connected_gids: Set[str]):
+    factors = _income_factors(state, grid, connected_gids)
+    if factors is None: return
+    k, share_com, share_ind, share_farm = factors
 
     f_lit  = 0.6 + 0.4*(state.literacy/100.0)
     f_ind  = 0.85 + 0.15*(state.literacy/100.0)
     f_farm = 0.7
 
-    rate_per_min = served * BASE_UNIT_VALUE * eff_base * (share_com*f_lit + share_ind*f_ind + share_farm*f_farm)
+    rate_per_min = k * (share_com*f_lit + share_ind*f_ind + share_farm*f_farm)
     state.treasury_pending = min(state.treasury_cap, state.treasury_pending + rate_per_min/60.0)
 
+def literacy_tick(state: CityState, grid, connected_gids: Set[str]):
+    # alfabetização: +LITERACY_PER_HOUR pt/h se houver universidade conectada
+    if count_buildings_by_tile_connected(grid, connected_gids, "university") > 0:
+        state.literacy = min(100.0, state.literacy + (LITERACY_PER_HOUR/60.0))
+
+def upkeep_drain(grid) -> int:
+    roads = count_all(grid, "road")
+    drain = 0
+    drain += UPKEEP_PER_MIN["road"](roads)
+    for key in ("central_bank","university","police","hospital","water_plant"):
+        if count_all(grid, key): drain += UPKEEP_PER_MIN[key]
+    return drain
+
+def fast_forward_seconds(state: CityState, grid, connected_gids: Set[str], n: int, citizens=None):
+    """
+    Equivale a n ticks de (mercado de trabalho, receita, alfabetização, manutenção)
+    com grid e entradas fixos — válido entre fronteiras de hora. A receita é linear
+    na alfabetização (que cresce linear até 100), então o acúmulo é uma soma
+    aritmética; o teto do cofre é monotônico e pode ser aplicado uma vez no fim.
+    Com `citizens`, a alfabetização é dos agentes (avança por dia) e fica fixa aqui.
+    """
+    if n <= 0: return None
+    labor = update_labor_market(state, grid, connected_gids, citizens)
+
+    lit0 = state.literacy
+    school = citizens is None and count_buildings_by_tile_connected(grid, connected_gids, "university") > 0
+    d = LITERACY_PER_HOUR/60.0 if school else 0.0
+    if d > 0 and lit0 < 100.0:
+        k_cap = max(0, math.ceil((100.0 - lit0) / d))          # 1º tick já em 100
+        m = min(n, k_cap)
+        lit_sum = m*lit0 + d*m*(m-1)/2.0 + (n - m)*100.0    # Σ L_k, k = 0..n-1
+        state.literacy = min(100.0, lit0 + n*d)
+    else:
+        lit_sum = n*lit0
+
+    factors = _income_factors(state, grid, connected_gids)
+    if factors is not None:
+        k, share_com, share_ind, share_farm = factors
+        # rate(L) = a + b*L
+        a = k * (share_com*0.6 + share_ind*0.85 + share_farm*0.7)
+        b = k * (share_com*0.4 + share_ind*0.15) / 100.0
+        total = (a*n + b*lit_sum) / 60.0
+        state.treasury_pending = min(state.treasury_cap, state.treasury_pending + total)
+
+    drain = upkeep_drain(grid)
+    if drain: state.money = max(0, state.money - drain*n)
+    return labor
+
 def inflation_hourly(state: CityState, grid, connected_gids: Set[str]):
     com  = count_buildings_by_tile_connected(grid, connected_gids, "commercial")
     ind  = count_buildings_by_tile_connected(grid, connected_gids, "industrial")
@@ -148,18 +243,20 @@ def inflation_hourly(state: CityState, grid, connected_gids: Set[str]):
     a = 1.2
     b = 0.8 if count_buildings_by_tile_connected(grid, connected_gids, "central_bank")>0 else 0.0
     g = 0.2 * (farm/6.0)
-    noise = (0.1 - 0.2*random.random()) + ((0.1 - 0.2*random.random()) if farm>0 else 0.0)
+    rnd = state.rng.inflation.random
+    noise = (0.1 - 0.2*rnd()) + ((0.1 - 0.2*rnd()) if farm>0 else 0.0)
     delta = a*math.tanh(gap/10.0) - b - g + noise
     state.inflation = max(0.0, min(40.0, state.inflation + delta))
 
 def upkeep_minutely(state: CityState, grid):
-    roads = count_all(grid, "road")
-    drain = 0
-    drain += UPKEEP_PER_MIN["road"](roads)
-    for key in ("central_bank","university","police","hospital","water_plant"):
-        if count_all(grid, key): drain += UPKEEP_PER_MIN[key]
+    drain = upkeep_drain(grid)
     if drain: state.money = max(0, state.money - drain)
 
+def traffic_hourly(state: CityState, traffic, commutes, commutes_version=None):
+    # suavizado como o crime: bumps de eventos se dissipam em algumas horas
+    traffic.update(commutes, commutes_version)
+    state.traffic = max(0.0, min(100.0, 0.7*state.traffic + 0.3*traffic.index()))
+
 def decay_oneoff_resources(state: CityState):
     state.power_use_once *= (1.0 - ONEOFF_DECAY_PER_HOUR/24.0)
     state.water_use_once *= (1.0 - ONEOFF_DECAY_PER_HOUR/24.0)
@@ -9,10 +9,12 @@ class Event:
     title: str
     desc: str
     options: Dict[str, Callable]  # {"A": func(state), "B": func(state)}
+    default: str = "A"            # opção aplicada se o dilema ficar sem resposta até o próximo
 
-def get_random_event(state) -> Event:
+def get_random_event(state, rng=random) -> Event:
     """
     state: objeto com atributos .money, .happiness, .inflation, .traffic
+    rng: fonte de sorteio (ex.: state.rng.events p/ partidas reproduzíveis)
     """
     def a1(s):
         """Ignorar (morador irritado)"""
@@ -59,4 +61,4 @@ def get_random_event(state) -> Event:
             {"A": a3, "B": b3}
         ),
     ]
-    return random.choice(pool)
+    return rng.choice(pool)
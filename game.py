@@ -1,35 +1,22 @@
 # game.py
-import random
 import pygame as pg
 from typing import Optional
 
-from settings import WIDTH, HEIGHT, FPS, GRID_SIZE, TILE, COLORS
+from settings import WIDTH, HEIGHT, FPS, PAN_SPEED, GRID_SIZE, TILE, COLORS, MARGIN_LEFT, MARGIN_TOP
 from assets_loader import load_tiles, load_ui
-from events import get_random_event, Event
 
-from models import CityState
-from config_game import (
-    CATALOG, BUILD_EFFECTS,
-    ROAD_ONEOFF_POWER, ROAD_ONEOFF_WATER,
-    MIN_WITHDRAW_THRESHOLD, WITHDRAW_COOLDOWN_S
-)
-from grid_system import (
-    make_grid, grid_to_px, px_to_grid,
-    place_build, demolish_at, has_building,
-    count_buildings_by_tile_connected, recompute_connectivity
-)
-from economy import (
-    recompute_resources, refresh_treasury_cap, update_labor_market,
-    income_tick_per_second, inflation_hourly, socio_env_hourly,
-    upkeep_minutely, decay_oneoff_resources, central_bank_connected,
-    update_happiness_daily
-)
-from ui_draw import (
-    draw_topbar, draw_category_menu, draw_submenu,
-    draw_tooltip, draw_text, draw_panel
-)
-
-def run_game():
+from config_game import CATALOG
+from grid_system import grid_to_px, px_to_grid
+from simulation import Simulation
+from sim_thread import SimClient, SimThread
+from grid_layer import GridLayer
+from text_cache import text_cache
+from hud import TopBar, CategoryMenu, Submenu
+from ui_draw import draw_tooltip, draw_text, draw_panel, category_menu_rect
+
+def run_game(map_size: int = GRID_SIZE, grid_backend: str = "list", seed: Optional[int] = None,
+             autosave_path: Optional[str] = None, threaded: bool = False):
+    """threaded=True: simulação em thread próprio com passo fixo (SimThread)."""
     pg.init()
     screen = pg.display.set_mode((WIDTH, HEIGHT))
     pg.display.set_caption("City Builder — vSim")
@@ -39,20 +26,32 @@ def run_game():
     ui    = load_ui()
     get_tile_img = lambda key: tiles.get(key, tiles.get("empty"))
 
-    # ----- estado
-    grid  = make_grid()
-    state = CityState()
-
-    def sync_population_scalar():
-        state.population = max(0, state.pop_young + state.pop_adult + state.pop_elder)
-
-    # tempo
-    paused = False
-    speed  = 1.0
-    day, month, year = 1, 1, 1
-    hour, minute = 8, 0
-    sec_accum = 0.0
-    game_seconds_total = 0
+    # ----- estado (toda a simulação vive em Simulation; aqui só UI)
+    # o front-end só envia comandos ao client e desenha o último snapshot
+    sim    = Simulation(map_size, grid_backend, seed, autosave_path)
+    client = SimThread(sim) if threaded else SimClient(sim)
+    gsize  = sim.size
+    view   = client.snapshot()
+    # só a parte do mapa que cabe na tela é desenhada, a partir da câmera
+    # (célula do canto superior esquerdo; setas do teclado movem)
+    view_cols = min(gsize, (WIDTH - MARGIN_LEFT) // (TILE + 2) + 1)
+    view_rows = min(gsize, (HEIGHT - MARGIN_TOP) // (TILE + 2) + 1)
+    grid_layer = GridLayer(view_cols, view_rows, get_tile_img, COLORS)
+    cam_x = cam_y = 0
+    pan_acc = [0.0, 0.0]
+    # clique/hover só valem em células desenhadas e visíveis (acima do rodapé)
+    map_bottom = category_menu_rect().top
+    def cell_at(mx: int, my: int):
+        if my >= map_bottom: return None
+        gpos = px_to_grid(mx, my, gsize)
+        if not gpos or gpos[0] >= view_cols or gpos[1] >= view_rows: return None
+        return gpos[0] + cam_x, gpos[1] + cam_y
+    def cell_px(x: int, y: int):
+        # canto de tela da célula (x, y) do mapa, ou None se está fora da câmera
+        sx, sy = x - cam_x, y - cam_y
+        return grid_to_px(sx, sy) if 0 <= sx < view_cols and 0 <= sy < view_rows else None
+    # HUD retido: cada peça só é refeita quando o valor que mostra muda
+    topbar, category_menu, submenu = TopBar(ui, COLORS["bg"]), CategoryMenu(ui), Submenu(ui)
 
     # seleção
     active_category: Optional[str] = None
@@ -63,19 +62,6 @@ def run_game():
     mouse_down_time = None
     painting_roads  = False
 
-    # eventos (mantidos, mas opcionais)
-    current_event: Optional[Event] = None
-    event_visible = False
-    def schedule_next_event(y, m, d, h):
-        add_days = random.randint(1, 3)
-        hour_t   = random.randint(7, 21)
-        y2, m2, d2 = y, m, d + add_days
-        while d2 > 30: d2 -= 30; m2 += 1
-        while m2 > 12: m2 = 1; y2 += 1
-        return (y2, m2, d2, hour_t)
-    next_event_at = schedule_next_event(year, month, day, hour)
-    is_due = lambda cur, tgt: (cur[0]>tgt[0]) or (cur[0]==tgt[0] and (cur[1]>tgt[1] or (cur[1]==tgt[1] and (cur[2]>tgt[2] or (cur[2]==tgt[2] and cur[3]>=tgt[3])))))
-
     # mensagens (toasts)
     messages: list[dict] = []
     def push_message(text: str, ttl: float = 2.5, color=(240, 80, 80)):
@@ -84,78 +70,22 @@ def run_game():
         for m in messages: m["ttl"] -= dt
         while messages and messages[0]["ttl"] <= 0: messages.pop(0)
     def draw_messages():
-        if not messages: return
+        if not messages: return []
         TOPBAR_H = 100; PADDING = 12
         base_y = TOPBAR_H + PADDING + 12
         x_center = WIDTH // 2
+        rects = []
         for i, m in enumerate(messages[:3]):
-            text_w = pg.font.SysFont(None, 22).size(m["text"])[0]
+            text_w = text_cache.size(m["text"], 22)[0]
             w = min(WIDTH - 160, text_w + 40); h = 38
             rx = x_center - w//2; ry = int(base_y + i*(h+8))
             r = draw_panel(screen, rx, ry, w, h, fill=(255,255,255), border=(210,230,245), radius=10)
             draw_text(screen, m["text"], r.centerx, r.centery-1, size=22, color=m["color"], center=True)
+            rects.append(r)
+        return rects
 
-    # população por prédio
-    population_by_gid: dict[str, tuple[int,int,int]] = {}
-    def add_population_random(gid: str, name: str):
-        if name == "Casa":
-            total = random.randint(1, 6)
-        elif name == "Condomínio":
-            total = random.randint(7, 15)
-        else:
-            return
-        young = int(round(total * random.uniform(0.25, 0.40)))
-        elder = int(round(total * random.uniform(0.08, 0.15)))
-        adult = max(0, total - young - elder)
-        state.pop_young += young; state.pop_adult += adult; state.pop_elder += elder
-        sync_population_scalar()
-        population_by_gid[gid] = (young, adult, elder)
-
-    def remove_population_gid(gid: str):
-        tup = population_by_gid.pop(gid, None)
-        if not tup: return
-        y,a,e = tup
-        state.pop_young = max(0, state.pop_young - y)
-        state.pop_adult = max(0, state.pop_adult - a)
-        state.pop_elder = max(0, state.pop_elder - e)
-        sync_population_scalar()
-
-    # conectividade inicial
-    connected_roads, connected_gids = recompute_connectivity(grid)
-
-    # economia inicial
-    refresh_treasury_cap(state, grid, connected_gids)
-    jobs_com = jobs_ind = jobs_farm = labor_total = labor_com = labor_ind = labor_farm = 0
-    jobs_com, jobs_ind, jobs_farm, labor_total, labor_com, labor_ind, labor_farm = update_labor_market(state, grid, connected_gids)
-    recompute_resources(state, grid, connected_gids)
-
-    # saque
-    last_withdraw_game_s = -9999
-    auto_tax = False
-    def can_withdraw_now():
-        nonlocal last_withdraw_game_s
-        com  = count_buildings_by_tile_connected(grid, connected_gids, "commercial")
-        ind  = count_buildings_by_tile_connected(grid, connected_gids, "industrial")
-        farm = count_buildings_by_tile_connected(grid, connected_gids, "farm")
-        if (com + ind + farm) == 0:
-            return False, "É preciso ao menos 1 Comércio/Indústria/Fazenda conectados à Prefeitura."
-        if state.treasury_pending < MIN_WITHDRAW_THRESHOLD:
-            return False, f"Sem riqueza suficiente (mínimo ${int(MIN_WITHDRAW_THRESHOLD)})."
-        cd = WITHDRAW_COOLDOWN_S - (10 if central_bank_connected(state, grid, connected_gids) else 0)
-        cd = max(10, cd)
-        if (game_seconds_total - last_withdraw_game_s) < cd:
-            return False, f"Aguarde cooldown ({int(cd - (game_seconds_total - last_withdraw_game_s))}s)."
-        return True, None
-
-    def perform_withdraw(auto=False):
-        nonlocal last_withdraw_game_s
-        payout = state.treasury_pending * max(0.0, 1.0 - state.inflation/100.0)
-        if auto: payout *= 0.98
-        add = int(payout)
-        state.money += add
-        push_message(f"Receita coletada: ${add}" + (" (auto)" if auto else ""), ttl=2.5, color=(40,140,90))
-        state.treasury_pending = 0.0
-        last_withdraw_game_s = game_seconds_total
+    # arrasto de ruas: uma transação por arrasto, recálculo só ao soltar
+    road_batch = None
 
     # hover/tooltip
     TOOLTIP_DELAY_MS = 300
@@ -166,12 +96,19 @@ def run_game():
     pause_btn_rect = withdraw_btn_rect = auto_btn_rect = None
     cat_rects = []; submenu_rects = []; submenu_disabled_map = {}
 
+    # tela: flip completo só quando preciso; no resto, só os retângulos que mudaram
+    full_redraw = True
+    prev_rects: list = []
+
+    client.start()
     while running:
         dt = clock.tick(FPS) / 1000.0
 
         for e in pg.event.get():
             if e.type == pg.QUIT:
                 running = False
+            elif e.type in (pg.VIDEOEXPOSE, pg.WINDOWEXPOSED):
+                full_redraw = True
             elif e.type == pg.KEYDOWN:
                 if e.key == pg.K_ESCAPE:
                     if active_category is not None:
@@ -179,11 +116,15 @@ def run_game():
                         suppress_click_until_ms = pg.time.get_ticks() + 200
                     else:
                         running = False
+                elif view.pending_event and e.key in (pg.K_a, pg.K_b):
+                    client.send("choose_event", "A" if e.key == pg.K_a else "B")
                 elif e.key == pg.K_SPACE:
-                    paused = not paused
-                elif e.key == pg.K_F1: speed = 1.0
-                elif e.key == pg.K_F2: speed = 2.0
-                elif e.key == pg.K_F3: speed = 5.0
+                    client.send("set_paused", not view.paused)
+                elif e.key == pg.K_F1: client.send("set_speed", 1.0)
+                elif e.key == pg.K_F2: client.send("set_speed", 2.0)
+                elif e.key == pg.K_F3: client.send("set_speed", 5.0)
+                elif e.key == pg.K_F4: client.send("set_speed", 100.0)
+                elif e.key == pg.K_F5: client.send("set_speed", 1000.0)
             elif e.type == pg.MOUSEBUTTONDOWN and e.button == 1:
                 mouse_down_time = pg.time.get_ticks()
                 mx, my = pg.mouse.get_pos()
@@ -210,188 +151,126 @@ def run_game():
                     if clicked: continue
                 # botões topo
                 if pause_btn_rect and pause_btn_rect.collidepoint(mx, my):
-                    paused = not paused; continue
+                    client.send("set_paused", not view.paused); continue
                 if withdraw_btn_rect and withdraw_btn_rect.collidepoint(mx, my):
-                    ok, reason = can_withdraw_now()
-                    if ok: perform_withdraw()
-                    else:  push_message(reason, ttl=2.5, color=(220, 80, 80))
+                    client.send("withdraw")
                     continue
                 if auto_btn_rect and auto_btn_rect.collidepoint(mx, my):
-                    auto_tax = not auto_tax
-                    push_message("Auto-saque " + ("ON" if auto_tax else "OFF"), ttl=1.5, color=(80,140,200))
+                    client.send("set_auto_tax", not view.auto_tax)
+                    push_message("Auto-saque " + ("OFF" if view.auto_tax else "ON"), ttl=1.5, color=(80,140,200))
                     continue
                 # arrasto de ruas
                 if selected_build == "Rua":
                     painting_roads = True
+                    road_batch = client.begin_batch()
             elif e.type == pg.MOUSEBUTTONUP and e.button == 1:
                 held = pg.time.get_ticks() - (mouse_down_time or pg.time.get_ticks())
                 mouse_down_time = None
                 painting_roads = False
+                if road_batch:
+                    road_batch.commit(); road_batch = None
                 mx, my = pg.mouse.get_pos()
-                gpos = px_to_grid(mx, my)
+                gpos = cell_at(mx, my)
                 if not gpos: continue
                 if pg.time.get_ticks() < suppress_click_until_ms:
                     continue
                 gx, gy = gpos
-                if event_visible and current_event: continue
-                if held > long_press_ms and grid[gy][gx].occupied:
-                    gid = demolish_at(grid, gx, gy)
-                    if gid:
-                        remove_population_gid(gid)
-                    connected_roads, connected_gids = recompute_connectivity(grid)
-                    refresh_treasury_cap(state, grid, connected_gids)
-                    jobs_com, jobs_ind, jobs_farm, labor_total, labor_com, labor_ind, labor_farm = update_labor_market(state, grid, connected_gids)
-                    recompute_resources(state, grid, connected_gids)
+                if view.pending_event: continue
+                if held > long_press_ms and view.occupied(gx, gy):
+                    client.send("demolish", gx, gy)
                     continue
                 if not selected_build:
                     push_message("Escolha uma construção no menu.", ttl=1.8, color=(200,140,60))
                 else:
-                    # requisitos/custo
-                    reqs = CATALOG.get(selected_build, {}).get("requires", [])
-                    for req in reqs:
-                        if not has_building(grid, req):
-                            push_message(f"Requer {req}.", ttl=2.0); break
-                    else:
-                        cost = -BUILD_EFFECTS.get(selected_build, {}).get("money", 0)
-                        if state.money < cost:
-                            push_message("Dinheiro insuficiente.", ttl=2.0); continue
-                        ok, res = place_build(grid, gx, gy, selected_build)
-                        if not ok:
-                            push_message(res or "Falha ao construir.", ttl=2.0)
-                        else:
-                            state.money -= cost
-                            if selected_build in ("Casa","Condomínio"): add_population_random(res, selected_build)
-                            if selected_build == "Rua":
-                                state.power_use_once += ROAD_ONEOFF_POWER
-                                state.water_use_once += ROAD_ONEOFF_WATER
-                            connected_roads, connected_gids = recompute_connectivity(grid)
-                            refresh_treasury_cap(state, grid, connected_gids)
-                            jobs_com, jobs_ind, jobs_farm, labor_total, labor_com, labor_ind, labor_farm = update_labor_market(state, grid, connected_gids)
-                            recompute_resources(state, grid, connected_gids)
-            elif e.type == pg.MOUSEMOTION and painting_roads and selected_build == "Rua":
+                    client.send("build", selected_build, gx, gy)
+            elif e.type == pg.MOUSEMOTION and painting_roads and road_batch and selected_build == "Rua":
                 mx, my = e.pos
-                gpos = px_to_grid(mx, my)
+                gpos = cell_at(mx, my)
                 if gpos:
                     gx, gy = gpos
-                    if not grid[gy][gx].occupied:
-                        cost = -BUILD_EFFECTS.get("Rua", {}).get("money", 0)
-                        if state.money < cost:
-                            push_message("Dinheiro insuficiente.", ttl=2.0)
-                            painting_roads = False
-                        else:
-                            ok, _ = place_build(grid, gx, gy, "Rua")
-                            if ok:
-                                state.money -= cost
-                                state.power_use_once += ROAD_ONEOFF_POWER
-                                state.water_use_once += ROAD_ONEOFF_WATER
-                                connected_roads, connected_gids = recompute_connectivity(grid)
-                                jobs_com, jobs_ind, jobs_farm, labor_total, labor_com, labor_ind, labor_farm = update_labor_market(state, grid, connected_gids)
-                                recompute_resources(state, grid, connected_gids)
-
-        # tempo / lógica por tick
-        if not paused:
-            sec_accum += dt * speed
-            while sec_accum >= 1.0:
-                sec_accum -= 1.0
-                game_seconds_total += 1
-
-                # atualizar mercado de trabalho e receita por segundo
-                jobs_com, jobs_ind, jobs_farm, labor_total, labor_com, labor_ind, labor_farm = update_labor_market(state, grid, connected_gids)
-                income_tick_per_second(state, grid, connected_gids)
-
-                minute += 1
-                if minute >= 60:
-                    minute = 0
-                    hour += 1
-                    decay_oneoff_resources(state)
-                    recompute_resources(state, grid, connected_gids)
-                    inflation_hourly(state, grid, connected_gids)
-                    socio_env_hourly(state, grid, connected_gids)
-                    if hour >= 24:
-                        hour = 0; day += 1
-                        # aging anual simples
-                        if day == 1 and month == 1:
-                            y2a = round(state.pop_young * 0.20)
-                            a2e = round(state.pop_adult * 0.04)
-                            e2out = round(state.pop_elder * 0.06)
-                            state.pop_young = max(0, state.pop_young - y2a)
-                            state.pop_adult = max(0, state.pop_adult + y2a - a2e)
-                            state.pop_elder = max(0, state.pop_elder + a2e - e2out)
-                            sync_population_scalar()
-                        # auto-saque
-                        if auto_tax:
-                            ok,_ = can_withdraw_now()
-                            if ok: perform_withdraw(auto=True)
-                        # felicidade diária
-                        update_happiness_daily(state, grid, connected_gids, GRID_SIZE)
-                        if day > 30:
-                            day = 1; month += 1
-                            if month > 12: month = 1; year += 1
-
-                # alfabetização: +0.2 pt/h se houver universidade conectada
-                if count_buildings_by_tile_connected(grid, connected_gids, "university") > 0:
-                    state.literacy = min(100.0, state.literacy + (0.2/60.0))
-
-                upkeep_minutely(state, grid)
+                    if not view.occupied(gx, gy):
+                        road_batch.place(gx, gy, "Rua")
+
+        # câmera: setas seguradas andam PAN_SPEED células/s
+        keys = pg.key.get_pressed()
+        for axis, (neg, pos) in enumerate(((pg.K_LEFT, pg.K_RIGHT), (pg.K_UP, pg.K_DOWN))):
+            pan_acc[axis] += (keys[pos] - keys[neg]) * PAN_SPEED * dt
+        step_x, step_y = int(pan_acc[0]), int(pan_acc[1])
+        pan_acc[0] -= step_x; pan_acc[1] -= step_y
+        cam_x = max(0, min(gsize - view_cols, cam_x + step_x))
+        cam_y = max(0, min(gsize - view_rows, cam_y + step_y))
+
+        # tempo / lógica por tick (no modo com thread, o client ignora dt)
+        client.update(dt)
+        view = client.snapshot()
+        while client.notices:
+            text, color = client.notices.popleft()
+            push_message(text, ttl=2.5, color=color)
 
         update_messages(dt)
 
         # ===== DRAW =====
         screen.fill(COLORS["bg"])
+        frame_rects = []   # o que muda (ou pode mudar) neste frame
 
         # topbar
-        def _canw(): return can_withdraw_now()
-        pause_btn_rect, withdraw_btn_rect, rect_map = draw_topbar(
-            screen, ui, COLORS, state, day, month, year, hour, minute,
-            paused, _canw, auto_tax
-        )
+        _canw = lambda: view.withdraw_status
+        pause_btn_rect, withdraw_btn_rect, rect_map = topbar.draw(screen, view)
+        frame_rects += topbar.dirty
         auto_btn_rect = rect_map.get("auto_tax")
 
-        # grid
+        # grid (camada retida: só tiles alterados são repintados)
         mx, my = pg.mouse.get_pos()
-        hover = px_to_grid(mx, my)
-        for y in range(GRID_SIZE):
-            for x in range(GRID_SIZE):
-                px, py = grid_to_px(x, y)
-                key = grid[y][x].btype if grid[y][x].occupied else "empty"
-                img = get_tile_img(key)
-                if img: screen.blit(img, (px, py))
-                pg.draw.rect(screen, COLORS["grid"], pg.Rect(px, py, TILE, TILE), width=1, border_radius=4)
+        hover = cell_at(mx, my)
+        grid_dirty = grid_layer.update(view.tiles, (cam_x, cam_y))
+        grid_layer.blit(screen)
 
-        # preview de construção
-        if hover and (not event_visible) and selected_build:
+        # sugestões de local (encostado em rua conectada) + preview válido/inválido
+        if (not view.pending_event) and selected_build:
+            cfg = CATALOG[selected_build]
+            for sx, sy in view.suggest(selected_build):
+                corner = cell_px(sx, sy)
+                if corner:
+                    px, py = corner
+                    r = pg.Rect(px, py, cfg["w"]*(TILE+2)-2, cfg["h"]*(TILE+2)-2)
+                    pg.draw.rect(screen, COLORS["suggest"], r, width=1, border_radius=4)
+                    frame_rects.append(r)
+        if hover and (not view.pending_event) and selected_build:
             hx, hy = hover
             cfg = CATALOG[selected_build]
+            color = COLORS["preview"] if view.is_valid(hx, hy, selected_build) else COLORS["preview_bad"]
             for j in range(cfg["h"]):
                 for i in range(cfg["w"]):
                     x = hx + i; y = hy + j
-                    if 0 <= x < GRID_SIZE and 0 <= y < GRID_SIZE:
-                        px, py = grid_to_px(x, y)
-                        pg.draw.rect(screen, COLORS["preview"], pg.Rect(px, py, TILE, TILE), width=2, border_radius=4)
+                    corner = cell_px(x, y) if x < gsize and y < gsize else None
+                    if corner:
+                        px, py = corner
+                        r = pg.Rect(px, py, TILE, TILE)
+                        pg.draw.rect(screen, color, r, width=2, border_radius=4)
+                        frame_rects.append(r)
 
         # rodapé + submenu (agora com verificador de requisitos)
-        cat_rects = draw_category_menu(screen, ui, active_category)
-        submenu_rects, submenu_disabled_map = ([], {})
-        if active_category:
-            submenu_rects, submenu_disabled_map = draw_submenu(
-                screen, ui, CATALOG, active_category,
-                can_build_req_fn=lambda req: has_building(grid, req)
-            )
+        cat_rects = category_menu.draw(screen, active_category)
+        submenu_rects, submenu_disabled_map = submenu.draw(screen, active_category, view.has_building)
+        frame_rects += category_menu.dirty + submenu.dirty
 
         # eventos/dilemas (UI básica)
-        if event_visible and current_event:
+        current_event = view.pending_event
+        if current_event:
             panel = draw_panel(screen, WIDTH//2 - 320, HEIGHT//2 - 160, 640, 320)
+            frame_rects.append(panel)
             draw_text(screen, "DILEMA", panel.centerx, panel.top + 22, size=28, color=(30,60,100), center=True)
             draw_text(screen, current_event.title, panel.left + 24, panel.top + 58, size=22, color=(30,50,70))
             draw_text(screen, current_event.desc, panel.left + 24, panel.top + 88, size=20, color=(40,60,80))
-            a_label = list(current_event.options.keys())[0]
-            b_label = list(current_event.options.keys())[1]
+            a_key, b_key = list(current_event.options.keys())[:2]
+            a_label = current_event.options[a_key].__doc__ or a_key
+            b_label = current_event.options[b_key].__doc__ or b_key
             draw_text(screen, f"A) {a_label}", panel.left + 24, panel.top + 148, size=20, color=(20,40,60))
             draw_text(screen, f"B) {b_label}", panel.left + 24, panel.top + 178, size=20, color=(20,40,60))
             draw_text(screen, "Pressione A ou B", panel.centerx, panel.bottom - 28, size=18, color=(80,110,140), center=True)
 
         # toasts
-        draw_messages()
+        frame_rects += draw_messages()
 
         # tooltips
         hovered_any = False
@@ -404,9 +283,16 @@ def run_game():
             hover_key = None
         if hover_key and (pg.time.get_ticks() - hover_start_ms >= TOOLTIP_DELAY_MS):
             from ui_draw import tooltip_text_for_key
-            tip = tooltip_text_for_key(hover_key, state, jobs_com, jobs_ind, labor_com, labor_ind, _canw)
-            if tip: draw_tooltip(screen, tip, (mx, my))
+            jobs_com, jobs_ind, _, _, labor_com, labor_ind, _ = view.labor
+            tip = tooltip_text_for_key(hover_key, view.state, jobs_com, jobs_ind, labor_com, labor_ind, _canw, view.shortages)
+            if tip: frame_rects.append(draw_tooltip(screen, tip, (mx, my)))
 
-        pg.display.flip()
+        if full_redraw:
+            pg.display.flip(); full_redraw = False
+        else:
+            # o que mudou agora + o que foi desenhado no frame anterior (para apagar)
+            pg.display.update(grid_dirty + frame_rects + prev_rects)
+        prev_rects = frame_rects
 
+    client.stop()
     pg.quit()
@@ -0,0 +1,171 @@
+# grid_array.py — backend de grid em arrays NumPy (structure-of-arrays)
+from typing import Dict, List, Set, Tuple
+import numpy as np
+
+from models import Cell, GidAllocator
+from config_game import CATALOG
+
+# códigos inteiros de tile (0 = vazio)
+TILE_NAMES = [None] + sorted({cfg["tile"] for cfg in CATALOG.values()})
+TILE_CODES = {name: code for code, name in enumerate(TILE_NAMES) if name}
+
+def _dilate4(mask: np.ndarray) -> np.ndarray:
+    out = mask.copy()
+    out[1:]    |= mask[:-1]
+    out[:-1]   |= mask[1:]
+    out[:, 1:] |= mask[:, :-1]
+    out[:, :-1] |= mask[:, 1:]
+    return out
+
+def _component_labels(mask: np.ndarray) -> np.ndarray:
+    """Rótulo (índice da menor célula) por componente 4-conexo de `mask`; fora da máscara = mask.size."""
+    n = mask.size
+    lab = np.where(mask, np.arange(n).reshape(mask.shape), n)
+    while True:
+        m = lab.copy()
+        np.minimum(m[1:], lab[:-1], out=m[1:])
+        np.minimum(m[:-1], lab[1:], out=m[:-1])
+        np.minimum(m[:, 1:], lab[:, :-1], out=m[:, 1:])
+        np.minimum(m[:, :-1], lab[:, 1:], out=m[:, :-1])
+        flat = np.where(mask.ravel(), m.ravel(), n)
+        ext = np.append(flat, n)
+        while True:   # pointer jumping até estabilizar
+            nxt = ext[flat]
+            if np.array_equal(nxt, flat): break
+            flat = nxt; ext[:-1] = flat
+        flat = flat.reshape(mask.shape)
+        if np.array_equal(flat, lab): return lab
+        lab = flat
+
+class _RowView:
+    __slots__ = ("grid", "y")
+    def __init__(self, grid: "ArrayGrid", y: int):
+        self.grid, self.y = grid, y
+    def __len__(self): return self.grid.size
+    def __getitem__(self, x: int) -> Cell: return self.grid.cell(x, self.y)
+    def __iter__(self):
+        for x in range(self.grid.size): yield self.grid.cell(x, self.y)
+
+class ArrayGrid:
+    """
+    Grid com tipo (int8), group_id (int32) e flags de ocupação/raiz em arrays [y, x].
+    grid[y][x] devolve um Cell montado sob demanda, para os chamadores antigos.
+    """
+    def __init__(self, size: int):
+        self.size = size
+        self.codes = np.zeros((size, size), dtype=np.int8)
+        self.gids = np.zeros((size, size), dtype=np.int32)
+        self.occupied = np.zeros((size, size), dtype=bool)
+        self.root = np.zeros((size, size), dtype=bool)
+        self.connected = np.zeros((size, size), dtype=bool)   # célula de prédio com gid conectado
+        self.connected_gids: Set[str] = set()
+        self.connected_roads: Set[Tuple[int,int]] = set()
+        self._conn_version = -1
+        self._net_box = None   # caixa (só cresce) que contém todas as ruas/prefeituras
+        self.ids = GidAllocator()
+        self.footprints: Dict[int, Tuple[int,int,int,int]] = {}   # gid -> (x, y, w, h)
+        # contagens de prédios por tile, mantidas em place/demolish e na conectividade
+        self.tile_counts: Dict[str, int] = {}
+        self.connected_counts: Dict[str, int] = {}
+        self.by_tile: Dict[str, Dict[int, None]] = {}   # gids por tile (dict = ordem de construção)
+        self.version = 0
+
+    # ---- compat list[list[Cell]]
+    def __len__(self): return self.size
+    def __getitem__(self, y: int) -> _RowView: return _RowView(self, y)
+    def __iter__(self):
+        for y in range(self.size): yield _RowView(self, y)
+
+    def cell(self, x: int, y: int) -> Cell:
+        if not self.occupied[y, x]: return Cell()
+        return Cell(TILE_NAMES[self.codes[y, x]], True, bool(self.root[y, x]), str(int(self.gids[y, x])))
+
+    # ---- construção / demolição
+    def can_place(self, x, y, w, h) -> bool:
+        if x + w > self.size or y + h > self.size: return False
+        return not self.occupied[y:y+h, x:x+w].any()
+
+    def place(self, x, y, w, h, tile: str) -> str:
+        gid = int(self.ids.allocate())
+        self.footprints[gid] = (x, y, w, h)
+        self.version += 1
+        self.codes[y:y+h, x:x+w] = TILE_CODES[tile]
+        self.gids[y:y+h, x:x+w] = gid
+        self.occupied[y:y+h, x:x+w] = True
+        self.root[y, x] = True
+        self.tile_counts[tile] = self.tile_counts.get(tile, 0) + 1
+        self.by_tile.setdefault(tile, {})[gid] = None
+        if tile in ("road", "city_hall"):
+            b = self._net_box or (y, y+h, x, x+w)
+            self._net_box = (min(b[0], y), max(b[1], y+h), min(b[2], x), max(b[3], x+w))
+        return str(gid)
+
+    def demolish_gid(self, gid: str):
+        rect = self.footprints.pop(int(gid), None)
+        if rect is None: return
+        self.version += 1
+        x, y, w, h = rect
+        tile = TILE_NAMES[self.codes[y, x]]
+        self.tile_counts[tile] -= 1
+        del self.by_tile[tile][int(gid)]
+        if str(gid) in self.connected_gids:
+            self.connected_gids.discard(str(gid))
+            self.connected_counts[tile] -= 1
+        sl = (slice(y, y+h), slice(x, x+w))
+        self.codes[sl] = 0; self.gids[sl] = 0
+        self.occupied[sl] = False; self.root[sl] = False; self.connected[sl] = False
+
+    def building_cells(self, gid: str) -> List[Tuple[int,int]]:
+        rect = self.footprints.get(int(gid))
+        if rect is None: return []
+        x, y, w, h = rect
+        return [(x+i, y+j) for j in range(h) for i in range(w)]
+
+    def buildings_of(self, tile_key: str) -> List[Tuple[str, List[Tuple[int,int]]]]:
+        return [(str(gid), self.building_cells(gid)) for gid in self.by_tile.get(tile_key, ())]
+
+    # ---- contagens (O(1), como no BuildingRegistry)
+    def count_all(self, tile_key: str) -> int:
+        return self.tile_counts.get(tile_key, 0)
+
+    def count_connected(self, connected_gids: Set[str], tile_key: str) -> int:
+        if connected_gids is self.connected_gids:
+            return self.connected_counts.get(tile_key, 0)
+        return sum(1 for g in connected_gids if self.tile_of(g) == tile_key)
+
+    def tile_of(self, gid: str):
+        rect = self.footprints.get(int(gid))
+        return TILE_NAMES[self.codes[rect[1], rect[0]]] if rect else None
+
+    # ---- conectividade (rótulos de componentes + dilatação)
+    def recompute_connectivity(self) -> Tuple[Set[Tuple[int,int]], Set[str]]:
+        # memo por version; os conjuntos são sempre os mesmos objetos, atualizados
+        # no lugar (como os conjuntos vivos do Grid), p/ o atalho de count_connected
+        if self._conn_version == self.version: return self.connected_roads, self.connected_gids
+        self._conn_version = self.version
+        for g in self.connected_gids:   # limpa só os prédios que estavam conectados
+            rect = self.footprints.get(int(g))
+            if rect: x, y, w, h = rect; self.connected[y:y+h, x:x+w] = False
+        self.connected_roads.clear(); self.connected_gids.clear(); self.connected_counts.clear()
+        if not self.tile_counts.get("city_hall"): return self.connected_roads, self.connected_gids
+
+        # rótulos só na caixa das ruas/prefeituras (+1 de borda p/ os vizinhos)
+        by, bY, bx, bX = self._net_box
+        y0, y1, x0, x1 = max(0, by - 1), min(self.size, bY + 1), max(0, bx - 1), min(self.size, bX + 1)
+        win = (slice(y0, y1), slice(x0, x1))
+        roads = self.codes[win] == TILE_CODES["road"]
+        halls = self.codes[win] == TILE_CODES["city_hall"]
+        labels = _component_labels(roads)
+        seed_labels = np.unique(labels[roads & _dilate4(halls)])
+        conn_roads = roads & np.isin(labels, seed_labels)
+        touching = _dilate4(conn_roads) & self.occupied[win] & ~roads
+        ids = np.unique(self.gids[win][touching])
+        for g in ids.tolist():   # prédio inteiro, mesmo a parte fora da caixa
+            x, y, w, h = self.footprints[g]
+            self.connected[y:y+h, x:x+w] = True
+            tile = TILE_NAMES[self.codes[y, x]]
+            self.connected_counts[tile] = self.connected_counts.get(tile, 0) + 1
+        self.connected_gids.update(str(g) for g in ids.tolist())
+        ys, xs = np.nonzero(conn_roads)
+        self.connected_roads.update(zip((xs + x0).tolist(), (ys + y0).tolist()))
+        return self.connected_roads, self.connected_gids
@@ -0,0 +1,206 @@
+# grid_chunked.py — mapa esparso em chunks (p/ cidades grandes, 1024+)
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import numpy as np
+
+from models import Cell
+
+CHUNK = 32
+Key = Tuple[int, int]   # (cx, cy) do chunk
+
+class Chunk:
+    """Bloco CHUNK×CHUNK alocado na primeira construção; None = célula vazia."""
+    __slots__ = ("cells", "occupied")
+    def __init__(self, n: int):
+        self.cells: list[list[Optional[Cell]]] = [[None] * n for _ in range(n)]
+        self.occupied = 0   # células ocupadas (0 = chunk liberado)
+
+    def _account(self, c: Optional[Cell], sign: int):
+        if c is not None and c.occupied: self.occupied += sign
+
+class _ChunkRow:
+    __slots__ = ("grid", "y")
+    def __init__(self, grid: "ChunkedGrid", y: int):
+        self.grid, self.y = grid, y
+    def __len__(self): return self.grid.size
+    def __getitem__(self, x: int) -> Cell: return self.grid.get(x, self.y)
+    def __setitem__(self, x: int, cell: Cell): self.grid.set(x, self.y, cell)
+    def __iter__(self):
+        for x in range(self.grid.size): yield self.grid.get(x, self.y)
+
+class ChunkedGrid:
+    """
+    Grid esparso: só chunks com construções existem em memória; chunks que
+    ficam vazios são liberados. grid[y][x] funciona como no Grid de listas
+    (contagens e conectividade vêm do registro/rede, como no Grid).
+    """
+    def __init__(self, size: int, chunk: int = CHUNK):
+        self.size = size
+        self.chunk = chunk
+        self.chunks: Dict[Tuple[int,int], Chunk] = {}
+
+    # ---- compat list[list[Cell]]
+    def __len__(self): return self.size
+    def __getitem__(self, y: int) -> _ChunkRow: return _ChunkRow(self, y)
+    def __iter__(self):
+        for y in range(self.size): yield _ChunkRow(self, y)
+
+    def get(self, x: int, y: int) -> Cell:
+        ch = self.chunks.get((x // self.chunk, y // self.chunk))
+        if ch is None: return Cell()
+        c = ch.cells[y % self.chunk][x % self.chunk]
+        return c if c is not None else Cell()
+
+    def set(self, x: int, y: int, cell: Cell):
+        key = (x // self.chunk, y // self.chunk)
+        ch = self.chunks.get(key)
+        if ch is None:
+            if not cell.occupied: return
+            ch = self.chunks[key] = Chunk(self.chunk)
+        ly, lx = y % self.chunk, x % self.chunk
+        ch._account(ch.cells[ly][lx], -1)
+        ch.cells[ly][lx] = cell if cell.occupied else None
+        ch._account(cell, +1)
+        if ch.occupied == 0: del self.chunks[key]
+
+# ---- campos por célula guardados por chunk
+
+def near_keys(keys: Iterable[Key], size: int, r: int = 1, chunk: int = CHUNK) -> List[Key]:
+    """Chunks de `keys` e vizinhos até `r` (dentro do mapa), em ordem (cy, cx)."""
+    nc = (size + chunk - 1) // chunk
+    out = {(cx + dx, cy + dy) for (cx, cy) in keys for dy in range(-r, r + 1) for dx in range(-r, r + 1)}
+    return sorted(((cx, cy) for cx, cy in out if 0 <= cx < nc and 0 <= cy < nc), key=lambda k: (k[1], k[0]))
+
+class ChunkField:
+    """
+    Campo n×n guardado em blocos CHUNK×CHUNK (NumPy), criados na primeira
+    escrita; fora deles vale `fill`. Memória ∝ chunks usados, não n².
+    field[y, x] lê como um array; gather/padded montam pilhas (k, C, C) p/
+    as contas vetorizadas só nos chunks que interessam. snapshot() divide os
+    blocos com uma cópia só-leitura; o próximo write() num bloco dividido
+    copia antes (copy-on-write).
+    """
+    def __init__(self, size: int, dtype, fill=0, chunk: int = CHUNK):
+        self.size, self.chunk = size, chunk
+        self.dtype = np.dtype(dtype)
+        self.fill = self.dtype.type(fill)
+        self.blocks: Dict[Key, np.ndarray] = {}
+        self._shared: Set[Key] = set()
+
+    @property
+    def shape(self) -> Tuple[int, int]: return self.size, self.size
+
+    @property
+    def nbytes(self) -> int: return sum(b.nbytes for b in self.blocks.values())
+
+    def __getitem__(self, yx):
+        y, x = yx
+        b = self.blocks.get((x // self.chunk, y // self.chunk))
+        return b[y % self.chunk, x % self.chunk] if b is not None else self.fill
+
+    def get(self, x: int, y: int): return self[y, x]
+
+    # ---- escrita
+    def write(self, key: Key) -> np.ndarray:
+        """Bloco de `key` p/ escrita (criado com fill; copiado se um snapshot o divide)."""
+        b = self.blocks.get(key)
+        if b is None:
+            b = self.blocks[key] = np.full((self.chunk, self.chunk), self.fill, dtype=self.dtype)
+        elif key in self._shared:
+            b = self.blocks[key] = b.copy()
+            self._shared.discard(key)
+        return b
+
+    def store(self, key: Key, block: np.ndarray):
+        # troca o bloco inteiro (None/igual a fill em tudo = libera o chunk)
+        self._shared.discard(key)
+        if block is None or not (block != self.fill).any(): self.blocks.pop(key, None)
+        else: self.blocks[key] = block.astype(self.dtype, copy=False)
+
+    def put(self, xs, ys, values) -> Set[Key]:
+        """field[ys, xs] = values (arrays); devolve os chunks tocados."""
+        c = self.chunk
+        xs = np.asarray(xs, dtype=np.int64); ys = np.asarray(ys, dtype=np.int64)
+        values = np.broadcast_to(np.asarray(values, dtype=self.dtype), xs.shape)
+        if not len(xs): return set()
+        cx, cy = xs // c, ys // c
+        if cx.min() == cx.max() and cy.min() == cy.max():
+            # caso comum (um prédio, um chunk): sem separar por chunk
+            key = (int(cx[0]), int(cy[0]))
+            self.write(key)[ys - key[1]*c, xs - key[0]*c] = values
+            return {key}
+        touched = set()
+        for key in set(zip(cx.tolist(), cy.tolist())):
+            sel = (cx == key[0]) & (cy == key[1])
+            self.write(key)[ys[sel] % c, xs[sel] % c] = values[sel]
+            touched.add(key)
+        return touched
+
+    def prune(self, keys: Iterable[Key]):
+        # libera os blocos de `keys` que voltaram a ser só fill
+        for key in keys:
+            b = self.blocks.get(key)
+            if b is not None and not (b != self.fill).any():
+                del self.blocks[key]; self._shared.discard(key)
+
+    def snapshot(self) -> "ChunkField":
+        """Cópia só-leitura que divide os blocos atuais (custo ∝ nº de chunks)."""
+        out = ChunkField(self.size, self.dtype, self.fill, self.chunk)
+        for b in self.blocks.values(): b.setflags(write=False)
+        out.blocks = dict(self.blocks)
+        self._shared = set(self.blocks)
+        return out
+
+    # ---- leitura em bloco
+    def gather(self, keys: List[Key]) -> np.ndarray:
+        """Pilha (k, C, C) dos blocos de `keys` (fill onde não há bloco)."""
+        c = self.chunk
+        out = np.full((len(keys), c, c), self.fill, dtype=self.dtype)
+        for i, key in enumerate(keys):
+            b = self.blocks.get(key)
+            if b is not None: out[i] = b
+        return out
+
+    def window(self, y0: int, y1: int, x0: int, x1: int, outside=None) -> np.ndarray:
+        """Cópia densa de [y0:y1, x0:x1]; fora do mapa vale `outside` (padrão: fill)."""
+        c, n = self.chunk, self.size
+        out = np.full((y1 - y0, x1 - x0), self.fill, dtype=self.dtype)
+        if outside is not None and (y0 < 0 or x0 < 0 or y1 > n or x1 > n):
+            out[...] = outside
+            out[max(0, -y0):min(n, y1) - y0, max(0, -x0):min(n, x1) - x0] = self.fill
+        for cy in range(max(0, y0) // c, (min(n, y1) - 1) // c + 1):
+            for cx in range(max(0, x0) // c, (min(n, x1) - 1) // c + 1):
+                b = self.blocks.get((cx, cy))
+                if b is None: continue
+                by0, bx0 = cy * c, cx * c
+                sy0, sy1 = max(y0, by0), min(y1, by0 + c, n)
+                sx0, sx1 = max(x0, bx0), min(x1, bx0 + c, n)
+                out[sy0 - y0:sy1 - y0, sx0 - x0:sx1 - x0] = b[sy0 - by0:sy1 - by0, sx0 - bx0:sx1 - bx0]
+        return out
+
+    def padded(self, keys: List[Key], pad: int, outside=None) -> np.ndarray:
+        """Pilha (k, C+2·pad, C+2·pad): cada bloco com `pad` células das vizinhas em volta."""
+        c = self.chunk
+        out = np.empty((len(keys), c + 2*pad, c + 2*pad), dtype=self.dtype)
+        for i, (cx, cy) in enumerate(keys):
+            out[i] = self.window(cy*c - pad, cy*c + c + pad, cx*c - pad, cx*c + c + pad, outside)
+        return out
+
+    def clip(self, keys: List[Key], stack: np.ndarray, value=0) -> np.ndarray:
+        # células dos blocos de borda que passam do mapa (n não múltiplo de CHUNK) = value
+        c, n = self.chunk, self.size
+        if n % c:
+            for i, (cx, cy) in enumerate(keys):
+                stack[i, n - cy*c:] = value; stack[i, :, n - cx*c:] = value
+        return stack
+
+    def nonzero(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(xs, ys, valores) das células diferentes de 0, em ordem de linha."""
+        c = self.chunk
+        xs, ys, vs = [], [], []
+        for (cx, cy), b in self.blocks.items():
+            ly, lx = np.nonzero(b)
+            xs.append(lx + cx*c); ys.append(ly + cy*c); vs.append(b[ly, lx])
+        if not xs: return np.zeros(0, np.int64), np.zeros(0, np.int64), np.zeros(0, self.dtype)
+        xs, ys, vs = np.concatenate(xs), np.concatenate(ys), np.concatenate(vs)
+        order = np.lexsort((xs, ys))
+        return xs[order], ys[order], vs[order]
@@ -0,0 +1,52 @@
+# grid_layer.py — camada retida do mapa: só os tiles que mudaram são redesenhados
+from typing import Callable, List, Tuple
+import numpy as np
+import pygame as pg
+
+from settings import TILE, MARGIN_LEFT, MARGIN_TOP
+from grid_array import TILE_NAMES
+from grid_chunked import ChunkField
+from grid_system import grid_to_px
+
+class GridLayer:
+    """
+    Surface com os tiles visíveis já desenhados (imagem + borda), a partir
+    da célula `origin` (câmera). update() compara os códigos do snapshot na
+    janela com os já pintados e redesenha só as células diferentes,
+    devolvendo os retângulos de tela que mudaram. Um frame sem edição nem
+    movimento de câmera custa um blit, qualquer que seja o tamanho do mapa.
+    """
+    def __init__(self, cols: int, rows: int, get_tile_img: Callable, colors: dict):
+        self.cols, self.rows = cols, rows
+        self.get_tile_img = get_tile_img
+        self.colors = colors
+        self.surface = pg.Surface((cols * (TILE + 2), rows * (TILE + 2)))
+        self.surface.fill(colors["bg"])
+        self.codes = np.full((rows, cols), -1, dtype=np.int16)   # -1 = nunca pintado
+        self._src = None
+        self._origin: Tuple[int, int] = (0, 0)
+
+    def _paint(self, x: int, y: int, code: int):
+        r = pg.Rect(x * (TILE + 2), y * (TILE + 2), TILE, TILE)
+        self.surface.fill(self.colors["bg"], r)
+        img = self.get_tile_img(TILE_NAMES[code] or "empty")
+        if img: self.surface.blit(img, r.topleft)
+        pg.draw.rect(self.surface, self.colors["grid"], r, width=1, border_radius=4)
+
+    def update(self, tiles: ChunkField, origin: Tuple[int, int] = (0, 0)) -> List[pg.Rect]:
+        # o snapshot só troca os tiles quando o grid muda: mesma referência e
+        # mesma câmera = nada a fazer
+        if tiles is self._src and origin == self._origin: return []
+        self._src, self._origin = tiles, origin
+        ox, oy = origin
+        view = tiles.window(oy, oy + self.rows, ox, ox + self.cols)
+        ys, xs = np.nonzero(view != self.codes)
+        dirty = []
+        for y, x in zip(ys.tolist(), xs.tolist()):
+            self._paint(x, y, int(view[y, x]))
+            dirty.append(pg.Rect(*grid_to_px(x, y), TILE, TILE))
+        self.codes[ys, xs] = view[ys, xs]
+        return dirty
+
+    def blit(self, screen):
+        screen.blit(self.surface, (MARGIN_LEFT, MARGIN_TOP))
@@ -1,43 +1,145 @@
 # grid_system.py
-from typing import Optional, Tuple, Set, Dict
-from time import time as now
-import pygame as pg
+from typing import Optional, Tuple, Set, Dict, List, Callable
+import numpy as np
 
-from models import Cell, CityState
-from config_game import CATALOG
+from models import Cell, CityState, GidAllocator
+from config_game import CATALOG, BUILD_EFFECTS, ROAD_ONEOFF_POWER, ROAD_ONEOFF_WATER
 from settings import GRID_SIZE, TILE, MARGIN_LEFT, MARGIN_TOP
+from road_network import RoadNetwork
+from grid_array import ArrayGrid, TILE_CODES
+from grid_chunked import ChunkedGrid, ChunkField, Key
 
 # ---- Conversões grid/pixel
 def grid_to_px(x, y): return (MARGIN_LEFT + x * (TILE + 2), MARGIN_TOP + y * (TILE + 2))
 
-def px_to_grid(px, py):
+def px_to_grid(px, py, size: int = GRID_SIZE):
     gx = (px - MARGIN_LEFT) // (TILE + 2)
     gy = (py - MARGIN_TOP) // (TILE + 2)
-    if 0 <= gx < GRID_SIZE and 0 <= gy < GRID_SIZE: return int(gx), int(gy)
+    if 0 <= gx < size and 0 <= gy < size: return int(gx), int(gy)
     return None
 
+def grid_size(grid) -> int:
+    # tamanho do mapa é por cidade (Grid/ArrayGrid/ChunkedGrid guardam .size)
+    return getattr(grid, "size", None) or len(grid)
+
+# ---- Registro incremental de construções
+class BuildingRegistry:
+    """
+    Índice gid -> (tile, footprint) e contagens de raízes por tile, mantidos por
+    place_build/demolish_gid. `connected` é o conjunto de gids conectados,
+    mantido pela RoadNetwork do grid. footprint[0] é a célula raiz.
+    """
+    def __init__(self):
+        self.tile_counts: Dict[str, int] = {}
+        self.connected_counts: Dict[str, int] = {}
+        self.gid_tile: Dict[str, str] = {}
+        self.footprints: Dict[str, List[Tuple[int,int]]] = {}
+        self.by_tile: Dict[str, Set[str]] = {}
+        self.connected: Set[str] = set()
+        self.version = 0   # muda a cada construção/demolição (chave de caches)
+        self.tile_versions: Dict[str, int] = {}   # idem, por tile
+
+    def _touch(self, tile: str):
+        self.version += 1
+        self.tile_versions[tile] = self.tile_versions.get(tile, 0) + 1
+
+    def add(self, gid: str, tile: str, cells: List[Tuple[int,int]]):
+        self._touch(tile)
+        self.gid_tile[gid] = tile
+        self.footprints[gid] = cells
+        self.by_tile.setdefault(tile, set()).add(gid)
+        self.tile_counts[tile] = self.tile_counts.get(tile, 0) + 1
+
+    def remove(self, gid: str):
+        tile = self.gid_tile.pop(gid, None)
+        if tile is None: return
+        self._touch(tile)
+        del self.footprints[gid]
+        self.by_tile[tile].discard(gid)
+        self.tile_counts[tile] -= 1
+        if gid in self.connected:
+            self.connected.discard(gid)
+            self.connected_counts[tile] -= 1
+
+    def link(self, gid: str):
+        if gid in self.connected: return
+        self.connected.add(gid)
+        tile = self.gid_tile[gid]
+        self.connected_counts[tile] = self.connected_counts.get(tile, 0) + 1
+
+    def unlink(self, gid: str):
+        if gid not in self.connected: return
+        self.connected.discard(gid)
+        self.connected_counts[self.gid_tile[gid]] -= 1
+
+    def count(self, tile_key: str) -> int:
+        return self.tile_counts.get(tile_key, 0)
+
+    def count_connected(self, connected_gids: Set[str], tile_key: str) -> int:
+        if connected_gids is self.connected:
+            return self.connected_counts.get(tile_key, 0)
+        return sum(1 for gid in connected_gids if self.gid_tile.get(gid) == tile_key)
+
+def _attach_indices(grid, size: int):
+    grid.registry = BuildingRegistry()
+    grid.network = RoadNetwork(grid, size, grid.registry)
+    grid.ids = GidAllocator()
+
+class Grid(list):
+    """list[list[Cell]] com registro e rede de ruas incrementais (grid[y][x] continua valendo)."""
+    def __init__(self, size: int = GRID_SIZE):
+        super().__init__([Cell() for _ in range(size)] for _ in range(size))
+        self.size = size
+        _attach_indices(self, size)
+
+def _registry(grid) -> Optional[BuildingRegistry]:
+    return getattr(grid, "registry", None)
+
+_fallback_ids = GidAllocator()   # grids crus (list[list[Cell]]) sem alocador próprio
+
 # ---- Inicialização do grid
-def make_grid() -> list[list[Cell]]:
-    return [[Cell() for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
+def make_grid(size: int = GRID_SIZE, backend: str = "list"):
+    # "list": Grid de Cells (incremental); "array": ArrayGrid em NumPy (vetorizado);
+    # "chunked": ChunkedGrid esparso (metrópoles, 1024+), com os mesmos índices do Grid
+    if backend == "array": return ArrayGrid(size)
+    if backend == "chunked":
+        grid = ChunkedGrid(size)
+        _attach_indices(grid, size)
+        return grid
+    return Grid(size)
 
-# ---- Helpers de contagem
+# ---- Helpers de contagem (O(1) via registro; varredura só p/ grids crus)
 def count_all(grid, tile_key: str) -> int:
-    return sum(1 for y in range(GRID_SIZE) for x in range(GRID_SIZE)
+    if isinstance(grid, ArrayGrid): return grid.count_all(tile_key)
+    reg = _registry(grid)
+    if reg is not None: return reg.count(tile_key)
+    n = grid_size(grid)
+    return sum(1 for y in range(n) for x in range(n)
                if grid[y][x].occupied and grid[y][x].is_root and grid[y][x].btype == tile_key)
 
 def count_buildings_by_tile_connected(grid, connected_gids: Set[str], tile_key: str) -> int:
-    return sum(1 for y in range(GRID_SIZE) for x in range(GRID_SIZE)
+    if isinstance(grid, ArrayGrid): return grid.count_connected(connected_gids, tile_key)
+    reg = _registry(grid)
+    if reg is not None: return reg.count_connected(connected_gids, tile_key)
+    n = grid_size(grid)
+    return sum(1 for y in range(n) for x in range(n)
                if grid[y][x].occupied and grid[y][x].is_root and grid[y][x].btype == tile_key
                and (grid[y][x].group_id in connected_gids))
 
 def has_building(grid, name: str) -> bool:
     tile = CATALOG[name]["tile"]
+    if isinstance(grid, ArrayGrid): return grid.count_all(tile) > 0
+    reg = _registry(grid)
+    if reg is not None: return reg.count(tile) > 0
+    n = grid_size(grid)
     return any(grid[y][x].occupied and grid[y][x].is_root and grid[y][x].btype == tile
-               for y in range(GRID_SIZE) for x in range(GRID_SIZE))
+               for y in range(n) for x in range(n))
 
 # ---- Construção / demolição
 def can_place(grid, x, y, w, h) -> bool:
-    if x + w > GRID_SIZE or y + h > GRID_SIZE: return False
+    if isinstance(grid, ArrayGrid): return grid.can_place(x, y, w, h)
+    n = grid_size(grid)
+    if x + w > n or y + h > n: return False
     for j in range(h):
         for i in range(w):
             if grid[y+j][x+i].occupied: return False
@@ -47,19 +149,135 @@ def place_build(grid, x, y, name: str) -> Tuple[bool, Optional[str]]:
     cfg = CATALOG[name]
     w, h, tile = cfg["w"], cfg["h"], cfg["tile"]
     if not can_place(grid, x, y, w, h): return False, "Área ocupada/insuficiente."
-    gid = f"{int(now()*1000)}"
+    if isinstance(grid, ArrayGrid): return True, grid.place(x, y, w, h, tile)
+    gid = getattr(grid, "ids", _fallback_ids).allocate()
     grid[y][x] = Cell(tile, True, True, gid)
     for j in range(h):
         for i in range(w):
             if i==0 and j==0: continue
             grid[y+j][x+i] = Cell(tile, True, False, gid)
+    reg = _registry(grid)
+    if reg is not None:
+        cells = [(x+i, y+j) for j in range(h) for i in range(w)]
+        reg.add(gid, tile, cells)
+        grid.network.on_place(gid, tile, cells)
     return True, gid
 
 def demolish_gid(grid, gid: str):
-    for yy in range(GRID_SIZE):
-        for xx in range(GRID_SIZE):
-            if grid[yy][xx].group_id == gid:
-                grid[yy][xx] = Cell()
+    if isinstance(grid, ArrayGrid): return grid.demolish_gid(gid)
+    reg = _registry(grid)
+    if reg is None:
+        n = grid_size(grid)
+        for yy in range(n):
+            for xx in range(n):
+                if grid[yy][xx].group_id == gid:
+                    grid[yy][xx] = Cell()
+        return
+    cells = reg.footprints.get(gid)
+    if not cells: return
+    for (xx, yy) in cells: grid[yy][xx] = Cell()
+    grid.network.on_remove(gid, reg.gid_tile[gid], cells)
+    reg.remove(gid)
+
+def building_cells(grid, gid: str) -> List[Tuple[int,int]]:
+    # footprint do prédio (raiz primeiro); vazio se o gid não existe
+    if isinstance(grid, ArrayGrid): return grid.building_cells(gid)
+    reg = _registry(grid)
+    if reg is not None: return list(reg.footprints.get(gid, ()))
+    n = grid_size(grid)
+    cells = [(xx, yy) for yy in range(n) for xx in range(n) if grid[yy][xx].group_id == gid]
+    return sorted(cells, key=lambda p: not grid[p[1]][p[0]].is_root)
+
+def grid_version(grid) -> Optional[int]:
+    # contador de edições do grid; None p/ grids crus (sem como saber se mudou)
+    if isinstance(grid, ArrayGrid): return grid.version
+    reg = _registry(grid)
+    return reg.version if reg is not None else None
+
+def tiles_version(grid, tiles) -> Optional[tuple]:
+    # chave de cache que só muda quando prédios desses tiles mudam
+    reg = _registry(grid)
+    if reg is not None: return tuple(reg.tile_versions.get(t, 0) for t in tiles)
+    version = grid_version(grid)
+    return None if version is None else (version,)
+
+# ---- Mapa de códigos de tile (ChunkField, de qualquer backend)
+Box = Tuple[int, int, int, int]   # y0, y1, x0, x1 (fim exclusivo)
+
+def box_union(a: Optional[Box], b: Optional[Box]) -> Optional[Box]:
+    if a is None: return b
+    if b is None: return a
+    return min(a[0], b[0]), max(a[1], b[1]), min(a[2], b[2]), max(a[3], b[3])
+
+class TileMap:
+    """
+    codes[y, x] = código do tile (TILE_CODES; 0 = vazio ou tile fora de
+    `tiles`) num ChunkField: só chunks com algo pintado ocupam memória.
+    Mantido por diff: com registro, só os tiles cuja versão mudou são
+    relidos, gid a gid. sync() devolve a caixa que mudou desde a última
+    chamada (None = nada mudou) e deixa em `changed` os chunks tocados.
+    """
+    def __init__(self, grid, tiles=None):
+        self.grid = grid
+        self.codes = ChunkField(grid_size(grid), np.int8)
+        self.tiles = tuple(tiles) if tiles is not None else tuple(TILE_CODES)
+        self.changed: Set[Key] = set()
+        self._cells: Dict[str, Dict[str, list]] = {t: {} for t in self.tiles}
+        self._keys: Dict[Optional[str], object] = {}
+
+    def _paint(self, xs: np.ndarray, ys: np.ndarray, code) -> Box:
+        self.changed |= self.codes.put(xs, ys, code)
+        return int(ys.min()), int(ys.max()) + 1, int(xs.min()), int(xs.max()) + 1
+
+    def _paint_cells(self, cells, code: int) -> Box:
+        xs, ys = np.array(cells, dtype=np.int64).T
+        return self._paint(xs, ys, code)
+
+    def sync(self) -> Optional[Box]:
+        grid = self.grid
+        self.changed = set()
+        if isinstance(grid, ArrayGrid):
+            if self._keys.get(None) == grid.version: return None
+            self._keys[None] = grid.version
+            n = grid.size
+            new = np.where(np.isin(grid.codes, [TILE_CODES[t] for t in self.tiles]), grid.codes, 0).astype(np.int8)
+            ys, xs = np.nonzero(new != self.codes.window(0, n, 0, n))
+            if not len(ys): return None
+            box = self._paint(xs, ys, new[ys, xs])
+            self.codes.prune(self.changed)
+            return box
+        # primeiro todas as remoções, depois as adições: uma célula liberada por
+        # um tile e reusada por outro na mesma janela fica com o código novo
+        box, removed, added = None, [], {}
+        for tile in self.tiles:
+            key = tiles_version(grid, (tile,))
+            if key is not None and key == self._keys.get(tile): continue
+            self._keys[tile] = key
+            old = self._cells[tile]
+            now = dict(buildings_of(grid, tile))
+            for gid in [g for g in old if g not in now]: removed += old.pop(gid)
+            for gid, cells in now.items():
+                if gid in old: continue
+                old[gid] = cells
+                added.setdefault(tile, []).extend(cells)
+        if removed: box = self._paint_cells(removed, 0)
+        for tile, cells in added.items(): box = box_union(box, self._paint_cells(cells, TILE_CODES[tile]))
+        self.codes.prune(self.changed)
+        return box
+
+def buildings_of(grid, tile_key: str) -> List[Tuple[str, List[Tuple[int,int]]]]:
+    # (gid, footprint) de todos os prédios de um tile
+    if isinstance(grid, ArrayGrid): return grid.buildings_of(tile_key)
+    reg = _registry(grid)
+    if reg is not None: return [(gid, reg.footprints[gid]) for gid in reg.by_tile.get(tile_key, ())]
+    n = grid_size(grid)
+    gids = {grid[y][x].group_id for y in range(n) for x in range(n)
+            if grid[y][x].occupied and grid[y][x].btype == tile_key}
+    return [(gid, building_cells(grid, gid)) for gid in gids]
+
+def building_root(grid, gid: str) -> Optional[Tuple[int,int]]:
+    cells = building_cells(grid, gid)
+    return cells[0] if cells else None
 
 def demolish_at(grid, x, y):
     c = grid[y][x]
@@ -69,23 +287,30 @@ def demolish_at(grid, x, y):
     return gid
 
 # ---- Conectividade por rua ligada à Prefeitura
-def neighbors4(x, y):
+def neighbors4(x, y, size: int = GRID_SIZE):
     for dx, dy in ((1,0),(-1,0),(0,1),(0,-1)):
         nx, ny = x+dx, y+dy
-        if 0 <= nx < GRID_SIZE and 0 <= ny < GRID_SIZE:
+        if 0 <= nx < size and 0 <= ny < size:
             yield nx, ny
 
 def recompute_connectivity(grid) -> Tuple[Set[Tuple[int,int]], Set[str]]:
+    if isinstance(grid, ArrayGrid): return grid.recompute_connectivity()
+    # Grid mantém a rede a cada edição: aqui só devolvemos os conjuntos vivos
+    network = getattr(grid, "network", None)
+    if network is not None:
+        return network.connected_roads, grid.registry.connected
+
+    n = grid_size(grid)
     connected_roads: Set[Tuple[int,int]] = set()
     connected_gids: Set[str] = set()
-    halls = [(x,y) for y in range(GRID_SIZE) for x in range(GRID_SIZE)
+    halls = [(x,y) for y in range(n) for x in range(n)
              if grid[y][x].occupied and grid[y][x].btype == "city_hall"]
     if not halls: return connected_roads, connected_gids
 
     # ruas adjacentes à prefeitura
     seeds = []
     for (cx, cy) in halls:
-        for nx, ny in neighbors4(cx, cy):
+        for nx, ny in neighbors4(cx, cy, n):
             if grid[ny][nx].occupied and grid[ny][nx].btype == "road":
                 seeds.append((nx, ny))
 
@@ -95,22 +320,128 @@ def recompute_connectivity(grid) -> Tuple[Set[Tuple[int,int]], Set[str]]:
     while stack:
         x, y = stack.pop()
         connected_roads.add((x, y))
-        for nx, ny in neighbors4(x, y):
+        for nx, ny in neighbors4(x, y, n):
             if (nx, ny) in seen: continue
             if grid[ny][nx].occupied and grid[ny][nx].btype == "road":
                 seen.add((nx, ny)); stack.append((nx, ny))
 
     # qualquer tile do grupo encostando numa rua conectada → grupo conectado
     road_set = connected_roads
-    for y in range(GRID_SIZE):
-        for x in range(GRID_SIZE):
+    for y in range(n):
+        for x in range(n):
             c = grid[y][x]
             if not (c.occupied and c.btype != "road"): continue
             gid = c.group_id
             if not gid: continue
-            for nx, ny in neighbors4(x, y):
+            for nx, ny in neighbors4(x, y, n):
                 if (nx, ny) in road_set:
                     connected_gids.add(gid)
                     break
 
     return connected_roads, connected_gids
+
+# ---- Construção em lote (transação com um único recálculo no commit)
+def line_cells(x0, y0, x1, y1) -> List[Tuple[int,int]]:
+    # linha 4-conexa (ruas contínuas) de (x0,y0) até (x1,y1)
+    cells = [(x0, y0)]
+    dx, dy = abs(x1 - x0), abs(y1 - y0)
+    sx, sy = (1 if x1 > x0 else -1), (1 if y1 > y0 else -1)
+    err = dx - dy
+    x, y = x0, y0
+    while (x, y) != (x1, y1):
+        if 2*err > -dy and x != x1:
+            err -= dy; x += sx
+        else:
+            err += dx; y += sy
+        cells.append((x, y))
+    return cells
+
+def rect_cells(x0, y0, x1, y1) -> List[Tuple[int,int]]:
+    xa, xb = sorted((x0, x1)); ya, yb = sorted((y0, y1))
+    return [(x, y) for y in range(ya, yb+1) for x in range(xa, xb+1)]
+
+class BuildBatch:
+    """
+    Constrói vários prédios numa transação. As células entram no grid na hora
+    (preview/arrasto) e o custo é reservado (debitado) a cada place — gasto
+    feito com a transação aberta não leva o dinheiro abaixo de zero; rollback
+    devolve. Consumo pontual de ruas e o recálculo de conectividade + estado
+    derivado (on_commit) acontecem uma vez só, no commit (o rollback refaz o
+    recálculo, já que as células passaram pelo grid).
+
+        with BuildBatch(grid, state, on_commit=refresh) as b:
+            b.line(0, 5, 40, 5, "Rua")
+    """
+    def __init__(self, grid, state: CityState, on_commit: Optional[Callable] = None):
+        self.grid = grid
+        self.state = state
+        self.on_commit = on_commit
+        self.placed: List[Tuple[str, str]] = []   # (gid, nome)
+        self.cost = 0   # já debitado de state.money
+        self.power_once = 0.0
+        self.water_once = 0.0
+        self.open = True
+
+    def place(self, x, y, name: str) -> Tuple[bool, Optional[str]]:
+        n = grid_size(self.grid)
+        if not (0 <= x < n and 0 <= y < n): return False, "Fora do mapa."
+        for req in CATALOG[name].get("requires", []):
+            if not has_building(self.grid, req): return False, f"Requer {req}."
+        cost = -BUILD_EFFECTS.get(name, {}).get("money", 0)
+        if self.state.money < cost: return False, "Dinheiro insuficiente."
+        ok, res = place_build(self.grid, x, y, name)
+        if not ok: return ok, res
+        self.state.money -= cost
+        self.cost += cost
+        self.placed.append((res, name))
+        if name == "Rua":
+            self.power_once += ROAD_ONEOFF_POWER
+            self.water_once += ROAD_ONEOFF_WATER
+        return ok, res
+
+    def path(self, cells, name: str) -> int:
+        # constrói o que der ao longo do caminho; para ao faltar dinheiro
+        built = 0
+        for (x, y) in cells:
+            ok, res = self.place(x, y, name)
+            if ok: built += 1
+            elif res == "Dinheiro insuficiente.": break
+        return built
+
+    def line(self, x0, y0, x1, y1, name: str) -> int:
+        return self.path(line_cells(x0, y0, x1, y1), name)
+
+    def rect(self, x0, y0, x1, y1, name: str) -> int:
+        w, h = CATALOG[name]["w"], CATALOG[name]["h"]
+        xa, ya = min(x0, x1), min(y0, y1)
+        return self.path([(x, y) for (x, y) in rect_cells(x0, y0, x1, y1)
+                          if (x - xa) % w == 0 and (y - ya) % h == 0], name)
+
+    def commit(self) -> List[Tuple[str, str]]:
+        if not self.open: return self.placed
+        self.open = False
+        if not self.placed: return self.placed
+        self.state.power_use_once += self.power_once
+        self.state.water_use_once += self.water_once
+        connected_roads, connected_gids = recompute_connectivity(self.grid)
+        if self.on_commit: self.on_commit(connected_roads, connected_gids)
+        return self.placed
+
+    def rollback(self):
+        if not self.open: return
+        self.open = False
+        if not self.placed: return
+        for gid, _ in reversed(self.placed): demolish_gid(self.grid, gid)
+        self.state.money += self.cost
+        self.cost = 0
+        self.placed = []
+        # as edições intermediárias já passaram pelo grid: mesmo recálculo do commit
+        connected_roads, connected_gids = recompute_connectivity(self.grid)
+        if self.on_commit: self.on_commit(connected_roads, connected_gids)
+
+    def __enter__(self): return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None: self.commit()
+        else: self.rollback()
+        return False
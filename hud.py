@@ -0,0 +1,236 @@
+# hud.py — HUD retido: cada peça guarda sua Surface e só é redesenhada quando o que mostra muda
+import pygame as pg
+from settings import WIDTH, HEIGHT
+from config_game import CATALOG, SUBMENU_ITEMS
+from ui_draw import (
+    draw_text, draw_panel, draw_icon_or_fallback, draw_category_menu, draw_submenu,
+    topbar_rect, category_menu_rect, submenu_rect
+)
+
+BAR_FILL, BAR_BORDER = (250, 253, 255), (210, 230, 245)
+# cor-chave dos cantos arredondados (menus sobre o mapa): blit com colorkey RLE
+# custa uma fração do blit com alfa por pixel
+KEY = (255, 0, 255)
+
+_scratch = None
+def _canvas() -> pg.Surface:
+    # tela de rascunho p/ as funções de desenho que usam coordenadas de tela
+    global _scratch
+    if _scratch is None: _scratch = pg.Surface((WIDTH, HEIGHT))
+    return _scratch
+
+def _render_region(area: pg.Rect, draw_fn):
+    # roda draw_fn(surface) no rascunho e copia só `area`; o que não foi pintado fica transparente
+    canvas = _canvas()
+    canvas.fill(KEY, area)
+    out = draw_fn(canvas)
+    surf = canvas.subsurface(area).copy()
+    surf.set_colorkey(KEY, pg.RLEACCEL)
+    return surf, out
+
+class TopBar:
+    """
+    Barra do topo montada com peças em cache. Cada peça tem retângulo fixo
+    (sem sobreposição) e uma chave com os valores exibidos, já arredondados
+    como na tela; só as peças cuja chave mudou são repintadas na Surface da
+    barra. Frame ocioso = montar as chaves + um blit. `dirty` traz os
+    retângulos repintados no último draw.
+    """
+    def __init__(self, ui_icons, bg, PADDING=12, TOPBAR_H=100):
+        self.ui = ui_icons
+        # a faixa começa em (0,0) (coordenadas locais = de tela) e fica sobre o fundo
+        # liso da tela: Surface opaca, repintada por peça sem re-codificar colorkey
+        self.band = topbar_rect(PADDING, TOPBAR_H)
+        self.surface = pg.Surface(self.band.size)
+        self.surface.fill(bg)
+        bar = draw_panel(self.surface, PADDING, PADDING, WIDTH - 2*PADDING, TOPBAR_H,
+                         fill=BAR_FILL, border=BAR_BORDER, radius=14)
+        x = bar.left + 16; y = bar.top + 12; y2 = bar.top + 60
+        rx = bar.right - 360
+        self.withdraw_btn = pg.Rect(bar.left + 12, bar.top+58, 120, 30)
+        self.prog = pg.Rect(self.withdraw_btn.right + 8, self.withdraw_btn.y, 140, 30)
+        self.auto_btn = pg.Rect(self.prog.right + 8, self.prog.y, 30, 30)
+        self.pause_btn = pg.Rect(bar.right-44, bar.top+10, 32, 32)
+        self.x, self.y, self.y2, self.clock_x = x, y, y2, bar.centerx - 60
+
+        # área repintada de cada peça: ícone (ou o rótulo de fallback, que sobra
+        # p/ cima) + texto até a próxima peça
+        self.pieces = {
+            "money":        pg.Rect(x, y-10, 140, 40),
+            "withdraw":     self.withdraw_btn.copy(),
+            "treasury_bar": self.prog.copy(),
+            "auto_tax":     self.auto_btn.copy(),
+            "people":       pg.Rect(x+140, y-10, 90, 40),
+            "smile":        pg.Rect(x+230, y-10, 90, 40),
+            "inflation":    pg.Rect(x+320, y-10, 100, 40),
+            "literacy":     pg.Rect(x+420, y-10, rx - (x+420), 40),   # + relógio (mesma linha)
+            "unemployment": pg.Rect(bar.left + 320, y2-10, 210, 40),
+            "crime":        pg.Rect(bar.left + 530, y2-10, 160, 40),
+            "health":       pg.Rect(bar.left + 690, y2-10, 160, 40),
+            "bolt":         pg.Rect(rx, y-10, 90, 40),
+            "water":        pg.Rect(rx+90, y-10, 90, 40),
+            "pause":        self.pause_btn.copy(),
+        }
+        # áreas de hover/clique (tooltips)
+        self.rect_map = {
+            "money": pg.Rect(x, y-2, 110, 28),
+            "withdraw": self.withdraw_btn.copy(),
+            "treasury_bar": self.prog.copy(),
+            "auto_tax": self.auto_btn.copy(),
+            "people": pg.Rect(x+140, y-2, 80, 26),
+            "smile": pg.Rect(x+230, y-2, 90, 26),
+            "inflation": pg.Rect(x+320, y-2, 90, 26),
+            "literacy": pg.Rect(x+420, y-2, 130, 26),
+            "unemployment": pg.Rect(bar.left + 320, y2-2, 210, 24),
+            "crime": pg.Rect(bar.left + 530, y2-2, 160, 24),
+            "health": pg.Rect(bar.left + 690, y2-2, 160, 24),
+            "bolt": pg.Rect(rx, y-2, 90, 26),
+            "water": pg.Rect(rx+90, y-2, 90, 26),
+            "pause": self.pause_btn.copy(),
+        }
+        self.keys = {}
+        self.dirty = []
+
+    def _values(self, view):
+        s = view.state
+        ratio = max(0.0, min(1.0, s.treasury_pending/max(1.0, s.treasury_cap)))
+        return {
+            "money": (int(s.money),),
+            "withdraw": (bool(view.withdraw_status[0]),),
+            "treasury_bar": (int(self.prog.w*ratio),),
+            "auto_tax": (view.auto_tax,),
+            "people": (s.population,),
+            "smile": (int(s.happiness),),
+            "inflation": (int(s.inflation),),
+            "literacy": (int(s.literacy), view.day, view.month, view.year, view.hour, view.minute),
+            "unemployment": (int(round(s.unemployment)),),
+            "crime": (int(round(s.crime)),),
+            "health": (int(round(s.health)),),
+            "bolt": (int(s.power_pct),),
+            "water": (int(s.water_pct),),
+            "pause": (view.paused,),
+        }
+
+    def draw(self, screen, view):
+        self.dirty = []
+        for name, key in self._values(view).items():
+            if self.keys.get(name) == key: continue
+            self.keys[name] = key
+            area = self.pieces[name]
+            self.surface.fill(BAR_FILL, area)
+            getattr(self, "_paint_" + name)(self.surface, *key)
+            self.dirty.append(area)
+        screen.blit(self.surface, self.band.topleft)
+        return self.pause_btn, self.withdraw_btn, self.rect_map
+
+    # ---- peças (desenham em coordenadas de tela; a barra começa em (0,0))
+    def _stat(self, surf, x, icon, label, text, size, color):
+        ico = pg.Rect(x, self.y, 20, 20); draw_icon_or_fallback(surf, self.ui, icon, ico, label)
+        draw_text(surf, text, x+28, self.y-2, size=size, color=color)
+
+    def _row2(self, surf, x, icon, label, text, color):
+        ico = pg.Rect(x, self.y2, 18, 18); draw_icon_or_fallback(surf, self.ui, icon, ico, label)
+        draw_text(surf, text, ico.right+6, self.y2-2, size=18, color=color)
+
+    def _paint_money(self, surf, money):
+        self._stat(surf, self.x, "money", "$", f"${money}", 22, (255,205,0))
+
+    def _paint_withdraw(self, surf, ok):
+        btn = self.withdraw_btn
+        pg.draw.rect(surf, (0,170,120) if ok else (150,160,170), btn, border_radius=8)
+        draw_text(surf, "Sacar", btn.centerx, btn.centery, size=18, color=(255,255,255), center=True)
+
+    def _paint_treasury_bar(self, surf, fill_w):
+        prog = self.prog
+        pg.draw.rect(surf, (230,236,244), prog, border_radius=8)
+        pg.draw.rect(surf, (90,180,140), pg.Rect(prog.x, prog.y, fill_w, prog.h), border_radius=8)
+
+    def _paint_auto_tax(self, surf, on):
+        btn = self.auto_btn
+        pg.draw.rect(surf, (60,180,220) if on else (200,210,220), btn, border_radius=6)
+        draw_text(surf, "A", btn.centerx, btn.centery, size=20, color=(255,255,255), center=True)
+
+    def _paint_people(self, surf, pop):
+        self._stat(surf, self.x+140, "people", "P", f"{pop}", 22, (140,190,255))
+
+    def _paint_smile(self, surf, happy):
+        self._stat(surf, self.x+230, "smile", ":)", f"{happy}%", 22, (80,200,120))
+
+    def _paint_inflation(self, surf, infl):
+        self._stat(surf, self.x+320, "percent", "%", f"{infl}%", 22, (120,140,180))
+
+    def _paint_literacy(self, surf, lit, day, month, year, hour, minute):
+        self._stat(surf, self.x+420, "services", "A", f"{lit}% ALF", 22, (90,150,230))
+        draw_text(surf, f"{day:02d}/{month:02d}/{year:02d}  {hour:02d}:{minute:02d}", self.clock_x, self.y-2, size=20, color=(60,90,120))
+
+    def _paint_unemployment(self, surf, pct):
+        self._row2(surf, self.pieces["unemployment"].x, "lock", "U", f"Desemprego: {pct}%", (180,110,120))
+
+    def _paint_crime(self, surf, pct):
+        self._row2(surf, self.pieces["crime"].x, "crime", "C", f"Crime: {pct}%", (200,100,120))
+
+    def _paint_health(self, surf, pct):
+        self._row2(surf, self.pieces["health"].x, "health", "+", f"Saúde: {pct}%", (120,180,140))
+
+    def _paint_bolt(self, surf, pct):
+        self._stat(surf, self.pieces["bolt"].x, "bolt", "⚡", f"{pct}%", 20, (255,190,0))
+
+    def _paint_water(self, surf, pct):
+        self._stat(surf, self.pieces["water"].x, "water", "W", f"{pct}%", 20, (120,200,255))
+
+    def _paint_pause(self, surf, paused):
+        btn = self.pause_btn
+        pg.draw.rect(surf, (0, 170, 120) if not paused else (0, 130, 180), btn, border_radius=8)
+        if paused:
+            pg.draw.polygon(surf, (255,255,255), [(btn.left+10, btn.top+6), (btn.left+10, btn.bottom-6), (btn.right-8, btn.centery)])
+        else:
+            pg.draw.rect(surf, (255,255,255), pg.Rect(btn.left+8, btn.top+6, 6, btn.h-12), border_radius=2)
+            pg.draw.rect(surf, (255,255,255), pg.Rect(btn.right-14, btn.top+6, 6, btn.h-12), border_radius=2)
+
+class CategoryMenu:
+    """Rodapé de categorias em cache; só é refeito quando a categoria ativa muda."""
+    def __init__(self, ui_icons):
+        self.ui = ui_icons
+        self.band = category_menu_rect()
+        self.key = object()
+        self.surface = None
+        self.rects = []
+        self.dirty = []
+
+    def draw(self, screen, active_cat):
+        self.dirty = []
+        if active_cat != self.key:
+            self.key = active_cat
+            self.surface, self.rects = _render_region(self.band, lambda s: draw_category_menu(s, self.ui, active_cat))
+            self.dirty.append(self.band)
+        screen.blit(self.surface, self.band.topleft)
+        return self.rects
+
+class Submenu:
+    """
+    Painel de itens da categoria em cache, chaveado pela categoria e pelos
+    itens travados (requisitos). Ao fechar, o retângulo antigo vai em `dirty`.
+    """
+    def __init__(self, ui_icons):
+        self.ui = ui_icons
+        self.key = None
+        self.area = None
+        self.surface = None
+        self.out = ([], {})
+        self.dirty = []
+
+    def draw(self, screen, cat_key, has_building):
+        self.dirty = []
+        items = SUBMENU_ITEMS.get(cat_key, []) if cat_key else []
+        key = (cat_key, tuple(all(has_building(r) for r in CATALOG[n].get("requires", [])) for n in items)) if items else None
+        if key != self.key:
+            if self.area is not None: self.dirty.append(self.area)
+            self.key = key
+            self.area = self.surface = None
+            self.out = ([], {})
+            if key is not None:
+                self.area = submenu_rect(len(items))
+                self.surface, self.out = _render_region(self.area, lambda s: draw_submenu(s, self.ui, CATALOG, cat_key, has_building))
+                self.dirty.append(self.area)
+        if self.surface is not None: screen.blit(self.surface, self.area.topleft)
+        return self.out
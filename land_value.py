@@ -0,0 +1,103 @@
+# land_value.py — valor da terra por célula e autômato de favelas
+from typing import List, Tuple
+import numpy as np
+
+from config_game import (
+    LAND_VALUE, BLIGHT_SPAWN_BELOW, BLIGHT_RECEDE_ABOVE, BLIGHT_SEED_PROB, BLIGHT_GROW_PROB,
+    BLIGHT_RECEDE_PROB, BLIGHT_MAX_PER_DAY
+)
+from grid_array import TILE_CODES
+from grid_chunked import CHUNK, ChunkField, near_keys
+from grid_system import grid_size, TileMap
+from coverage import spread_to_neighbors
+
+Pos = Tuple[int, int]
+ROAD, BLIGHT = TILE_CODES["road"], TILE_CODES["blight"]
+
+def neighbors8_count(mask: np.ndarray) -> np.ndarray:
+    # quantas das 8 vizinhas estão em `mask` (fora do array = não); campo ou pilha de chunks
+    m = mask.astype(np.int8)
+    out = np.zeros(m.shape, dtype=np.int8)
+    out[..., 1:, :] += m[..., :-1, :]; out[..., :-1, :] += m[..., 1:, :]
+    out[..., 1:] += m[..., :-1]; out[..., :-1] += m[..., 1:]
+    out[..., 1:, 1:] += m[..., :-1, :-1]; out[..., :-1, :-1] += m[..., 1:, 1:]
+    out[..., 1:, :-1] += m[..., :-1, 1:]; out[..., :-1, 1:] += m[..., 1:, :-1]
+    return out
+
+class LandValue:
+    """
+    value[y, x] (0..100): acesso à rua, cobertura de serviços (ServiceCoverage),
+    poluição local (PollutionField), desemprego, crime e favelas vizinhas.
+    A conta roda só nos chunks com tiles, cobertura ou poluição (e vizinhos);
+    no resto do mapa o valor é o da base (fill do ChunkField).
+    step_day() roda o autômato: célula vazia na beira da rua com terra barata
+    pode virar favela (mais fácil ao lado de outra); favela em terra
+    valorizada some. Devolve as células — quem chama constrói/demole pelos
+    caminhos normais do grid.
+    """
+    def __init__(self, grid, coverage, pollution, rng: np.random.Generator):
+        self.grid = grid
+        self.n = n = grid_size(grid)
+        self.coverage, self.pollution, self.rng = coverage, pollution, rng
+        self.tiles = TileMap(grid)
+        self.value = ChunkField(n, np.float32)
+        self._stack = ()   # pilhas da última conta: (chunks, códigos, acesso, valor, favelas vizinhas)
+
+    def compute(self, state) -> ChunkField:
+        self.tiles.sync()
+        w, n = LAND_VALUE, self.n
+        fields = {kind: self.coverage.field(kind) for kind in ("police", "hospital", "park")}
+        P = self.pollution.P
+        used = set(near_keys(self.tiles.codes.blocks, n)).union(P.blocks, *(f.blocks for f in fields.values()))
+        keys = sorted(used, key=lambda k: (k[1], k[0]))
+        codes = self.tiles.codes.padded(keys, 1)
+        access = spread_to_neighbors((codes == ROAD).astype(np.float32))[:, 1:-1, 1:-1]
+        base = np.float32(w["base"] - w["unemployment"]*state.unemployment - w["crime"]*state.crime)
+        v = base + w["road"]*access
+        for kind, field in fields.items():
+            v += np.float32(w[kind]) * field.gather(keys)
+        v -= np.float32(w["pollution"]) * P.gather(keys)
+        nb8 = neighbors8_count(codes == BLIGHT)[:, 1:-1, 1:-1]
+        v -= np.float32(w["blight"]) * nb8
+        np.clip(v, 0.0, 100.0, out=v)
+        value = ChunkField(n, np.float32, np.clip(base, 0.0, 100.0))
+        value.clip(keys, v, value.fill)
+        for key, block in zip(keys, v): value.store(key, block.copy())
+        self.value = value
+        self._stack = (keys, codes[:, 1:-1, 1:-1], access, v, nb8)
+        return value
+
+    def _cells(self, keys, mask: np.ndarray, *stacks) -> List[np.ndarray]:
+        # índices lineares (y·n + x) das células de `mask` (pilha por chunk), em
+        # ordem de linha como no mapa inteiro, e os valores de `stacks` nelas
+        n = self.n
+        i, ly, lx = np.nonzero(mask)
+        origin = np.array(keys, dtype=np.int64).reshape(-1, 2) * CHUNK
+        xs, ys = origin[i, 0] + lx, origin[i, 1] + ly
+        inside = np.flatnonzero((xs < n) & (ys < n))
+        lin = ys[inside] * n + xs[inside]
+        order = inside[np.argsort(lin)]
+        return [np.sort(lin)] + [st[i[order], ly[order], lx[order]] for st in stacks]
+
+    def step_day(self, state) -> Tuple[List[Pos], List[Pos]]:
+        """(células que viram favela, favelas que somem)."""
+        self.compute(state)
+        keys, codes, access, v, nb8 = self._stack
+        rng = self.rng
+        grow: List[Pos] = []
+        if state.population > 0:
+            cand, nb = self._cells(keys, (codes == 0) & (access > 0) & (v < BLIGHT_SPAWN_BELOW), nb8)
+            if len(cand):
+                p = np.where(nb > 0, BLIGHT_GROW_PROB * nb, BLIGHT_SEED_PROB)
+                hit = cand[rng.random(len(cand)) < p]
+                if len(hit) > BLIGHT_MAX_PER_DAY: hit = np.sort(rng.choice(hit, BLIGHT_MAX_PER_DAY, replace=False))
+                grow = [(int(i % self.n), int(i // self.n)) for i in hit]
+        recede: List[Pos] = []
+        old, = self._cells(keys, (codes == BLIGHT) & (v > BLIGHT_RECEDE_ABOVE))
+        if len(old):
+            gone = old[rng.random(len(old)) < BLIGHT_RECEDE_PROB]
+            recede = [(int(i % self.n), int(i // self.n)) for i in gone]
+        return grow, recede
+
+    def at(self, x: int, y: int) -> float:
+        return float(self.value[y, x])
@@ -0,0 +1,138 @@
+# matching.py — oferta ↔ demanda pela distância na malha viária (emprego, água, energia)
+from collections import deque
+from typing import Dict, List, Mapping, Optional, Set, Tuple
+
+from config_game import COMMUTE_MAX
+from grid_system import grid_size, neighbors4, recompute_connectivity, buildings_of, tiles_version
+
+Pos = Tuple[int, int]
+JOB_TILES = ("commercial", "industrial", "farm")
+
+class RoadMatcher:
+    """
+    Distâncias (passos de rua conectada, até max_dist) de cada prédio de
+    demanda (sink_tiles) a cada prédio de oferta (source_tiles), em cache por
+    par. Prédio novo ou demolido só dispara um BFS a partir dele, limitado à
+    região ao seu alcance; mudança em ruas/prefeituras refaz tudo. assign()
+    atende cada demanda pela oferta mais perto que ainda tem capacidade
+    (guloso: pares em ordem de distância, desempate por gid).
+    """
+    def __init__(self, grid, sink_tiles: Tuple[str, ...], source_tiles: Tuple[str, ...], max_dist: int):
+        self.grid = grid
+        self.n = grid_size(grid)
+        self.sink_tiles, self.source_tiles, self.max_dist = sink_tiles, source_tiles, max_dist
+        self.sinks: Dict[int, List[Pos]] = {}        # gid -> ruas de entrada
+        self.sources: Dict[int, List[Pos]] = {}
+        self.dist: Dict[int, Dict[int, int]] = {}    # demanda -> {oferta: distância}
+        self.version = 0                             # muda quando a tabela muda
+        self._roads_key = None
+        self._key = None
+        self._pairs: List[Tuple[int, int, int]] = []
+        self._pairs_version = None
+
+    def _entries(self, tiles, roads: Set[Pos], gids: Set[str]) -> Dict[int, List[Pos]]:
+        out = {}
+        for tile in tiles:
+            for gid, cells in buildings_of(self.grid, tile):
+                if gid not in gids: continue
+                entry = {nb for (x, y) in cells for nb in neighbors4(x, y, self.n) if nb in roads}
+                if entry: out[int(gid)] = sorted(entry)
+        return out
+
+    def _reach(self, sources: List[Pos], roads: Set[Pos]) -> Dict[Pos, int]:
+        # BFS multi-fonte nas ruas, cortado em max_dist
+        dist = {p: 0 for p in sources}
+        queue = deque(sources)
+        while queue:
+            x, y = queue.popleft()
+            d = dist[(x, y)] + 1
+            if d > self.max_dist: continue
+            for nb in neighbors4(x, y, self.n):
+                if nb in roads and nb not in dist:
+                    dist[nb] = d; queue.append(nb)
+        return dist
+
+    def _nearest(self, reach: Dict[Pos, int], entry: List[Pos]) -> Optional[int]:
+        ds = [reach[p] for p in entry if p in reach]
+        return min(ds) if ds else None
+
+    def _add_source(self, src: int, roads: Set[Pos]):
+        reach = self._reach(self.sources[src], roads)
+        for sink, entry in self.sinks.items():
+            d = self._nearest(reach, entry)
+            if d is not None: self.dist[sink][src] = d
+
+    def _add_sink(self, sink: int, roads: Set[Pos]):
+        reach = self._reach(self.sinks[sink], roads)
+        row = self.dist[sink] = {}
+        for src, entry in self.sources.items():
+            d = self._nearest(reach, entry)
+            if d is not None: row[src] = d
+
+    def sync(self):
+        """Atualiza a tabela de distâncias com o grid atual (só o que mudou)."""
+        key = tiles_version(self.grid, ("road", "city_hall") + self.sink_tiles + self.source_tiles)
+        if key is not None and key == self._key: return
+        self._key = key
+        roads, gids = recompute_connectivity(self.grid)
+        sinks = self._entries(self.sink_tiles, roads, gids)
+        sources = self._entries(self.source_tiles, roads, gids)
+        self.version += 1
+
+        roads_key = key[:2] if key is not None else None
+        if roads_key is None or roads_key != self._roads_key:
+            # malha mudou: todas as distâncias podem mudar (BFS a partir de cada oferta)
+            self._roads_key = roads_key
+            self.sinks, self.sources = sinks, sources
+            self.dist = {s: {} for s in sinks}
+            for src in sources: self._add_source(src, roads)
+            return
+
+        for sink in [s for s in self.sinks if sinks.get(s) != self.sinks[s]]:
+            del self.sinks[sink]; del self.dist[sink]
+        for src in [s for s in self.sources if sources.get(s) != self.sources[s]]:
+            del self.sources[src]
+            for row in self.dist.values(): row.pop(src, None)
+        for src, entry in sources.items():
+            if src not in self.sources:
+                self.sources[src] = entry; self._add_source(src, roads)
+        for sink, entry in sinks.items():
+            if sink not in self.sinks:
+                self.sinks[sink] = entry; self._add_sink(sink, roads)
+
+    def pairs(self) -> List[Tuple[int, int, int]]:
+        # (distância, demanda, oferta) em ordem; refeito só quando a tabela muda
+        if self._pairs_version != self.version:
+            self._pairs = sorted((d, k, s) for k, row in self.dist.items() for s, d in row.items())
+            self._pairs_version = self.version
+        return self._pairs
+
+    def assign(self, demand: Mapping[int, float], capacity: Mapping[int, float]) -> List[Tuple[int, int, float]]:
+        """
+        demand: quanto cada prédio de demanda pede; capacity: quanto cada oferta tem.
+        Devolve os fluxos (demanda, oferta, quanto), do mais perto ao mais longe.
+        """
+        self.sync()
+        left = {k: v for k, v in demand.items() if v > 0}
+        room = {s: c for s, c in capacity.items() if c > 0}
+        flows = []
+        for _, sink, src in self.pairs():
+            k = left.get(sink, 0)
+            if not k: continue
+            c = room.get(src, 0)
+            if not c: continue
+            m = min(k, c)
+            flows.append((sink, src, m))
+            if k == m: del left[sink]
+            else: left[sink] = k - m
+            if c == m:
+                del room[src]
+                if not room: break
+            else: room[src] = c - m
+            if not left: break
+        return flows
+
+class JobMatcher(RoadMatcher):
+    """Casas → empregos (comércio, indústria, fazenda) até COMMUTE_MAX passos de rua."""
+    def __init__(self, grid):
+        super().__init__(grid, ("residential",), JOB_TILES, COMMUTE_MAX)
@@ -1,7 +1,22 @@
 # models.py
-from dataclasses import dataclass
+import json, random
+from dataclasses import dataclass, field
 from typing import Optional
 
+
+class RngStreams:
+    """
+    Um random.Random por subsistema, todos derivados da semente da cidade:
+    sortear um evento não desloca o ruído da inflação, e a mesma semente
+    reproduz a mesma partida.
+    """
+    NAMES = ("population", "crime", "inflation", "events", "citizens", "blight")
+
+    def __init__(self, seed: Optional[int] = None):
+        self.seed = seed if seed is not None else random.randrange(2**32)
+        for name in self.NAMES:
+            setattr(self, name, random.Random(f"{self.seed}:{name}"))
+
 @dataclass
 class CityState:
     money: int = 15000
@@ -27,6 +42,9 @@ class CityState:
     water_use_once: float = 0.0
     power_pct: float = 100.0
     water_pct: float = 100.0
+    # % atendido por prédio, ponderado por quem mora/trabalha nele (felicidade, saúde, receita)
+    power_served: float = 100.0
+    water_served: float = 100.0
 
     # cofre
     treasury_pending: float = 0.0
@@ -35,6 +53,49 @@ class CityState:
     # acumula aqui a penalidade de poluição p/ fórmula de felicidade
     polution_penalty: float = 0.0
 
+    # aleatoriedade da cidade (fora da comparação: estados iguais = mesmos números)
+    rng: RngStreams = field(default_factory=RngStreams, compare=False, repr=False)
+
+
+@dataclass
+class GidAllocator:
+    # ids monotônicos ("1", "2", ...): nunca reaproveitados, servem de chave densa
+    next_id: int = 1
+
+    def allocate(self) -> str:
+        gid = self.next_id
+        self.next_id += 1
+        return str(gid)
+
+
+@dataclass
+class InputLog:
+    """
+    Comandos do jogador carimbados com o segundo de jogo em que aconteceram,
+    na ordem: (t, op, args). Com a semente e o tamanho do mapa basta para
+    refazer a partida headless (Simulation.replay).
+    """
+    seed: int
+    map_size: int
+    grid_backend: str = "list"
+    entries: list = field(default_factory=list)
+    end: int = 0   # segundo de jogo em que o log foi salvo
+
+    def record(self, t: int, op: str, *args):
+        self.entries.append((t, op, args))
+
+    def save(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"seed": self.seed, "map_size": self.map_size, "grid_backend": self.grid_backend,
+                       "end": self.end, "entries": self.entries}, f, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path: str) -> "InputLog":
+        with open(path, encoding="utf-8") as f: d = json.load(f)
+        log = cls(d["seed"], d["map_size"], d.get("grid_backend", "list"), end=d.get("end", 0))
+        log.entries = [(t, op, tuple(args)) for t, op, args in d["entries"]]
+        return log
+
 
 @dataclass
 class Cell:
@@ -0,0 +1,121 @@
+# montecarlo.py — muitas cidades com semente, em paralelo, p/ calibrar config_game
+"""
+Roda um roteiro de construção (InputLog salvo de uma partida) sob uma grade de
+overrides de config_game × sementes, em todos os núcleos, e grava uma linha
+JSON por execução assim que ela termina:
+
+    python montecarlo.py roteiro.json --grid grade.json --seeds 16 --days 30 --out runs.jsonl
+
+grade.json: {"BASE_UNIT_VALUE": [1.5, 2.0, 2.5], "JOBS_PER.industrial": [6, 8]}
+(chave com ponto = entrada de um dict do config_game). Os módulos leem o
+config_game ao construir a Simulation; só os códigos de tile (grid_array) são
+fixados no import, então um CATALOG com tile novo é recusado.
+
+Cada linha traz os overrides, a semente, métricas finais e as trajetórias
+(money, happiness, inflation, unemployment, population) em colunas — uma lista
+por métrica, amostrada a cada hora de jogo.
+"""
+import argparse, itertools, json, os, sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Tuple
+
+import config_game
+from grid_array import TILE_CODES
+from models import InputLog
+from simulation import Simulation, LogPlayer
+
+METRICS = ("money", "happiness", "inflation", "unemployment", "population")
+SAMPLE_EVERY = 60   # segundos de jogo = 1 hora no relógio
+
+def _patch(name: str, value, undo: list):
+    # troca o valor em todo módulo que importou o mesmo objeto (from config_game import X)
+    old = getattr(config_game, name)
+    for mod in list(sys.modules.values()):
+        if getattr(mod, name, None) is old:
+            undo.append((mod, name, old))
+            setattr(mod, name, value)
+
+def _check_fixed(name: str, value):
+    # códigos de tile saem do CATALOG no import (grid_array, TileMap, camada do mapa)
+    if name != "CATALOG": return
+    new = {cfg["tile"] for cfg in value.values()} - set(TILE_CODES)
+    if new: raise ValueError(f"override do CATALOG cria tiles sem código: {sorted(new)}")
+
+def apply_overrides(overrides: Dict[str, object]) -> list:
+    """Aplica overrides ("NOME" ou "DICT.chave"); devolve a lista p/ restore_overrides."""
+    undo: list = []
+    try:
+        for key, value in overrides.items():
+            name, _, sub = key.partition(".")
+            if not hasattr(config_game, name): raise KeyError(f"config_game não tem {name}")
+            if sub:
+                d = dict(getattr(config_game, name)); d[sub] = value
+                value = d
+            _check_fixed(name, value)
+            _patch(name, value, undo)
+    except (KeyError, ValueError):
+        restore_overrides(undo)
+        raise
+    return undo
+
+def restore_overrides(undo: list):
+    for mod, name, old in reversed(undo): setattr(mod, name, old)
+
+def expand_grid(grid: Dict[str, list]) -> List[Dict[str, object]]:
+    keys = list(grid)
+    return [dict(zip(keys, combo)) for combo in itertools.product(*(grid[k] for k in keys))]
+
+def run_one(log: InputLog, overrides: Dict[str, object], seed: int, seconds: int) -> dict:
+    undo = apply_overrides(overrides)
+    try:
+        sim = Simulation(log.map_size, log.grid_backend, seed=seed)
+        player = LogPlayer(sim, log)
+        cols: Dict[str, list] = {m: [] for m in METRICS}
+        for t in range(SAMPLE_EVERY, seconds + 1, SAMPLE_EVERY):
+            player.advance_to(t)
+            for m in METRICS: cols[m].append(getattr(sim.state, m))
+        player.advance_to(seconds)
+        s = sim.state
+        final = {"money": s.money, "happiness": s.happiness, "inflation": s.inflation,
+                 "unemployment": s.unemployment, "population": s.population,
+                 "treasury_pending": s.treasury_pending}
+        return {"overrides": overrides, "seed": seed, "seconds": seconds, "final": final,
+                "sample_every": SAMPLE_EVERY, "series": cols}
+    finally:
+        restore_overrides(undo)
+
+def _task(args: Tuple[str, Dict[str, object], int, int]) -> dict:
+    path, overrides, seed, seconds = args
+    return run_one(InputLog.load(path), overrides, seed, seconds)
+
+def run_batch(log_path: str, grid: Dict[str, list], seeds: List[int], seconds: int,
+              workers: int = 0) -> Iterator[dict]:
+    """Gera os resultados na ordem em que terminam (workers=0: todos os núcleos)."""
+    tasks = [(log_path, ov, seed, seconds) for ov in expand_grid(grid) for seed in seeds]
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        for fut in as_completed([pool.submit(_task, t) for t in tasks]):
+            yield fut.result()
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Monte Carlo de balanceamento sobre config_game.")
+    ap.add_argument("log", help="roteiro de construção (InputLog em JSON)")
+    ap.add_argument("--grid", help="JSON {parâmetro: [valores]}; sem ele roda só os valores atuais")
+    ap.add_argument("--seeds", type=int, default=8, help="sementes por combinação (0..N-1)")
+    ap.add_argument("--days", type=float, default=30, help="duração em dias de jogo")
+    ap.add_argument("--workers", type=int, default=0)
+    ap.add_argument("--out", default="runs.jsonl")
+    a = ap.parse_args(argv)
+
+    grid = {}
+    if a.grid:
+        with open(a.grid, encoding="utf-8") as f: grid = json.load(f)
+    seconds = int(a.days * 24 * 60)
+    done = 0
+    with open(a.out, "w", encoding="utf-8") as out:
+        for row in run_batch(a.log, grid, list(range(a.seeds)), seconds, a.workers):
+            out.write(json.dumps(row, separators=(",", ":")) + "\n"); out.flush()
+            done += 1
+            print(f"{done}: {row['overrides']} seed={row['seed']} money={row['final']['money']}")
+
+if __name__ == "__main__":
+    main()
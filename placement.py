@@ -0,0 +1,105 @@
+# placement.py — validade de construção por soma de prefixos 2D (summed-area table)
+from typing import Dict, List, Optional, Set, Tuple
+import numpy as np
+
+from config_game import CATALOG
+from grid_chunked import ChunkField, Key, near_keys
+from grid_system import grid_size, grid_version, recompute_connectivity, TileMap
+
+def footprints() -> List[Tuple[int,int]]:
+    # lido na hora (não no import): overrides do CATALOG pelo montecarlo valem
+    return sorted({(cfg["w"], cfg["h"]) for cfg in CATALOG.values()})
+
+def summed_area(mask: np.ndarray) -> np.ndarray:
+    # S[..., y, x] = soma de mask[..., :y, :x] (campo ou pilha de chunks)
+    m = mask.astype(np.int32)
+    s = np.zeros(m.shape[:-2] + (m.shape[-2] + 1, m.shape[-1] + 1), dtype=np.int32)
+    np.cumsum(np.cumsum(m, axis=-2), axis=-1, out=s[..., 1:, 1:])
+    return s
+
+def box_sums(s: np.ndarray, w: int, h: int) -> np.ndarray:
+    # soma de cada janela h×w; resultado [..., y, x] indexado pela âncora (canto sup. esq.)
+    return s[..., h:, w:] - s[..., :-h, w:] - s[..., h:, :-w] + s[..., :-h, :-w]
+
+def rank_suggestions(contacts: ChunkField, limit: int = 12) -> List[Tuple[int,int]]:
+    # âncoras com contato de rua, mais contatos primeiro (empate: linha, coluna)
+    xs, ys, vs = contacts.nonzero()
+    if len(xs) == 0: return []
+    order = np.lexsort((xs, ys, -vs.astype(np.int32)))[:limit]
+    return list(zip(xs[order].tolist(), ys[order].tolist()))
+
+class PlacementMap:
+    """
+    Mapa de validade para todas as âncoras e todos os footprints do CATALOG,
+    em ChunkField: valid vale True e contatos 0 fora dos blocos guardados.
+    refresh() recalcula (vetorizado, pilha de chunks) só os chunks perto dos
+    que mudaram — tiles ou ruas conectadas; os da borda do mapa (footprint
+    saindo do mapa = inválido) entram no primeiro cálculo. `suggest` ranqueia
+    âncoras válidas pelo nº de contatos do perímetro com ruas conectadas.
+    """
+    def __init__(self, grid):
+        self.grid = grid
+        self.n = n = grid_size(grid)
+        self.footprints = footprints()
+        self.tiles = TileMap(grid)
+        self.roads = ChunkField(n, bool)   # ruas conectadas
+        self._roads: Set[Tuple[int,int]] = set()
+        self._version: Optional[int] = -1
+        self.valid: Dict[Tuple[int,int], ChunkField] = {fp: ChunkField(n, bool, True) for fp in self.footprints}
+        self.road_contacts: Dict[Tuple[int,int], ChunkField] = {fp: ChunkField(n, np.int16) for fp in self.footprints}
+        # leitura em volta de cada âncora: 1 célula antes, o footprint + anel depois
+        self.pad = max(max(w, h) for w, h in self.footprints) + 1
+        c = self.roads.chunk
+        last = (n - 1) // c
+        self._pending: Set[Key] = {(cx, cy) for cx in range(last + 1) for cy in range(last + 1)
+                                   if max(cx, cy) * c + c > n - self.pad}
+
+    def refresh(self):
+        version = grid_version(self.grid)
+        if version is not None and version == self._version: return
+        self._version = version
+        n, pad = self.n, self.pad
+        self.tiles.sync()
+        changed = self._pending | self.tiles.changed
+        self._pending = set()
+        roads = recompute_connectivity(self.grid)[0]
+        if roads != self._roads:
+            gone, new = self._roads - roads, roads - self._roads
+            if gone: changed |= self.roads.put(*np.array(list(gone), dtype=np.int64).T, False)
+            if new: changed |= self.roads.put(*np.array(list(new), dtype=np.int64).T, True)
+            self.roads.prune(changed)
+            self._roads = set(roads)
+        if not changed: return
+        c = self.roads.chunk
+        keys = near_keys(changed, n, r=-(-pad // c))
+        # fora do mapa conta como ocupado: footprint que sai do mapa não cabe
+        occ = summed_area(self.tiles.codes.padded(keys, pad, outside=1) != 0)
+        rs = summed_area(self.roads.padded(keys, pad))
+        cell = box_sums(rs, 1, 1)
+        inner = lambda s, w, h, d=0: box_sums(s, w, h)[:, pad-d:pad-d+c, pad-d:pad-d+c]
+        for (w, h) in self.footprints:
+            ok = inner(occ, w, h) == 0
+            # anel em volta do footprint: caixa (w+2)×(h+2) − miolo − 4 cantos
+            ring = inner(rs, w+2, h+2, 1) - inner(rs, w, h)
+            for dx, dy in ((0, 0), (w+1, 0), (0, h+1), (w+1, h+1)):
+                ring -= cell[:, pad-1+dy:pad-1+dy+c, pad-1+dx:pad-1+dx+c]
+            contacts = np.where(ok, ring, 0)
+            valid, road_contacts = self.valid[(w, h)], self.road_contacts[(w, h)]
+            for key, v, k in zip(keys, ok, contacts):
+                valid.store(key, v); road_contacts.store(key, k)
+
+    def footprint(self, name: str) -> Tuple[int,int]:
+        return CATALOG[name]["w"], CATALOG[name]["h"]
+
+    def valid_map(self, name: str) -> ChunkField:
+        self.refresh()
+        return self.valid[self.footprint(name)]
+
+    def is_valid(self, x: int, y: int, name: str) -> bool:
+        if not (0 <= x < self.n and 0 <= y < self.n): return False
+        return bool(self.valid_map(name)[y, x])
+
+    def suggest(self, name: str, limit: int = 12) -> List[Tuple[int,int]]:
+        # âncoras válidas encostadas em rua conectada, mais contatos primeiro
+        self.refresh()
+        return rank_suggestions(self.road_contacts[self.footprint(name)], limit)
@@ -0,0 +1,90 @@
+# pollution.py — campo de poluição por célula: emissão + difusão (blur separável)
+from typing import Set
+import numpy as np
+
+from config_game import (
+    POLLUTION_EMIT, POLLUTION_DIFFUSE, POLLUTION_KEEP, POLLUTION_PARK_SINK, POLLUTION_PENALTY_PER_UNIT
+)
+from grid_array import TILE_NAMES, TILE_CODES
+from grid_chunked import ChunkField, Key, near_keys
+from grid_system import grid_size, TileMap
+
+EPS = 1e-4          # variação por hora abaixo disso = campo parado
+
+class PollutionField:
+    """
+    P[y, x] evolui por hora: P ← blur(P)·keep + E, com E a emissão das células
+    (indústria, favela, rua) e keep menor nos parques (sumidouros). O blur é
+    separável (3 taps por eixo, fora do mapa = 0). Os campos são ChunkField
+    (memória ∝ chunks com algo) e a conta só roda nos chunks ativos e vizinhos:
+    uma edição ativa os chunks tocados e o conjunto anda 1 chunk por hora até
+    o campo parar de variar (EPS). Chunk com P abaixo de EPS não é alocado.
+    """
+    def __init__(self, grid):
+        self.grid = grid
+        self.n = n = grid_size(grid)
+        # tabelas por código de tile, montadas aqui p/ valerem os overrides do montecarlo
+        self.emit_lut = np.zeros(len(TILE_NAMES), dtype=np.float32)
+        for tile, v in POLLUTION_EMIT.items(): self.emit_lut[TILE_CODES[tile]] = v
+        self.keep_lut = np.full(len(TILE_NAMES), POLLUTION_KEEP, dtype=np.float32)
+        self.keep_lut[TILE_CODES["park"]] = POLLUTION_KEEP * (1.0 - POLLUTION_PARK_SINK)
+        self.tiles = TileMap(grid, tuple(POLLUTION_EMIT) + ("park", "residential"))
+        self.P = ChunkField(n, np.float32)
+        self.E = ChunkField(n, np.float32)
+        self.keep = ChunkField(n, np.float32, POLLUTION_KEEP)
+        self.homes = ChunkField(n, bool)
+        self.active: Set[Key] = set()
+        self.version = 0   # muda quando P ou as casas mudam
+        self._exposure = (None, 0.0)
+
+    def sync(self):
+        """Relê emissão/sumidouros/casas só nos chunks que mudaram no grid."""
+        if self.tiles.sync() is None: return
+        keys = sorted(self.tiles.changed)
+        codes = self.tiles.codes.gather(keys)
+        for key, emit, keep, homes in zip(keys, self.emit_lut[codes], self.keep_lut[codes],
+                                          codes == TILE_CODES["residential"]):
+            self.E.store(key, emit); self.keep.store(key, keep); self.homes.store(key, homes)
+        self.active |= self.tiles.changed
+        self.version += 1
+
+    # ---- difusão
+    def step(self):
+        """Uma hora de difusão (só nos chunks ativos e vizinhos)."""
+        self.sync()
+        if not self.active: return
+        P = self.P
+        keys = near_keys(self.active, self.n)   # cresce 1 chunk por hora
+        a, mid = np.float32(POLLUTION_DIFFUSE), np.float32(1 - 2*POLLUTION_DIFFUSE)
+        src = P.padded(keys, 1, outside=0)     # halo de leitura de 1 célula
+        # eixo y, depois eixo x, em todos os chunks de uma vez
+        b = src * mid
+        b[:, 1:] += src[:, :-1] * a; b[:, :-1] += src[:, 1:] * a
+        c = b * mid
+        c[:, :, 1:] += b[:, :, :-1] * a; c[:, :, :-1] += b[:, :, 1:] * a
+
+        new = c[:, 1:-1, 1:-1] * self.keep.gather(keys)
+        new += self.E.gather(keys)
+        P.clip(keys, new)
+        old = src[:, 1:-1, 1:-1]
+        moving = (np.abs(new - old) > EPS).any(axis=(1, 2))
+        for i, key in enumerate(keys):
+            if key in P.blocks or new[i].max() > EPS: P.store(key, new[i].copy())
+        self.version += 1
+        self.active = {key for key, m in zip(keys, moving.tolist()) if m}
+
+    # ---- leituras
+    def at(self, x: int, y: int) -> float:
+        return float(self.P[y, x])
+
+    def exposure(self) -> float:
+        """Penalidade média nas células residenciais (o que os moradores respiram)."""
+        if self._exposure[0] == self.version: return self._exposure[1]
+        total, count = 0.0, 0
+        for key, homes in self.homes.blocks.items():
+            count += int(homes.sum())
+            block = self.P.blocks.get(key)
+            if block is not None: total += float(block[homes].sum())
+        value = total / count * POLLUTION_PENALTY_PER_UNIT if count else 0.0
+        self._exposure = (self.version, value)
+        return value
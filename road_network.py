@@ -0,0 +1,140 @@
+# road_network.py — conectividade incremental das ruas com a Prefeitura
+from typing import Dict, Iterable, List, Set, Tuple
+
+Pos = Tuple[int, int]
+
+class RoadNetwork:
+    """
+    Componentes de rua mantidos por união (relabel do menor no maior) a cada
+    rua adicionada; remoção reconstrói só o componente afetado.
+    Um componente está conectado se encosta em alguma célula de Prefeitura
+    (hall_links > 0). Um prédio está conectado se alguma célula dele encosta
+    numa rua conectada (gid_links > 0).
+    """
+    def __init__(self, grid, size: int, registry):
+        self.grid = grid
+        self.size = size
+        self.registry = registry
+        self.comp_of: Dict[Pos, int] = {}
+        self.members: Dict[int, Set[Pos]] = {}
+        self.hall_links: Dict[int, int] = {}
+        self.gid_links: Dict[str, int] = {}
+        self.connected_roads: Set[Pos] = set()
+        self._next_comp = 0
+
+    # ---- helpers
+    def _neighbors(self, x, y):
+        for dx, dy in ((1,0),(-1,0),(0,1),(0,-1)):
+            nx, ny = x+dx, y+dy
+            if 0 <= nx < self.size and 0 <= ny < self.size:
+                yield nx, ny
+
+    def _is(self, x, y, tile: str) -> bool:
+        c = self.grid[y][x]
+        return c.occupied and c.btype == tile
+
+    def _hall_contacts(self, cells: Iterable[Pos]) -> int:
+        return sum(1 for (x, y) in cells for nx, ny in self._neighbors(x, y) if self._is(nx, ny, "city_hall"))
+
+    def _new_comp(self, cells: Set[Pos]) -> int:
+        cid = self._next_comp; self._next_comp += 1
+        self.members[cid] = cells
+        for c in cells: self.comp_of[c] = cid
+        self.hall_links[cid] = self._hall_contacts(cells)
+        if self.hall_links[cid]: self._connect_cells(cells)
+        return cid
+
+    # ---- ligações prédio ↔ rua conectada
+    def _link(self, gid: str, k: int):
+        old = self.gid_links.get(gid, 0)
+        self.gid_links[gid] = old + k
+        if old == 0: self.registry.link(gid)
+
+    def _unlink(self, gid: str, k: int):
+        new = self.gid_links[gid] - k
+        if new > 0:
+            self.gid_links[gid] = new
+        else:
+            del self.gid_links[gid]
+            self.registry.unlink(gid)
+
+    def _building_neighbors(self, x, y):
+        for nx, ny in self._neighbors(x, y):
+            c = self.grid[ny][nx]
+            if c.occupied and c.btype != "road" and c.group_id:
+                yield c.group_id
+
+    def _connect_cells(self, cells: Iterable[Pos]):
+        for (x, y) in cells:
+            self.connected_roads.add((x, y))
+            for gid in self._building_neighbors(x, y): self._link(gid, 1)
+
+    def _disconnect_cells(self, cells: Iterable[Pos]):
+        for (x, y) in cells:
+            self.connected_roads.discard((x, y))
+            for gid in self._building_neighbors(x, y): self._unlink(gid, 1)
+
+    def _shift_hall_links(self, cid: int, d: int):
+        old = self.hall_links[cid]
+        self.hall_links[cid] = old + d
+        if old == 0 and d > 0: self._connect_cells(self.members[cid])
+        elif old + d == 0 and old > 0: self._disconnect_cells(self.members[cid])
+
+    # ---- ruas
+    def _union(self, a: int, b: int):
+        if len(self.members[a]) < len(self.members[b]): a, b = b, a
+        ca, cb = self.hall_links[a] > 0, self.hall_links[b] > 0
+        if ca and not cb: self._connect_cells(self.members[b])
+        elif cb and not ca: self._connect_cells(self.members[a])
+        moved = self.members.pop(b)
+        for c in moved: self.comp_of[c] = a
+        self.members[a] |= moved
+        self.hall_links[a] += self.hall_links.pop(b)
+
+    def _add_road(self, pos: Pos):
+        self._new_comp({pos})
+        for n in self._neighbors(*pos):
+            if n in self.comp_of and self.comp_of[n] != self.comp_of[pos]:
+                self._union(self.comp_of[pos], self.comp_of[n])
+
+    def _remove_road(self, pos: Pos):
+        cid = self.comp_of.pop(pos, None)
+        if cid is None: return
+        cells = self.members.pop(cid)
+        if self.hall_links.pop(cid) > 0: self._disconnect_cells(cells)
+        cells.discard(pos)
+        for c in cells: del self.comp_of[c]
+        # reconstrução local: só as ruas do componente antigo
+        while cells:
+            start = cells.pop()
+            comp = {start}; stack = [start]
+            while stack:
+                x, y = stack.pop()
+                for n in self._neighbors(x, y):
+                    if n in cells:
+                        cells.discard(n); comp.add(n); stack.append(n)
+            self._new_comp(comp)
+
+    # ---- API usada por place_build / demolish_gid (grid já atualizado)
+    def on_place(self, gid: str, tile: str, cells: List[Pos]):
+        if tile == "road":
+            for pos in cells: self._add_road(pos)
+            return
+        links = sum(1 for (x, y) in cells for n in self._neighbors(x, y) if n in self.connected_roads)
+        if links: self._link(gid, links)
+        if tile == "city_hall":
+            for (x, y) in cells:
+                for n in self._neighbors(x, y):
+                    if n in self.comp_of: self._shift_hall_links(self.comp_of[n], +1)
+
+    def on_remove(self, gid: str, tile: str, cells: List[Pos]):
+        if tile == "road":
+            for pos in cells: self._remove_road(pos)
+            return
+        if gid in self.gid_links:
+            del self.gid_links[gid]
+            self.registry.unlink(gid)
+        if tile == "city_hall":
+            for (x, y) in cells:
+                for n in self._neighbors(x, y):
+                    if n in self.comp_of: self._shift_hall_links(self.comp_of[n], -1)
@@ -0,0 +1,55 @@
+# scheduler.py — agenda de tarefas por segundo absoluto de jogo (heapq)
+import heapq
+from typing import Callable, List, Optional
+
+class Job:
+    """Tarefa agendada; period > 0 = recorrente. cancel() tira da agenda."""
+    __slots__ = ("t", "prio", "period", "fn", "name", "cancelled")
+    def __init__(self, t: int, prio: int, period: int, fn: Callable[[], None], name: str):
+        self.t, self.prio, self.period, self.fn, self.name = t, prio, period, fn, name
+        self.cancelled = False
+
+    def cancel(self): self.cancelled = True
+
+    def __lt__(self, other: "Job"):
+        return (self.t, self.prio) < (other.t, other.prio)
+
+class Scheduler:
+    """
+    Heap de jobs por segundo de jogo. No mesmo segundo rodam na ordem em que
+    foram registrados (prio fixa por job, também nas recorrências). Quem avança
+    o tempo pergunta next_time() e pula direto até lá.
+    """
+    def __init__(self):
+        self.heap: List[Job] = []
+        self._prio = 0
+
+    def at(self, t: int, fn: Callable[[], None], name: str = "") -> Job:
+        return self._push(Job(t, self._next_prio(), 0, fn, name))
+
+    def every(self, period: int, fn: Callable[[], None], first: int, name: str = "") -> Job:
+        return self._push(Job(first, self._next_prio(), period, fn, name))
+
+    def _next_prio(self) -> int:
+        self._prio += 1
+        return self._prio
+
+    def _push(self, job: Job) -> Job:
+        heapq.heappush(self.heap, job)
+        return job
+
+    def next_time(self) -> Optional[int]:
+        heap = self.heap
+        while heap and heap[0].cancelled: heapq.heappop(heap)
+        return heap[0].t if heap else None
+
+    def run_due(self, now: int):
+        # roda tudo com t <= now; recorrentes voltam para t + period
+        heap = self.heap
+        while heap and heap[0].t <= now:
+            job = heapq.heappop(heap)
+            if job.cancelled: continue
+            job.fn()
+            if job.period > 0 and not job.cancelled:
+                job.t += job.period
+                heapq.heappush(heap, job)
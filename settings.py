@@ -3,6 +3,7 @@
 # Tela
 WIDTH, HEIGHT = 1024, 720
 FPS = 60
+PAN_SPEED = 12     # células/s ao segurar as setas (câmera do mapa)
 
 # Grid
 GRID_SIZE = 14
@@ -17,4 +18,9 @@ COLORS = {
     "text": (230, 232, 238),
     "hint": (180, 190, 200),
     "preview": (70, 120, 200),
+    "preview_bad": (220, 80, 80),
+    "suggest": (90, 190, 140),
 }
+
+# Cache de textos renderizados (bytes de Surface mantidos em memória)
+TEXT_CACHE_BYTES = 4 * 1024 * 1024
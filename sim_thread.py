@@ -0,0 +1,204 @@
+# sim_thread.py — front-end ↔ simulação: snapshots imutáveis e fila de comandos
+import threading, time
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import Dict, FrozenSet, Optional, Tuple
+
+from config_game import CATALOG
+from models import CityState
+from grid_array import TILE_NAMES
+from grid_system import grid_version, has_building, TileMap
+from grid_chunked import ChunkField
+from placement import rank_suggestions
+from simulation import Simulation
+
+SIM_HZ = 30   # passos fixos por segundo real no modo com thread
+
+@dataclass(frozen=True)
+class SimSnapshot:
+    """
+    Foto da simulação depois de um passo: cópia do CityState, relógio e uma
+    vista só-leitura do grid (códigos de tile por chunk + mapas de validade).
+    O render só lê daqui; nada aponta para estruturas que a simulação ainda
+    altera (os blocos divididos com o TileMap são copiados antes de mudar).
+    """
+    t: int
+    state: CityState
+    day: int; month: int; year: int; hour: int; minute: int
+    paused: bool
+    speed: float
+    auto_tax: bool
+    pending_event: object
+    labor: Tuple[int, ...]
+    withdraw_status: Tuple[bool, Optional[str]]
+    shortages: Tuple[int, int]   # prédios sem energia/água suficiente
+    tiles: ChunkField
+    built: FrozenSet[str]
+    valid: Dict[Tuple[int,int], ChunkField]
+    contacts: Dict[Tuple[int,int], ChunkField]
+
+    @property
+    def size(self) -> int: return self.tiles.shape[0]
+
+    def occupied(self, x: int, y: int) -> bool: return self.tiles[y, x] != 0
+
+    def tile_key(self, x: int, y: int) -> str:
+        return TILE_NAMES[self.tiles[y, x]] or "empty"
+
+    def has_building(self, name: str) -> bool: return name in self.built
+
+    def _footprint(self, name: str): return CATALOG[name]["w"], CATALOG[name]["h"]
+
+    def is_valid(self, x: int, y: int, name: str) -> bool:
+        n = self.size
+        return 0 <= x < n and 0 <= y < n and bool(self.valid[self._footprint(name)][y, x])
+
+    def suggest(self, name: str, limit: int = 12):
+        return rank_suggestions(self.contacts[self._footprint(name)], limit)
+
+class _QueuedBatch:
+    # arrasto de ruas pela fila: place/commit viram comandos
+    def __init__(self, client: "SimClient"):
+        self.client = client
+        client.send("batch_begin")
+
+    def place(self, x: int, y: int, name: str):
+        self.client.send("batch_place", x, y, name)
+        return True, None
+
+    def commit(self):
+        self.client.send("batch_commit")
+
+class SimClient:
+    """
+    Simulação no próprio thread do front-end (modo padrão): comandos aplicados
+    na hora, snapshot publicado uma vez por update (frame), não a cada
+    comando — um arrasto de ruas não refaz a vista por tile. Resultados que viram aviso
+    (falha ao construir, saque) saem em `notices` como (texto, cor).
+    """
+    def __init__(self, sim: Simulation):
+        self.sim = sim
+        self.notices: deque = deque()
+        self._batch = None
+        self._batch_failed = False
+        self._view_key = object()
+        self._view = None
+        self._partial = False   # vista com validade de antes do arrasto aberto
+        self._tiles = TileMap(sim.grid)
+        self._front: Optional[SimSnapshot] = None
+        self.publish()
+
+    # ---- lado do front-end
+    def start(self): pass
+    def stop(self): pass
+
+    def send(self, op: str, *args):
+        self._apply(op, args)
+
+    def update(self, real_dt: float):
+        self.sim.advance(real_dt)
+        self.publish()
+
+    def snapshot(self) -> SimSnapshot:
+        return self._front
+
+    def begin_batch(self) -> _QueuedBatch:
+        return _QueuedBatch(self)
+
+    # ---- lado da simulação
+    def _apply(self, op: str, args: tuple):
+        sim = self.sim
+        if op == "batch_begin":
+            self._batch = sim.begin_batch(); self._batch_failed = False
+        elif op == "batch_place":
+            if self._batch is None or self._batch_failed: return
+            ok, res = self._batch.place(*args)
+            if not ok and res == "Dinheiro insuficiente.":
+                self._batch_failed = True
+                self.notices.append((res, (240, 80, 80)))
+        elif op == "batch_commit":
+            if self._batch is not None: self._batch.commit(); self._batch = None
+        elif op == "build":
+            ok, res = sim.build(*args)
+            if not ok: self.notices.append((res, (240, 80, 80)))
+        elif op == "withdraw":
+            ok, res = sim.withdraw()
+            if ok: self.notices.append((f"Receita coletada: ${res}", (40, 140, 90)))
+            else:  self.notices.append((res, (220, 80, 80)))
+        else:
+            getattr(sim, op)(*args)
+
+    def _grid_view(self):
+        # vista do grid só é refeita quando o grid muda (grid_version); com um
+        # arrasto aberto só os tiles acompanham, validade/sugestões esperam o commit
+        sim = self.sim
+        key = grid_version(sim.grid)
+        if key is None or key != self._view_key or self._view is None or (self._partial and self._batch is None):
+            self._view_key = key
+            self._tiles.sync()
+            tiles = self._tiles.codes.snapshot()
+            self._partial = self._batch is not None and self._view is not None
+            if self._partial:
+                self._view = (tiles,) + self._view[1:]
+                return self._view
+            sim.placement.refresh()
+            built = frozenset(name for name in CATALOG if has_building(sim.grid, name))
+            place = sim.placement
+            self._view = (tiles, built, {fp: f.snapshot() for fp, f in place.valid.items()},
+                          {fp: f.snapshot() for fp, f in place.road_contacts.items()})
+        return self._view
+
+    def publish(self):
+        # monta o buffer de trás e troca a referência (atribuição atômica)
+        sim = self.sim
+        while sim.notices: self.notices.append(sim.notices.pop(0))
+        tiles, built, valid, contacts = self._grid_view()
+        back = SimSnapshot(
+            t=sim.game_seconds_total, state=replace(sim.state),
+            day=sim.day, month=sim.month, year=sim.year, hour=sim.hour, minute=sim.minute,
+            paused=sim.paused, speed=sim.speed, auto_tax=sim.auto_tax,
+            pending_event=sim.pending_event, labor=sim.labor,
+            withdraw_status=sim.can_withdraw(),
+            shortages=(len(sim.utilities.shortages("power")), len(sim.utilities.shortages("water"))),
+            tiles=tiles, built=built, valid=valid, contacts=contacts,
+        )
+        self._front = back
+
+class SimThread(SimClient):
+    """
+    Simulação num thread próprio com passo fixo (SIM_HZ). O front-end só
+    enfileira comandos (deque: append/popleft são atômicos) e lê o último
+    snapshot publicado; um frame lento não atrasa a simulação e vice-versa.
+    """
+    def __init__(self, sim: Simulation, hz: int = SIM_HZ):
+        self.commands: deque = deque()
+        self.hz = hz
+        super().__init__(sim)
+        self._stop = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="simulation", daemon=True)
+
+    def start(self): self.thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self.thread.is_alive(): self.thread.join()
+
+    def send(self, op: str, *args):
+        self.commands.append((op, args))
+
+    def update(self, real_dt: float):
+        pass   # o thread tem o próprio relógio
+
+    def _run(self):
+        dt = 1.0 / self.hz
+        next_t = time.perf_counter()
+        while not self._stop.is_set():
+            while self.commands:
+                op, args = self.commands.popleft()
+                self._apply(op, args)
+            self.sim.advance(dt)
+            self.publish()
+            next_t += dt
+            delay = next_t - time.perf_counter()
+            if delay > 0: time.sleep(delay)
+            elif delay < -0.25: next_t = time.perf_counter()   # atrasou demais: não acumula dívida
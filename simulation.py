@@ -0,0 +1,416 @@
+# simulation.py — simulação headless (sem pygame): grid, estado, relógio e saque
+from typing import Optional, Tuple
+import numpy as np
+
+from settings import GRID_SIZE
+from models import CityState, RngStreams, InputLog
+from config_game import (
+    CATALOG, BUILD_EFFECTS, ROAD_ONEOFF_POWER, ROAD_ONEOFF_WATER,
+    MIN_WITHDRAW_THRESHOLD, WITHDRAW_COOLDOWN_S, AUTOSAVE_EVERY_S, JOBS_PER, HOUSING_PER_CELL
+)
+from grid_system import (
+    make_grid, grid_size, place_build, demolish_at, has_building, buildings_of,
+    count_buildings_by_tile_connected, recompute_connectivity, BuildBatch
+)
+from economy import (
+    recompute_resources, refresh_treasury_cap, update_labor_market,
+    income_tick_per_second, inflation_hourly, socio_env_hourly,
+    upkeep_minutely, decay_oneoff_resources, central_bank_connected,
+    update_happiness_daily, traffic_hourly, fast_forward_seconds
+)
+from citizens import Citizens, SECTORS
+from matching import JobMatcher
+from utilities import UtilityNetwork
+from events import get_random_event
+from scheduler import Scheduler, Job
+from placement import PlacementMap
+from coverage import ServiceCoverage
+from traffic import TrafficModel
+from pollution import PollutionField
+from land_value import LandValue
+
+# relógio: 1 segundo de jogo = 1 minuto; a partida começa às 08:00 do dia 1/1/1
+CLOCK_START = 8*60
+HOUR_S  = 60
+DAY_S   = 24*HOUR_S
+MONTH_S = 30*DAY_S
+YEAR_S  = 12*MONTH_S
+
+class Simulation:
+    """
+    Dono de todo o estado da cidade. step(seconds) avança o relógio de jogo o
+    mais rápido que a CPU deixar; o front-end pygame só lê o estado e chama
+    build/demolish/withdraw. Avisos para o jogador (ex.: auto-saque) vão para
+    `notices` como (texto, cor) e o front-end os consome.
+
+    Toda aleatoriedade sai de state.rng (semente `seed`) e todo comando entra
+    em `log`; Simulation.replay(log) refaz a partida com CityState idêntico.
+
+    O que é periódico (economia por hora/dia, envelhecimento anual, eventos,
+    auto-saque, autosave) é job no `scheduler`; entre um job e outro a
+    economia por segundo é integrada em bloco. Sistema novo: sim.every(...).
+    """
+    def __init__(self, map_size: int = GRID_SIZE, grid_backend: str = "list", seed: Optional[int] = None,
+                 autosave_path: Optional[str] = None):
+        self.grid  = make_grid(map_size, grid_backend)
+        self.size  = grid_size(self.grid)
+        self.state = CityState(rng=RngStreams(seed))
+        self.seed  = self.state.rng.seed
+        self.log   = InputLog(self.seed, self.size, grid_backend)
+        self.placement = PlacementMap(self.grid)
+        self.coverage  = ServiceCoverage(self.grid)
+        self.traffic   = TrafficModel(self.grid)
+        self.pollution = PollutionField(self.grid)
+        self.land      = LandValue(self.grid, self.coverage, self.pollution,
+                                   np.random.default_rng(self.state.rng.blight.getrandbits(64)))
+        self.jobs      = JobMatcher(self.grid)
+        self.utilities = UtilityNetwork(self.grid)
+
+        # tempo
+        self.paused = False
+        self.speed  = 1.0
+        self.sec_accum = 0.0
+        self.game_seconds_total = 0
+        # base do avanço em bloco: [literacy, pending, money, segundos desde a base]
+        self._ff: Optional[list] = None
+
+        # cidadãos (agentes); a população inicial muda para as primeiras casas construídas
+        s = self.state
+        self.citizens = Citizens(np.random.default_rng(s.rng.citizens.getrandbits(64)))
+        self.citizens.add_household(0, s.pop_young, s.pop_adult, s.pop_elder, s.literacy, s.health)
+
+        # saque
+        self.last_withdraw_game_s = -9999
+        self.auto_tax = False
+        self.notices: list[tuple[str, tuple]] = []
+
+        # dilema aguardando escolha A/B do jogador
+        self.pending_event = None
+        self.autosave_path = autosave_path
+
+        self.labor = (0, 0, 0, 0, 0, 0, 0)   # jobs_com, jobs_ind, jobs_farm, labor_total, labor_com, labor_ind, labor_farm
+        self.refresh_after_edit()
+        self._sync_population()
+
+        self.scheduler = Scheduler()
+        self._register_jobs()
+
+    # ---- relógio (derivado do total de segundos)
+    @property
+    def minute(self) -> int: return (CLOCK_START + self.game_seconds_total) % 60
+    @property
+    def hour(self) -> int: return (CLOCK_START + self.game_seconds_total) // HOUR_S % 24
+    @property
+    def day(self) -> int: return (CLOCK_START + self.game_seconds_total) // DAY_S % 30 + 1
+    @property
+    def month(self) -> int: return (CLOCK_START + self.game_seconds_total) // MONTH_S % 12 + 1
+    @property
+    def year(self) -> int: return (CLOCK_START + self.game_seconds_total) // YEAR_S + 1
+
+    def next_boundary(self, period: int) -> int:
+        # próximo segundo (> agora) em que o relógio vira um múltiplo de `period`
+        clock = CLOCK_START + self.game_seconds_total
+        return (clock // period + 1) * period - CLOCK_START
+
+    def every(self, period: int, fn, name: str = "") -> Job:
+        """Registra um sistema periódico alinhado ao relógio (ex.: HOUR_S, DAY_S)."""
+        return self.scheduler.every(period, fn, self.next_boundary(period), name)
+
+    # ---- jobs
+    def _register_jobs(self):
+        s = self.state
+        self.every(HOUR_S, lambda: decay_oneoff_resources(s), "decay_oneoff")
+        self.every(HOUR_S, lambda: recompute_resources(s, self.grid, self.connected_gids, self.utilities,
+                                                       self.citizens.people_by_building()), "resources")
+        self.every(HOUR_S, lambda: inflation_hourly(s, self.grid, self.connected_gids), "inflation")
+        self.every(HOUR_S, lambda: socio_env_hourly(s, self.grid, self.connected_gids, self.coverage, self.pollution), "socio_env")
+        self.every(HOUR_S, lambda: traffic_hourly(s, self.traffic, self.citizens.commutes(), self.citizens.version), "traffic")
+        self.every(DAY_S, self._citizens_day, "citizens")
+        self.every(DAY_S, self._auto_withdraw, "auto_withdraw")
+        self.every(DAY_S, lambda: update_happiness_daily(s, self.grid, self.connected_gids, self.size, self.coverage), "happiness")
+        self.every(DAY_S, self._blight_day, "blight")
+        if self.autosave_path: self.every(AUTOSAVE_EVERY_S, self.autosave, "autosave")
+        self._schedule_event()
+
+    def _citizens_day(self):
+        # envelhecimento, nascimentos, mortes e educação de todos os cidadãos
+        grid, gids = self.grid, self.connected_gids
+        homes = buildings_of(grid, "residential")
+        home_ids = np.array([int(g) for g, _ in homes], dtype=np.int64)
+        home_cap = np.array([HOUSING_PER_CELL*len(cells) for _, cells in homes], dtype=np.int64)
+        school = count_buildings_by_tile_connected(grid, gids, "university") > 0
+        self.citizens.step_day(school, self.state.health, home_ids, home_cap)
+        self._match_jobs()
+        self._sync_population()
+        self.labor = update_labor_market(self.state, grid, gids, self.citizens)
+
+    def _auto_withdraw(self):
+        if not self.auto_tax: return
+        ok, add = self._withdraw(auto=True)
+        if ok: self.notices.append((f"Receita coletada: ${add} (auto)", (40,140,90)))
+
+    def _schedule_event(self):
+        # próximo dilema: daqui a 1–3 dias, entre 7h e 21h
+        rng = self.state.rng.events
+        add_days = rng.randint(1, 3)
+        hour_t   = rng.randint(7, 21)
+        day0 = (CLOCK_START + self.game_seconds_total) // DAY_S
+        t = (day0 + add_days)*DAY_S + hour_t*HOUR_S - CLOCK_START
+        self.scheduler.at(t, self._fire_event, "event")
+
+    def _fire_event(self):
+        # o próximo dilema é agendado sempre; um dilema ainda aberto quando ele chega
+        # expira com a opção padrão (partidas sem ninguém respondendo não travam)
+        ev = self.pending_event
+        if ev is not None: ev.options[ev.default](self.state)
+        self.pending_event = get_random_event(self.state, self.state.rng.events)
+        self._schedule_event()
+
+    def autosave(self):
+        self.log.end = self.game_seconds_total
+        self.log.save(self.autosave_path)
+
+    # ---- estado derivado
+    def _blight_day(self):
+        # favelas surgem/somem pelos caminhos normais do grid (registro, rede e contadores)
+        grow, recede = self.land.step_day(self.state)
+        for (x, y) in recede: demolish_at(self.grid, x, y)
+        for (x, y) in grow: place_build(self.grid, x, y, "Favela")
+        if grow or recede: self.refresh_after_edit()
+
+    def refresh_after_edit(self, *_):
+        self._ff = None
+        self.connected_roads, self.connected_gids = recompute_connectivity(self.grid)
+        refresh_treasury_cap(self.state, self.grid, self.connected_gids)
+        self._match_jobs()
+        self.labor = update_labor_market(self.state, self.grid, self.connected_gids, self.citizens)
+        recompute_resources(self.state, self.grid, self.connected_gids, self.utilities,
+                            self.citizens.people_by_building())
+
+    def _match_jobs(self):
+        # vagas dos prédios de emprego conectados
+        emp, cap, sec = [], [], []
+        for i, tile in enumerate(SECTORS):
+            for gid, _ in buildings_of(self.grid, tile):
+                if gid in self.connected_gids:
+                    emp.append(int(gid)); cap.append(JOBS_PER[tile]); sec.append(i)
+        self.citizens.match_jobs(np.array(emp, dtype=np.int64), np.array(cap, dtype=np.int64),
+                                 np.array(sec, dtype=np.int64), self.jobs)
+
+    def _sync_population(self):
+        # agregados dos agentes que o HUD e a economia leem do CityState
+        s, c = self.state, self.citizens
+        s.pop_young, s.pop_adult, s.pop_elder = c.age_groups()
+        s.population = len(c)
+        s.literacy = c.literacy()
+
+    def add_population_random(self, gid: str, name: str):
+        rng = self.state.rng.population
+        if name == "Casa":
+            total = rng.randint(1, 6)
+        elif name == "Condomínio":
+            total = rng.randint(7, 15)
+        else:
+            return
+        # quem ainda não tem casa entra primeiro; a família nova ocupa o que sobrar
+        room = HOUSING_PER_CELL * CATALOG[name]["w"] * CATALOG[name]["h"]
+        total = min(total, room - self.citizens.move_in(int(gid), room))
+        young = int(round(total * rng.uniform(0.25, 0.40)))
+        elder = int(round(total * rng.uniform(0.08, 0.15)))
+        adult = max(0, total - young - elder)
+        s = self.state
+        # quem chega traz a escolaridade média da cidade
+        self.citizens.add_household(int(gid), young, adult, elder, s.literacy, s.health)
+        self._sync_population()
+
+    def remove_population_gid(self, gid: str):
+        if self.citizens.remove_home(int(gid)): self._sync_population()
+
+    # ---- comandos (todos gravados em self.log)
+    def _record(self, op: str, *args):
+        self.log.record(self.game_seconds_total, op, *args)
+        self._ff = None
+
+    def build(self, name: str, x: int, y: int) -> Tuple[bool, Optional[str]]:
+        """(True, gid) ou (False, motivo)."""
+        self._record("build", name, x, y)
+        for req in CATALOG.get(name, {}).get("requires", []):
+            if not has_building(self.grid, req): return False, f"Requer {req}."
+        cost = -BUILD_EFFECTS.get(name, {}).get("money", 0)
+        if self.state.money < cost: return False, "Dinheiro insuficiente."
+        ok, res = place_build(self.grid, x, y, name)
+        if not ok: return False, res or "Falha ao construir."
+        self.state.money -= cost
+        if name in ("Casa", "Condomínio"): self.add_population_random(res, name)
+        if name == "Rua":
+            self.state.power_use_once += ROAD_ONEOFF_POWER
+            self.state.water_use_once += ROAD_ONEOFF_WATER
+        self.refresh_after_edit()
+        return True, res
+
+    def begin_batch(self) -> BuildBatch:
+        # arrasto de ruas: uma transação, recálculo só no commit
+        return _LoggedBatch(self)
+
+    def demolish(self, x: int, y: int) -> Optional[str]:
+        self._record("demolish", x, y)
+        gid = demolish_at(self.grid, x, y)
+        if gid: self.remove_population_gid(gid)
+        self.refresh_after_edit()
+        return gid
+
+    def can_withdraw(self) -> Tuple[bool, Optional[str]]:
+        grid, gids, s = self.grid, self.connected_gids, self.state
+        com  = count_buildings_by_tile_connected(grid, gids, "commercial")
+        ind  = count_buildings_by_tile_connected(grid, gids, "industrial")
+        farm = count_buildings_by_tile_connected(grid, gids, "farm")
+        if (com + ind + farm) == 0:
+            return False, "É preciso ao menos 1 Comércio/Indústria/Fazenda conectados à Prefeitura."
+        if s.treasury_pending < MIN_WITHDRAW_THRESHOLD:
+            return False, f"Sem riqueza suficiente (mínimo ${int(MIN_WITHDRAW_THRESHOLD)})."
+        cd = WITHDRAW_COOLDOWN_S - (10 if central_bank_connected(s, grid, gids) else 0)
+        cd = max(10, cd)
+        elapsed = self.game_seconds_total - self.last_withdraw_game_s
+        if elapsed < cd:
+            return False, f"Aguarde cooldown ({int(cd - elapsed)}s)."
+        return True, None
+
+    def withdraw(self) -> Tuple[bool, Optional[str]]:
+        """Saca a receita acumulada; (True, valor) ou (False, motivo)."""
+        self._record("withdraw")
+        return self._withdraw()
+
+    def choose_event(self, key: str):
+        """Resolve o dilema pendente com a opção "A" ou "B"."""
+        self._record("choose_event", key)
+        ev = self.pending_event
+        if ev is None or key not in ev.options: return
+        ev.options[key](self.state)
+        self.pending_event = None
+
+    def set_paused(self, on: bool):
+        # pausa só decide se advance() anda; não muda o estado, não vai pro log
+        self.paused = on
+
+    def set_speed(self, speed: float):
+        self._record("set_speed", speed)
+        self.speed = speed
+
+    def set_auto_tax(self, on: bool):
+        self._record("set_auto_tax", on)
+        self.auto_tax = on
+
+    def _withdraw(self, auto: bool = False) -> Tuple[bool, Optional[str]]:
+        ok, reason = self.can_withdraw()
+        if not ok: return False, reason
+        s = self.state
+        payout = s.treasury_pending * max(0.0, 1.0 - s.inflation/100.0)
+        if auto: payout *= 0.98
+        add = int(payout)
+        s.money += add
+        s.treasury_pending = 0.0
+        self.last_withdraw_game_s = self.game_seconds_total
+        self._ff = None
+        return True, add
+
+    # ---- tempo
+    def advance(self, real_dt: float):
+        # chamado pelo front-end a cada frame: tempo real × velocidade
+        if not self.paused: self.step(real_dt * self.speed)
+
+    def step(self, seconds: float):
+        """Avança `seconds` segundos de jogo (cada segundo = 1 minuto no relógio)."""
+        self.sec_accum += seconds
+        ticks = int(self.sec_accum); self.sec_accum -= ticks
+        end = self.game_seconds_total + ticks
+        while self.game_seconds_total < end:
+            # pula direto até o próximo job; o intervalo ocioso é integrado em bloco
+            t = self.scheduler.next_time()
+            if t is None or t > end:
+                self._integrate(end - self.game_seconds_total)
+                break
+            self._integrate(t - 1 - self.game_seconds_total)
+            self._job_second()
+
+    def _integrate(self, n: int):
+        if n <= 0: return
+        # sempre integra a partir da mesma base (último job/comando): o resultado
+        # não depende de como os frames fatiaram o intervalo (replay idêntico)
+        s = self.state
+        ff = self._ff
+        if ff is None or ff[4:] != [s.literacy, s.treasury_pending, s.money]:
+            ff = self._ff = [s.literacy, s.treasury_pending, s.money, 0]
+        s.literacy, s.treasury_pending, s.money = ff[0], ff[1], ff[2]
+        ff[3] += n
+        self.labor = fast_forward_seconds(s, self.grid, self.connected_gids, ff[3], self.citizens)
+        ff[4:] = [s.literacy, s.treasury_pending, s.money]
+        self.game_seconds_total += n
+
+    def _job_second(self):
+        # um segundo com jobs: economia por segundo em volta dos jobs devidos
+        s, grid = self.state, self.grid
+        self.game_seconds_total += 1
+        self._ff = None
+        self.labor = update_labor_market(s, grid, self.connected_gids, self.citizens)
+        income_tick_per_second(s, grid, self.connected_gids)
+        self.scheduler.run_due(self.game_seconds_total)
+        upkeep_minutely(s, grid)
+
+    # ---- replay
+    @classmethod
+    def replay(cls, log: InputLog, until: Optional[int] = None) -> "Simulation":
+        """Refaz os comandos de `log` headless, na velocidade da CPU; para em `until` (segundos de jogo)."""
+        sim = cls(log.map_size, log.grid_backend, seed=log.seed)
+        player = LogPlayer(sim, log)
+        player.advance_to(until if until is not None else player.end)
+        return sim
+
+class LogPlayer:
+    """Aplica os comandos de um InputLog numa Simulation conforme o tempo de jogo avança."""
+    def __init__(self, sim: Simulation, log: InputLog):
+        self.sim = sim
+        self.entries = log.entries
+        self.end = max(log.end, log.entries[-1][0] if log.entries else 0)
+        self.i = 0
+        self.batch = None
+
+    def advance_to(self, t: int):
+        # comandos com carimbo <= t entram no segundo exato em que foram dados
+        sim = self.sim
+        while self.i < len(self.entries) and self.entries[self.i][0] <= t:
+            et, op, args = self.entries[self.i]; self.i += 1
+            sim.step(et - sim.game_seconds_total)
+            if op == "batch_place":
+                if self.batch is None: self.batch = sim.begin_batch()
+                self.batch.place(*args)
+            elif op == "batch_commit":
+                if self.batch is not None: self.batch.commit(); self.batch = None
+            elif op == "batch_rollback":
+                if self.batch is not None: self.batch.rollback(); self.batch = None
+            else:
+                getattr(sim, op)(*args)
+        sim.step(max(0, t - sim.game_seconds_total))
+
+class _LoggedBatch(BuildBatch):
+    # as células do arrasto entram no grid antes do commit, então cada passo é gravado
+    def __init__(self, sim: Simulation):
+        super().__init__(sim.grid, sim.state, on_commit=self._committed)
+        self.sim = sim
+
+    def _committed(self, *_):
+        # casas da transação ganham moradores como no build avulso, antes do recálculo
+        for gid, name in self.placed:
+            if name in ("Casa", "Condomínio"): self.sim.add_population_random(gid, name)
+        self.sim.refresh_after_edit()
+
+    def place(self, x, y, name: str):
+        self.sim._record("batch_place", x, y, name)
+        return super().place(x, y, name)
+
+    def commit(self):
+        if self.open: self.sim._record("batch_commit")
+        return super().commit()
+
+    def rollback(self):
+        if self.open: self.sim._record("batch_rollback")
+        super().rollback()
@@ -0,0 +1,48 @@
+# tests/test_build_batch.py — BuildBatch: reserva de custo, commit e rollback
+from config_game import BUILD_EFFECTS
+from simulation import Simulation
+
+def _city():
+    sim = Simulation(24, "list", seed=1)
+    sim.state.money = 10**6
+    sim.build("Prefeitura", 0, 0)
+    for x in range(2, 10): sim.build("Rua", x, 1)
+    sim.build("Loja", 12, 2)   # desconectada: falta a rua x=10..12
+    return sim
+
+def test_rollback_refreshes_derived_state():
+    sim = _city()
+    batch = sim.begin_batch()
+    for x in (10, 11, 12): assert batch.place(x, 1, "Rua")[0]
+    sim.step(120)   # jobs por hora rodam com a transação aberta (Loja conectada)
+    money, reserved = sim.state.money, batch.cost
+    batch.rollback()
+    assert sim.state.money == money + reserved
+    assert sim.grid[1][10].occupied is False
+    derived = (sim.state.treasury_cap, sim.state.power_cap, sim.state.power_pct, sim.state.unemployment, sim.labor)
+    sim.refresh_after_edit()
+    assert (sim.state.treasury_cap, sim.state.power_cap, sim.state.power_pct, sim.state.unemployment, sim.labor) == derived
+
+def test_commit_connects_and_charges_once():
+    sim = _city()
+    money = sim.state.money
+    batch = sim.begin_batch()
+    assert batch.line(10, 1, 12, 1, "Rua") == 3
+    assert sim.state.money == money - batch.cost and batch.cost > 0
+    placed = batch.commit()
+    assert [name for _, name in placed] == ["Rua"] * 3
+    assert sim.grid[2][12].group_id in sim.connected_gids   # a Loja ganhou rua
+    assert sim.state.money == money - batch.cost
+    assert batch.commit() is placed   # commit de novo não cobra nem recalcula
+
+def test_path_stops_when_money_runs_out():
+    sim = _city()
+    cost = -BUILD_EFFECTS["Rua"]["money"]
+    sim.state.money = 2*cost + cost // 2
+    batch = sim.begin_batch()
+    assert batch.line(10, 3, 20, 3, "Rua") == 2
+    assert batch.place(20, 5, "Rua") == (False, "Dinheiro insuficiente.")
+    assert sim.state.money == cost // 2 and not sim.grid[3][12].occupied
+    batch.rollback()
+    assert sim.state.money == 2*cost + cost // 2
+    assert not sim.grid[3][10].occupied and not sim.grid[3][11].occupied
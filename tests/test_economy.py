@@ -0,0 +1,82 @@
+# tests/test_economy.py — fast_forward_seconds vs ticks um a um; lote (city_batch) vs caminho escalar
+import copy, random
+
+import numpy as np
+import pytest
+
+import economy as E
+import grid_system as gs
+from city_batch import (
+    BatchCityState, BatchCounts, STATE_FIELDS, income_tick_per_second_batch, inflation_hourly_batch,
+    socio_env_hourly_batch, update_happiness_daily_batch, decay_oneoff_resources_batch
+)
+from models import CityState
+from simulation import Simulation
+
+def test_fast_forward_equals_single_ticks():
+    grid = gs.make_grid(14)
+    gs.place_build(grid, 2, 2, "Prefeitura")
+    for x in range(14): gs.place_build(grid, x, 4, "Rua")
+    for x, name in [(0, "Loja"), (1, "Fábrica"), (2, "Fazenda"), (5, "Universidade"), (9, "Casa")]:
+        gs.place_build(grid, x, 5, name)
+    _, gids = gs.recompute_connectivity(grid)
+    for trial in range(40):
+        rng = random.Random(trial)
+        st = CityState(population=rng.randint(0, 300), money=rng.randint(0, 200),
+                       literacy=rng.uniform(90, 100) if trial % 2 else rng.uniform(0, 50),
+                       treasury_pending=rng.uniform(0, 500))
+        E.refresh_treasury_cap(st, grid, gids)
+        if trial % 3 == 0: st.treasury_pending = st.treasury_cap + 50   # cofre já no teto
+        a, b = copy.deepcopy(st), copy.deepcopy(st)
+        n = rng.randint(1, 59)
+        for _ in range(n):
+            E.update_labor_market(a, grid, gids); E.income_tick_per_second(a, grid, gids)
+            E.literacy_tick(a, grid, gids); E.upkeep_minutely(a, grid)
+        E.fast_forward_seconds(b, grid, gids, n)
+        for name in ("treasury_pending", "literacy", "money", "unemployment"):
+            assert getattr(b, name) == pytest.approx(getattr(a, name), rel=1e-9, abs=1e-9)
+
+class _Fixed:
+    # rng escalar que devolve valores já sorteados (os mesmos passados ao lote)
+    def __init__(self, vals): self.vals = list(vals)
+    def uniform(self, a, b): return self.vals.pop(0)
+    def random(self): return self.vals.pop(0)
+
+def _cities():
+    rng = random.Random(3)
+    names = ["Casa", "Loja", "Fábrica", "Fazenda", "Parque", "Delegacia", "Hospital", "Usina", "Banco Central", "Favela"]
+    sims = []
+    for i in range(8):
+        sim = Simulation(30, seed=i)
+        sim.build("Prefeitura", 2, 2)
+        batch = sim.begin_batch(); batch.line(1, 0, 1, 29, "Rua"); batch.line(5, 0, 5, 29, "Rua"); batch.commit()
+        for _ in range(rng.randint(0, 25)): sim.build(rng.choice(names), rng.choice([0, 2, 3, 6]), rng.randint(0, 28))
+        sim.step(rng.randint(0, 5000))
+        sims.append(sim)
+    return sims
+
+@pytest.mark.parametrize("fields", [False, True])
+def test_batch_matches_scalar_path(fields):
+    sims = _cities()
+    bs = BatchCityState.from_states([s.state for s in sims], seed=0)
+    crime = np.random.default_rng(1).uniform(-1, 1, len(sims))
+    infl = np.random.default_rng(2).random((len(sims), 2))
+    for i, sim in enumerate(sims):
+        st, cov, pol = sim.state, sim.coverage if fields else None, sim.pollution if fields else None
+        st.rng.crime, st.rng.inflation = _Fixed([crime[i]]), _Fixed(infl[i])
+        E.income_tick_per_second(st, sim.grid, sim.connected_gids)
+        E.inflation_hourly(st, sim.grid, sim.connected_gids)
+        E.socio_env_hourly(st, sim.grid, sim.connected_gids, cov, pol)   # avança a poluição desta hora
+        E.update_happiness_daily(st, sim.grid, sim.connected_gids, sim.size, cov)
+        E.decay_oneoff_resources(st)
+    counts = BatchCounts.from_grids([s.grid for s in sims], [s.connected_gids for s in sims],
+                                    [s.coverage for s in sims] if fields else None,
+                                    [s.pollution for s in sims] if fields else None)
+    farm = counts.connected["farm"]
+    income_tick_per_second_batch(bs, counts)
+    inflation_hourly_batch(bs, counts, noise=(0.1 - 0.2*infl[:, 0]) + np.where(farm > 0, 0.1 - 0.2*infl[:, 1], 0.0))
+    socio_env_hourly_batch(bs, counts, noise=crime)
+    update_happiness_daily_batch(bs, counts)
+    decay_oneoff_resources_batch(bs)
+    for name in STATE_FIELDS:
+        assert np.array([getattr(s.state, name) for s in sims], dtype=float) == pytest.approx(getattr(bs, name).astype(float)), name
@@ -0,0 +1,53 @@
+# tests/test_fields.py — cobertura de serviços (raios do BFS) e poluição em regime
+import numpy as np
+import pytest
+
+import grid_system as gs
+from config_game import SERVICE_RADIUS, POLLUTION_DIFFUSE, POLLUTION_KEEP, POLLUTION_EMIT, POLLUTION_PENALTY_PER_UNIT
+from coverage import ServiceCoverage
+from pollution import PollutionField, EPS
+
+@pytest.mark.parametrize("backend", ["list", "array", "chunked"])
+def test_coverage_decays_with_road_distance(backend):
+    n = 48
+    grid = gs.make_grid(n, backend)
+    gs.place_build(grid, 0, 0, "Prefeitura")
+    for x in range(n): gs.place_build(grid, x, 2, "Rua")
+    gs.place_build(grid, 10, 3, "Delegacia")   # entradas: (10, 2) e (11, 2)
+    field = ServiceCoverage(grid).field("police")
+    r = SERVICE_RADIUS["police"]
+    cov = lambda d: max(0.0, 1.0 - d / r)
+    for x in range(n):
+        d = 10 - x if x < 10 else max(0, x - 11)
+        # a rua também pega o melhor das vizinhas; fora dela, só o da rua ao lado
+        assert field[2, x] == pytest.approx(cov(max(0, d - 1)))
+        assert field[1, x] == pytest.approx(cov(d)) and field[3, x] == pytest.approx(cov(d))
+    assert field[5, 10] == 0 and field[2, 12 + r] == 0 and field[3, 11 + r] == 0
+
+def _dense_step(P, keep, E):
+    a, mid = POLLUTION_DIFFUSE, 1 - 2*POLLUTION_DIFFUSE
+    b = P * mid; b[1:] += a * P[:-1]; b[:-1] += a * P[1:]
+    c = b * mid; c[:, 1:] += a * b[:, :-1]; c[:, :-1] += a * b[:, 1:]
+    return c * keep + E
+
+def test_pollution_reaches_steady_state():
+    n = 96
+    fields = {}
+    for backend in ("list", "array", "chunked"):
+        grid = gs.make_grid(n, backend)
+        gs.place_build(grid, 90, 20, "Fábrica")
+        gs.place_build(grid, 83, 20, "Casa")
+        f = PollutionField(grid)
+        for _ in range(500):
+            f.step()
+            if not f.active: break
+        assert not f.active
+        fields[backend] = f
+    P = fields["list"].P.window(0, n, 0, n)
+    for f in fields.values(): assert (f.P.window(0, n, 0, n) == P).all()
+
+    E = np.zeros((n, n), dtype=np.float32); E[20, 90] = POLLUTION_EMIT["industrial"]
+    assert np.abs(_dense_step(P, POLLUTION_KEEP, E) - P).max() <= 2*EPS
+    assert P[20, 90] == P.max() and P[20, 83] > P[20, 70] >= 0
+    assert fields["list"].exposure() == pytest.approx(P[20, 83] * POLLUTION_PENALTY_PER_UNIT)
+    assert len(fields["list"].P.blocks) < 9   # chunks longe da fábrica não são alocados
@@ -0,0 +1,91 @@
+# tests/test_grid_indices.py — registro, rede de ruas, gids e paridade entre backends
+import random
+
+import pytest
+
+import grid_system as gs
+from config_game import CATALOG
+
+TILES = sorted({cfg["tile"] for cfg in CATALOG.values()})
+NAMES = list(CATALOG) + ["Rua"] * 12 + ["Prefeitura"]
+
+def _edit(grid, rng, n):
+    # 65% constrói, 35% demole (célula sorteada; a Prefeitura só cai de vez em quando)
+    x, y = rng.randrange(n), rng.randrange(n)
+    if rng.random() < 0.65: gs.place_build(grid, x, y, rng.choice(NAMES))
+    elif grid[y][x].btype != "city_hall" or rng.random() < 0.1: gs.demolish_at(grid, x, y)
+
+def _skeleton(grid, n):
+    # Prefeitura e uma malha de ruas: as edições sorteadas cortam e religam trechos
+    gs.place_build(grid, 0, 0, "Prefeitura")
+    for i in range(n):
+        for k in (2, 8): gs.place_build(grid, i, k, "Rua"); gs.place_build(grid, k + 2, i, "Rua")
+
+def _roots(grid, tile, gids=None):
+    return sum(1 for row in grid for c in row if c.occupied and c.is_root and c.btype == tile
+               and (gids is None or c.group_id in gids))
+
+@pytest.mark.parametrize("backend", ["list", "chunked"])
+def test_registry_counts_match_full_recount(backend):
+    rng = random.Random(1)
+    grid = gs.make_grid(14, backend)
+    _skeleton(grid, 14)
+    for _ in range(800):
+        _edit(grid, rng, 14)
+        _, gids = gs.recompute_connectivity(grid)
+        for tile in TILES:
+            assert gs.count_all(grid, tile) == _roots(grid, tile)
+            assert gs.count_buildings_by_tile_connected(grid, gids, tile) == _roots(grid, tile, gids)
+
+@pytest.mark.parametrize("seed", range(3))
+def test_road_network_matches_bfs(seed):
+    rng = random.Random(seed)
+    grid = gs.make_grid(14)
+    _skeleton(grid, 14)
+    for _ in range(600):
+        _edit(grid, rng, 14)
+        roads, gids = gs.recompute_connectivity(grid)
+        plain = [list(row) for row in grid]   # list[list[Cell]] cru: BFS do zero
+        assert (roads, gids) == gs.recompute_connectivity(plain)
+
+def test_road_split_disconnects_far_side():
+    grid = gs.make_grid(14)
+    gs.place_build(grid, 0, 0, "Prefeitura")
+    for x in range(14): gs.place_build(grid, x, 2, "Rua")
+    _, shop = gs.place_build(grid, 12, 3, "Loja")
+    assert shop in gs.recompute_connectivity(grid)[1]
+    gs.demolish_at(grid, 6, 2)
+    roads, gids = gs.recompute_connectivity(grid)
+    assert shop not in gids and (7, 2) not in roads and (5, 2) in roads
+    assert (roads, gids) == gs.recompute_connectivity([list(row) for row in grid])
+    gs.place_build(grid, 6, 2, "Rua")
+    assert shop in gs.recompute_connectivity(grid)[1]
+
+def test_backends_agree():
+    grids = {be: gs.make_grid(14, be) for be in ("list", "array", "chunked")}
+    rngs = {be: random.Random(5) for be in grids}
+    for grid in grids.values(): _skeleton(grid, 14)
+    for _ in range(500):
+        for be, grid in grids.items(): _edit(grid, rngs[be], 14)
+        views = []
+        for grid in grids.values():
+            roads, gids = gs.recompute_connectivity(grid)
+            cells = [(c.btype, c.occupied, c.is_root) for row in grid for c in row]
+            counts = [(gs.count_all(grid, t), gs.count_buildings_by_tile_connected(grid, gids, t)) for t in TILES]
+            views.append((cells, set(roads), counts))
+        assert views[0] == views[1] == views[2]
+
+@pytest.mark.parametrize("backend", ["list", "array", "chunked"])
+def test_gids_never_reused_after_demolish(backend):
+    rng = random.Random(2)
+    grid = gs.make_grid(14, backend)
+    seen = set()
+    for _ in range(400):
+        ok, gid = gs.place_build(grid, rng.randrange(14), rng.randrange(14), rng.choice(NAMES))
+        if ok:
+            assert gid not in seen
+            seen.add(gid)
+        if rng.random() < 0.5: gs.demolish_at(grid, rng.randrange(14), rng.randrange(14))
+    for tile in TILES:
+        for gid, cells in gs.buildings_of(grid, tile):
+            assert all(grid[y][x].group_id == gid for (x, y) in cells)
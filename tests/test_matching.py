@@ -0,0 +1,95 @@
+# tests/test_matching.py — JobMatcher (distâncias incrementais, guloso) e UtilityNetwork
+import random
+from collections import deque
+
+import pytest
+
+import grid_system as gs
+import utilities
+from config_game import COMMUTE_MAX
+from matching import JobMatcher, JOB_TILES
+from utilities import UtilityNetwork
+
+def _entries(grid, tile, roads, gids, n):
+    return {int(gid): {nb for (x, y) in cells for nb in gs.neighbors4(x, y, n) if nb in roads}
+            for gid, cells in gs.buildings_of(grid, tile) if gid in gids}
+
+def _oracle(grid, n):
+    # BFS de cada casa até cada emprego, do zero
+    roads, gids = gs.recompute_connectivity(grid)
+    homes = {k: e for k, e in _entries(grid, "residential", roads, gids, n).items() if e}
+    jobs = {k: e for t in JOB_TILES for k, e in _entries(grid, t, roads, gids, n).items() if e}
+    out = {}
+    for home, entry in homes.items():
+        dist, queue = {p: 0 for p in entry}, deque(entry)
+        while queue:
+            x, y = queue.popleft()
+            if dist[(x, y)] == COMMUTE_MAX: continue
+            for nb in gs.neighbors4(x, y, n):
+                if nb in roads and nb not in dist:
+                    dist[nb] = dist[(x, y)] + 1; queue.append(nb)
+        out[home] = {job: min(dist[p] for p in e if p in dist) for job, e in jobs.items() if any(p in dist for p in e)}
+    return out
+
+def test_incremental_distances_match_bfs():
+    n, rng = 24, random.Random(6)
+    grid = gs.make_grid(n)
+    gs.place_build(grid, 0, 0, "Prefeitura")
+    for i in range(n):   # malha inicial ligada à Prefeitura; as demolições a cortam depois
+        for k in (2, 12, 21): gs.place_build(grid, i, k, "Rua")
+        for k in (5, 14): gs.place_build(grid, k, i, "Rua")
+    matcher = JobMatcher(grid)
+    names = ["Rua"] * 3 + ["Casa", "Casa", "Loja", "Fábrica", "Fazenda"]
+    seen = 0
+    for _ in range(30):
+        for _ in range(8):
+            x, y = rng.randrange(n), rng.randrange(n)
+            if rng.random() < 0.7: gs.place_build(grid, x, y, rng.choice(names))
+            elif not (y < 3 and x < 6): gs.demolish_at(grid, x, y)   # poupa a Prefeitura e sua saída
+        matcher.sync()
+        expect = _oracle(grid, n)
+        assert matcher.dist == expect
+        seen += sum(len(v) for v in expect.values())
+    assert seen > 100
+
+def test_assign_fills_nearest_job_first():
+    grid = gs.make_grid(24)
+    gs.place_build(grid, 0, 0, "Prefeitura")
+    for x in range(24): gs.place_build(grid, x, 2, "Rua")
+    home = int(gs.place_build(grid, 10, 3, "Casa")[1])
+    near = int(gs.place_build(grid, 12, 3, "Loja")[1])
+    far = int(gs.place_build(grid, 20, 3, "Fábrica")[1])
+    matcher = JobMatcher(grid)
+    assert matcher.assign({home: 5}, {near: 3, far: 10}) == [(home, near, 3), (home, far, 2)]
+    assert matcher.assign({home: 5}, {near: 0, far: 10}) == [(home, far, 5)]
+
+def _street(n):
+    grid = gs.make_grid(n)
+    gs.place_build(grid, 0, 0, "Prefeitura")
+    for x in range(n): gs.place_build(grid, x, 2, "Rua")
+    return grid
+
+def test_utility_reach_is_capped_by_radius():
+    grid = _street(96)
+    near = gs.place_build(grid, 6, 3, "Casa")[1]
+    far = gs.place_build(grid, 90, 3, "Casa")[1]   # > UTILITY_RADIUS passos de qualquer fonte
+    gs.place_build(grid, 10, 3, "Usina")
+    net = UtilityNetwork(grid)
+    net.update()
+    assert net.supplied["power"][near] == 1.0
+    assert net.supplied["power"][far] == 0.0 and net.shortages("power")[far] == 1.0
+    gs.place_build(grid, 85, 3, "Usina")
+    net.update()
+    assert net.supplied["power"][far] == 1.0 and far not in net.shortages("power")
+
+def test_utility_capacity_goes_to_nearest(monkeypatch):
+    monkeypatch.setattr(utilities, "BASE_SUPPLY", 0.8)   # a Prefeitura e uma casa
+    grid = _street(32)
+    near = gs.place_build(grid, 6, 3, "Casa")[1]
+    far = gs.place_build(grid, 12, 3, "Casa")[1]
+    net = UtilityNetwork(grid)
+    net.update()
+    assert net.supplied["power"][near] == 1.0 and net.shortages("power") == {far: 1.0}
+    assert net.use["power"] == pytest.approx(1.2)
+    assert net.served_share("power", {near: 4, far: 4}) == 0.5
+    assert net.served_share("power", {near: 4}) == 1.0 and net.served_share("power", {}) == 1.0
@@ -0,0 +1,47 @@
+# tests/test_placement.py — PlacementMap (incremental, por chunk) contra força bruta
+import random
+
+import numpy as np
+import pytest
+
+import grid_system as gs
+from config_game import CATALOG
+from placement import PlacementMap
+
+def _brute(grid, n, w, h):
+    roads, _ = gs.recompute_connectivity(grid)
+    valid = np.zeros((n, n), dtype=bool)
+    contacts = np.zeros((n, n), dtype=np.int32)
+    for y in range(n - h + 1):
+        for x in range(n - w + 1):
+            if any(grid[y+j][x+i].occupied for j in range(h) for i in range(w)): continue
+            valid[y, x] = True
+            ring = [(x+i, y-1) for i in range(w)] + [(x+i, y+h) for i in range(w)] \
+                 + [(x-1, y+j) for j in range(h)] + [(x+w, y+j) for j in range(h)]
+            contacts[y, x] = sum(1 for p in ring if p in roads)
+    return valid, contacts
+
+@pytest.mark.parametrize("backend", ["list", "array", "chunked"])
+def test_placement_matches_brute_force(backend):
+    n = 40   # não múltiplo de CHUNK: chunks de borda
+    rng = random.Random(4)
+    grid = gs.make_grid(n, backend)
+    gs.place_build(grid, 18, 18, "Prefeitura")
+    for i in range(n): gs.place_build(grid, i, 20, "Rua"); gs.place_build(grid, 33, i, "Rua")
+    place = PlacementMap(grid)
+    names = ["Rua"] * 8 + ["Casa", "Condomínio", "Fazenda", "Universidade"]
+    for step in range(6):
+        for _ in range(60):
+            if rng.random() < 0.85: gs.place_build(grid, rng.randrange(n), rng.randrange(n), rng.choice(names))
+            else: gs.demolish_at(grid, rng.randrange(n), rng.randrange(n))
+        place.refresh()
+        for (w, h) in place.footprints:
+            valid, contacts = _brute(grid, n, w, h)
+            assert (place.valid[(w, h)].window(0, n, 0, n) == valid).all()
+            assert (place.road_contacts[(w, h)].window(0, n, 0, n) == contacts).all()
+        for name in ("Casa", "Condomínio", "Fazenda"):
+            _, contacts = _brute(grid, n, CATALOG[name]["w"], CATALOG[name]["h"])
+            ys, xs = np.nonzero(contacts)
+            best = sorted(zip((-contacts[ys, xs]).tolist(), ys.tolist(), xs.tolist()))[:12]
+            assert place.suggest(name) == [(x, y) for _, y, x in best]
+    assert not place.is_valid(n - 1, 0, "Condomínio") and not place.is_valid(-1, 0, "Casa")
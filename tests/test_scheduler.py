@@ -0,0 +1,26 @@
+# tests/test_scheduler.py — ordem dos jobs no mesmo segundo, recorrência e cancelamento
+from scheduler import Scheduler
+
+def test_same_second_runs_in_registration_order():
+    sched, ran, now = Scheduler(), [], [0]
+    sched.every(60, lambda: ran.append(("hour", now[0])), first=60)
+    sched.at(60, lambda: ran.append(("once", now[0])))
+    sched.every(30, lambda: ran.append(("half", now[0])), first=30)
+    for t in range(1, 181):
+        now[0] = t
+        sched.run_due(t)
+    assert ran == [("half", 30), ("hour", 60), ("once", 60), ("half", 60), ("half", 90),
+                   ("hour", 120), ("half", 120), ("half", 150), ("hour", 180), ("half", 180)]
+
+def test_run_due_catches_up_and_next_time_skips_cancelled():
+    sched, ran = Scheduler(), []
+    tick = sched.every(10, lambda: ran.append("tick"), first=10)
+    late = sched.at(5, lambda: ran.append("late"))
+    sched.at(7, lambda: ran.append("seven"))
+    late.cancel()
+    assert sched.next_time() == 7
+    sched.run_due(35)   # um salto grande roda todas as recorrências vencidas
+    assert ran == ["seven", "tick", "tick", "tick"]
+    assert sched.next_time() == 40
+    tick.cancel()
+    assert sched.next_time() is None
@@ -0,0 +1,24 @@
+# tests/test_tile_map.py — TileMap/snapshot: célula liberada e reusada por outro tile na mesma janela
+import pytest
+
+from grid_system import TileMap
+from sim_thread import SimClient
+from simulation import Simulation
+
+@pytest.mark.parametrize("backend", ["list", "array", "chunked"])
+def test_cell_reused_by_other_tile_between_syncs(backend):
+    sim = Simulation(16, backend, seed=1)
+    sim.state.money = 10**6
+    tiles = TileMap(sim.grid)
+    client = SimClient(sim)
+    assert sim.build("Rua", 2, 2)[0]
+    tiles.sync(); client.publish()
+
+    sim.demolish(2, 2)
+    assert sim.build("Casa", 2, 2)[0]
+    box = tiles.sync(); client.publish()
+
+    view = client.snapshot()
+    assert view.occupied(2, 2) and view.tile_key(2, 2) == "residential"
+    assert tiles.codes[2, 2] == view.tiles[2, 2]
+    assert box is not None
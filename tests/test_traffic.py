@@ -0,0 +1,45 @@
+# tests/test_traffic.py — cargas de trânsito num mapa pequeno montado à mão
+import grid_system as gs
+from config_game import ROAD_CAPACITY, TRAFFIC_BASE
+from traffic import TrafficModel
+
+def _map():
+    # Prefeitura em cima, uma rua em y=2; casas e lojas encostadas embaixo dela
+    grid = gs.make_grid(16)
+    gs.place_build(grid, 0, 0, "Prefeitura")
+    for x in range(16): gs.place_build(grid, x, 2, "Rua")
+    home = int(gs.place_build(grid, 2, 3, "Casa")[1])
+    far = int(gs.place_build(grid, 14, 3, "Casa")[1])
+    shop = int(gs.place_build(grid, 8, 3, "Loja")[1])
+    return grid, home, far, shop
+
+def test_loads_follow_commute_paths():
+    grid, home, far, shop = _map()
+    model = TrafficModel(grid)
+    model.update({(home, shop): 3, (far, shop): 2}, version=1)
+    # casa em x=2 → entrada da loja em x=8; casa em x=14 → x=8
+    expect = {(x, 2): 3 for x in range(2, 8)}
+    expect.update({(x, 2): 2 for x in range(9, 15)})
+    expect[(8, 2)] = 5
+    assert model.load == expect and model.trips == 5
+    assert model.index() == TRAFFIC_BASE   # nenhum trecho acima da capacidade
+    k = ROAD_CAPACITY + 8
+    model.update({(home, shop): k}, version=2)
+    assert model.index() == TRAFFIC_BASE + 100.0 * 8 / k
+
+def test_delta_updates_match_fresh_model():
+    grid, home, far, shop = _map()
+    model = TrafficModel(grid)
+    model.update({(home, shop): 3, (far, shop): 2}, version=1)
+    model.update({(home, shop): 1}, version=2)   # um par some, o outro diminui
+    assert model.load == {(x, 2): 1 for x in range(2, 9)} and model.trips == 1
+    model.update({(home, shop): 7}, version=2)   # mesma versão: nada a refazer
+    assert model.trips == 1
+
+    gs.demolish_at(grid, 5, 2)   # malha mudou: caminhos refeitos do zero
+    gs.place_build(grid, 5, 2, "Rua")
+    commutes = {(home, shop): 4, (far, shop): 6}
+    model.update(commutes, version=3)
+    fresh = TrafficModel(grid)
+    fresh.update(commutes, version=3)
+    assert model.load == fresh.load and model.trips == fresh.trips == 10
@@ -0,0 +1,46 @@
+# tests/test_ui_cache.py — TextCache (LRU limitado em bytes) e IconStore (escalas memoizadas)
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame as pg
+import pytest
+
+from assets_loader import IconStore
+from text_cache import TextCache
+
+@pytest.fixture(autouse=True)
+def _fonts():
+    pg.font.init()
+    yield
+
+def test_text_cache_hits_and_evicts_by_bytes():
+    probe = TextCache()
+    one = probe._cost(probe.render("rótulo 0", 20, (0, 0, 0)))
+    cache = TextCache(max_bytes=int(one * 3.5))
+    first = cache.render("rótulo 0", 20, (0, 0, 0))
+    assert cache.render("rótulo 0", 20, (0, 0, 0)) is first
+    assert cache.render("rótulo 0", 20, (255, 0, 0)) is not first   # cor faz parte da chave
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    for i in range(1, 8): cache.render(f"rótulo {i}", 20, (0, 0, 0))
+    assert cache.evictions > 0 and cache.bytes <= cache.max_bytes
+    assert cache.bytes == sum(cache._cost(s) for s in cache.surfaces.values())
+    assert ("rótulo 0", 20, (0, 0, 0)) not in cache.surfaces           # o mais antigo saiu primeiro
+    assert ("rótulo 7", 20, (0, 0, 0)) in cache.surfaces
+    stats = cache.stats()
+    assert stats["entries"] == len(cache.surfaces) and stats["hit_rate"] == 1 / 10
+
+def test_text_cache_keeps_single_oversized_entry():
+    cache = TextCache(max_bytes=1)
+    surf = cache.render("maior que o limite", 24, (0, 0, 0))
+    assert list(cache.surfaces.values()) == [surf] and cache.evictions == 0
+
+def test_icon_store_memoizes_scaled_variants():
+    icons = IconStore(money=pg.Surface((32, 32)))
+    small = icons.scaled("money", 18, 18)
+    assert small.get_size() == (18, 18) and icons.scaled("money", 18, 18) is small
+    assert icons.scaled("money", 32, 32) is icons["money"]   # mesmo tamanho: o original
+    assert icons.scaled("missing", 18, 18) is None
+    icons.warm((18, 20))
+    assert icons.scaled("money", 18, 18) is small and set(icons._scaled) == {
+        ("money", 18, 18), ("money", 20, 20), ("money", 32, 32)}
@@ -0,0 +1,58 @@
+# text_cache.py — fontes por tamanho e textos renderizados em cache (LRU)
+from collections import OrderedDict
+from typing import Dict, Tuple
+import pygame as pg
+
+from settings import TEXT_CACHE_BYTES
+
+class TextCache:
+    """
+    Uma Font por tamanho e um LRU de Surfaces por (texto, tamanho, cor),
+    limitado a max_bytes (w·h·bytes por pixel de cada Surface). Rótulos que
+    não mudam de um frame para o outro custam só o blit. hits/misses/evictions
+    contam o uso do cache.
+    """
+    def __init__(self, max_bytes: int = TEXT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.fonts: Dict[int, pg.font.Font] = {}
+        self.surfaces: "OrderedDict[Tuple[str, int, tuple], pg.Surface]" = OrderedDict()
+        self.bytes = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def font(self, size: int) -> pg.font.Font:
+        f = self.fonts.get(size)
+        if f is None: f = self.fonts[size] = pg.font.SysFont(None, size)
+        return f
+
+    def render(self, text, size: int, color) -> pg.Surface:
+        key = (str(text), size, tuple(color))
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surf
+        self.misses += 1
+        surf = self.font(size).render(key[0], True, color)
+        self.surfaces[key] = surf
+        self.bytes += self._cost(surf)
+        while self.bytes > self.max_bytes and len(self.surfaces) > 1:
+            _, old = self.surfaces.popitem(last=False)
+            self.bytes -= self._cost(old)
+            self.evictions += 1
+        return surf
+
+    def size(self, text, size: int) -> Tuple[int, int]:
+        return self.font(size).size(str(text))
+
+    @staticmethod
+    def _cost(surf: pg.Surface) -> int:
+        return surf.get_width() * surf.get_height() * surf.get_bytesize()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "entries": len(self.surfaces), "bytes": self.bytes,
+                "hit_rate": self.hits / total if total else 0.0}
+
+# serviço compartilhado por ui.py, ui_draw.py e game.py
+text_cache = TextCache()
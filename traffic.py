@@ -0,0 +1,114 @@
+# traffic.py — trânsito por deslocamento casa → trabalho na malha viária
+from collections import deque
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from config_game import ROAD_CAPACITY, TRAFFIC_BASE, COMMUTE_MAX
+from grid_system import neighbors4, grid_size, recompute_connectivity, buildings_of, tiles_version
+
+Pos = Tuple[int, int]
+Pair = Tuple[int, int]   # (casa, emprego), gids inteiros
+JOB_TILES = ("commercial", "industrial", "farm")
+
+class TrafficModel:
+    """
+    Cada trajeto vai da casa até a entrada do emprego casado com ela
+    (Citizens.commutes), pelo caminho mínimo nas ruas conectadas. Um BFS por
+    emprego (cortado em COMMUTE_MAX) dá o próximo passo de cada rua até ele e
+    fica em cache até a malha mudar; a carga de cada trecho é a soma dos
+    trabalhadores que passam por ele. Quando só mudam os trabalhadores, cada
+    par (casa, emprego) que mudou soma a diferença no seu caminho guardado.
+    """
+    def __init__(self, grid):
+        self.grid = grid
+        self.n = grid_size(grid)
+        self.trees: Dict[int, Tuple[Dict[Pos, int], Dict[Pos, Optional[Pos]]]] = {}  # emprego -> (dist, parent)
+        self.flows: Dict[Pair, int] = {}
+        self.paths: Dict[Pair, List[Pos]] = {}
+        self.load: Dict[Pos, int] = {}
+        self.trips = 0
+        self._cells: Dict[int, list] = {}
+        self._roads_key = None
+        self._cells_key = None
+        self._flows_version = None
+
+    def _tree(self, job: int, roads):
+        tree = self.trees.get(job)
+        if tree is not None: return tree
+        dist: Dict[Pos, int] = {}
+        parent: Dict[Pos, Optional[Pos]] = {}
+        queue = deque()
+        for (x, y) in self._cells.get(job, ()):
+            for nb in neighbors4(x, y, self.n):
+                if nb in roads and nb not in dist:
+                    dist[nb] = 0; parent[nb] = None; queue.append(nb)
+        while queue:
+            pos = queue.popleft()
+            d = dist[pos] + 1
+            if d > COMMUTE_MAX: continue
+            for nb in neighbors4(pos[0], pos[1], self.n):
+                if nb in roads and nb not in dist:
+                    dist[nb] = d; parent[nb] = pos; queue.append(nb)
+        tree = self.trees[job] = (dist, parent)
+        return tree
+
+    def _path(self, home: int, job: int, roads) -> List[Pos]:
+        # rua da casa mais perto do emprego, depois os próximos passos até a entrada dele
+        dist, parent = self._tree(job, roads)
+        best = None
+        for (x, y) in self._cells.get(home, ()):
+            for nb in neighbors4(x, y, self.n):
+                if nb in dist and (best is None or dist[nb] < dist[best]): best = nb
+        path = []
+        while best is not None:
+            path.append(best); best = parent[best]
+        return path
+
+    def _add(self, pair: Pair, k: int):
+        path = self.paths[pair]
+        if not path: return
+        load = self.load
+        for pos in path:
+            v = load.get(pos, 0) + k
+            if v: load[pos] = v
+            else: del load[pos]
+        self.trips += k
+
+    def update(self, commutes: Mapping[Pair, int], version=None):
+        """
+        commutes: trabalhadores por par (casa, emprego); version: muda quando
+        esses números mudam sem mexer no grid.
+        """
+        roads_key = tiles_version(self.grid, ("road", "city_hall"))
+        if roads_key is None or roads_key != self._roads_key:
+            # malha mudou: todos os caminhos podem mudar
+            self._roads_key = roads_key
+            self.trees.clear(); self.flows.clear(); self.paths.clear(); self.load.clear()
+            self.trips = 0
+            self._flows_version = None
+        cells_key = tiles_version(self.grid, ("residential",) + JOB_TILES)
+        if cells_key is None or cells_key != self._cells_key:
+            self._cells_key = cells_key
+            self._cells = {int(gid): cells for tile in ("residential",) + JOB_TILES
+                           for gid, cells in buildings_of(self.grid, tile)}
+            for job in [j for j in self.trees if j not in self._cells]: del self.trees[job]
+            self._flows_version = None
+        if version is not None and version == self._flows_version: return
+        self._flows_version = version
+
+        roads, _ = recompute_connectivity(self.grid)
+        for pair in [p for p in self.flows if p not in commutes]:
+            self._add(pair, -self.flows.pop(pair))
+            del self.paths[pair]
+        for pair, k in commutes.items():
+            old = self.flows.get(pair, 0)
+            if k == old: continue
+            if pair not in self.paths: self.paths[pair] = self._path(pair[0], pair[1], roads)
+            self._add(pair, k - old)
+            self.flows[pair] = k
+
+    def index(self) -> float:
+        # 0..100: fração dos trechos percorridos (veículo × trecho) acima da capacidade
+        total = sum(self.load.values())
+        if total <= 0: return TRAFFIC_BASE
+        overflow = sum(max(0, v - ROAD_CAPACITY) for v in self.load.values())
+        return min(100.0, TRAFFIC_BASE + 100.0 * overflow / total)
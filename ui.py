@@ -3,10 +3,10 @@
 
 import pygame as pg
 from settings import COLORS
+from text_cache import text_cache
 
 def draw_text(surface, text, x, y, size=20, color=COLORS["text"], center=False):
-    font = pg.font.SysFont(None, size)
-    img = font.render(text, True, color)
+    img = text_cache.render(text, size, color)
     rect = img.get_rect()
     if center:
         rect.center = (x, y)
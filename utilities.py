@@ -0,0 +1,86 @@
+# utilities.py — energia e água distribuídas pela malha viária
+from typing import Dict
+
+import config_game
+from config_game import BASE_SUPPLY, UTILITY_RADIUS
+from grid_system import buildings_of
+from matching import RoadMatcher
+
+# nomes das tabelas em config_game, lidas a cada update (overrides do montecarlo valem)
+KINDS = {"power": ("PROD_POWER_PER", "CONS_POWER_PER_DAY"), "water": ("PROD_WATER_PER", "CONS_WATER_PER_DAY")}
+
+def _tables(kind: str):
+    prod, cons = KINDS[kind]
+    return getattr(config_game, prod), getattr(config_game, cons)
+
+class UtilityNetwork:
+    """
+    Usinas e ETAs (e o gerador base da Prefeitura) abastecem os prédios
+    conectados pela rua, do mais perto ao mais longe, até acabar a capacidade
+    (RoadMatcher com alcance UTILITY_RADIUS). supplied[kind][gid] é a fração
+    atendida de cada consumidor; abaixo de 1 = em falta. use[kind] é o
+    consumo de todos os prédios, atendidos ou não (mesmo sentido do HUD sem
+    rede). Cada recurso só é redistribuído quando a tabela de distâncias
+    dele muda.
+    """
+    def __init__(self, grid):
+        self.grid = grid
+        self.matchers = {}
+        for kind in KINDS:
+            prod, cons = _tables(kind)
+            self.matchers[kind] = RoadMatcher(grid, tuple(cons), tuple(prod) + ("city_hall",), UTILITY_RADIUS)
+        self.cap: Dict[str, float] = {kind: BASE_SUPPLY for kind in KINDS}
+        self.use: Dict[str, float] = {kind: 0.0 for kind in KINDS}
+        self.supplied: Dict[str, Dict[str, float]] = {kind: {} for kind in KINDS}
+        self._short: Dict[str, Dict[str, float]] = {kind: {} for kind in KINDS}
+        self._versions: Dict[str, int] = {}
+
+    def update(self):
+        for kind in KINDS:
+            prod, cons = _tables(kind)
+            m = self.matchers[kind]
+            m.sync()
+            if self._versions.get(kind) != m.version:
+                self._versions[kind] = m.version
+                self._distribute(kind, m, prod, cons)
+
+            # consumo e falta contam todos os prédios: quem a rede não alcança fica sem nada
+            use, short = 0.0, {}
+            for tile, amount in cons.items():
+                if amount <= 0: continue
+                for gid, _ in buildings_of(self.grid, tile):
+                    use += amount
+                    f = self.supplied[kind].get(gid, 0.0)
+                    if f < 1.0 - 1e-9: short[gid] = 1.0 - f
+            self.use[kind] = use
+            self._short[kind] = short
+
+    def _distribute(self, kind: str, m: RoadMatcher, prod: Dict[str, float], cons: Dict[str, float]):
+        demand = {}
+        for tile, amount in cons.items():
+            if amount <= 0: continue
+            for gid, _ in buildings_of(self.grid, tile):
+                if int(gid) in m.sinks: demand[int(gid)] = amount
+        capacity = {}
+        halls = [int(gid) for gid, _ in buildings_of(self.grid, "city_hall") if int(gid) in m.sources]
+        for gid in halls: capacity[gid] = BASE_SUPPLY / len(halls)
+        for tile, amount in prod.items():
+            for gid, _ in buildings_of(self.grid, tile):
+                if int(gid) in m.sources: capacity[int(gid)] = amount
+
+        got = dict.fromkeys(demand, 0.0)
+        for sink, _, amount in m.assign(demand, capacity): got[sink] += amount
+        self.cap[kind] = BASE_SUPPLY + sum(c for g, c in capacity.items() if g not in halls)
+        # dict novo a cada redistribuição: quem guardou o anterior não o vê mudar
+        self.supplied[kind] = {str(g): min(1.0, got[g] / need) for g, need in demand.items()}
+
+    def served_share(self, kind: str, weights: Dict[str, int]) -> float:
+        """Fração atendida média (0..1) ponderada por `weights` (gid → pessoas); prédio sem consumo conta como atendido."""
+        short = self._short[kind]
+        total = sum(weights.values())
+        if total <= 0: return 1.0
+        return 1.0 - sum(w * short.get(gid, 0.0) for gid, w in weights.items()) / total
+
+    def shortages(self, kind: str) -> Dict[str, float]:
+        """Prédios em falta de `kind` ("power"/"water"), alcançados ou não → fração não atendida."""
+        return self._short[kind]